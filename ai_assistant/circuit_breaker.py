@@ -0,0 +1,130 @@
+"""
+Per-process circuit breaker for the LLM upstream
+Opens when too many recent calls failed or blew their latency SLO, so callers go
+straight to their fallback paths instead of waiting on a known-bad provider.
+After a cool-down a single probe call is let through; if it succeeds the
+circuit closes again and recovery listeners are notified.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+DEFAULTS = {
+    'window': 20,
+    'min_calls': 5,
+    'error_rate': 0.5,
+    'slow_call_fraction': 0.75,
+    'slow_call_rate': 0.5,
+    'open_seconds': 30.0,
+}
+
+
+class CircuitBreaker:
+    """
+    Thread-safe breaker over a rolling window of call outcomes
+
+    Settings (AI_CIRCUIT_BREAKER, all optional):
+        window: Number of recent calls considered
+        min_calls: Calls needed in the window before the breaker can open
+        error_rate: Failed fraction that opens the circuit
+        slow_call_fraction: Latency SLO as a fraction of each call's deadline; slower successful calls count as slow
+        slow_call_rate: Slow fraction that opens the circuit
+        open_seconds: Cool-down before a probe call is allowed
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.state = CLOSED
+        self._outcomes = deque()
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def _config(self, key):
+        return getattr(settings, 'AI_CIRCUIT_BREAKER', {}).get(key, DEFAULTS[key])
+
+    def add_recovery_listener(self, callback):
+        """Call callback() (in the recording thread) whenever the circuit closes after being open"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def allow_request(self):
+        """False while the circuit is open; lets one probe through after the cool-down"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self._config('open_seconds'):
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self, seconds, deadline):
+        """
+        Record a successful call
+        Calls have different deadlines (a chat reply, a full blog post), so the
+        SLO is relative: a call is slow past slow_call_fraction of its deadline.
+        """
+        slow = seconds > deadline * self._config('slow_call_fraction')
+        recovered = False
+
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if slow:
+                    self._trip(f'probe call took {seconds:.1f}s')
+                    return
+                self.state = CLOSED
+                self._outcomes.clear()
+                recovered = True
+            else:
+                self._add_outcome(ok=True, slow=slow)
+
+        if recovered:
+            logger.info(f"Circuit '{self.name}' closed; upstream recovered")
+            for callback in list(self._listeners):
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Circuit '{self.name}' recovery listener failed: {e}")
+
+    def record_failure(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trip('probe call failed')
+            else:
+                self._add_outcome(ok=False, slow=False)
+
+    def _add_outcome(self, ok, slow):
+        self._outcomes.append((ok, slow))
+        while len(self._outcomes) > self._config('window'):
+            self._outcomes.popleft()
+
+        if self.state != CLOSED or len(self._outcomes) < self._config('min_calls'):
+            return
+
+        total = len(self._outcomes)
+        failures = sum(1 for outcome_ok, _slow in self._outcomes if not outcome_ok)
+        slow_calls = sum(1 for _ok, outcome_slow in self._outcomes if outcome_slow)
+        if failures / total >= self._config('error_rate'):
+            self._trip(f'{failures}/{total} recent calls failed')
+        elif slow_calls / total >= self._config('slow_call_rate'):
+            self._trip(f'{slow_calls}/{total} recent calls exceeded {self._config("slow_call_fraction"):.0%} of their deadline')
+
+    def _trip(self, reason):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self._outcomes.clear()
+        logger.warning(f"Circuit '{self.name}' opened: {reason}")
@@ -0,0 +1,192 @@
+"""
+Token-budgeted prompt context for assistant chats
+The prompt is the system prompt, the conversation's rolling summary, as many of
+the most recent messages as fit the token budget (in chronological order) and
+the new user message. Messages that have dropped out of the recent window are
+folded into Conversation.rolling_summary by a cheap model in the background,
+so long conversations keep their gist without growing the prompt. The recent
+window never exceeds the history space the last prompt actually had, so a
+large context or user message cannot leave turns in neither prompt nor summary.
+"""
+import logging
+import threading
+from django.conf import settings
+from django.db import connection
+from .llm_provider import llm_provider
+from .models import Conversation
+from .prompts import MESSAGE_OVERHEAD_TOKENS, count_tokens, prompt_registry
+
+
+logger = logging.getLogger(__name__)
+
+def message_tokens(message):
+    return count_tokens(message['content']) + MESSAGE_OVERHEAD_TOKENS
+
+
+class ConversationContextBuilder:
+    """
+    Builds chat messages within AI_CONTEXT_TOKEN_BUDGET and maintains rolling summaries
+
+    Settings:
+        AI_CONTEXT_TOKEN_BUDGET: Prompt tokens for system prompt, summary, history and new message
+        AI_CONTEXT_RECENT_TOKENS: History kept verbatim; older messages get summarized
+        AI_CONTEXT_SUMMARY_BATCH_TOKENS: Summarize only once this much has dropped out of the window
+        AI_CONTEXT_SUMMARY_MAX_TOKENS: Length cap of the rolling summary
+        AI_CONTEXT_SUMMARY_MODEL: Model that writes the summary
+    """
+
+    # Most recent unsummarized messages considered per prompt
+    FETCH_LIMIT = 100
+
+    def __init__(self):
+        self._summarizing = set()
+        self._lock = threading.Lock()
+
+    def _setting(self, name, default):
+        return getattr(settings, name, default)
+
+    def unsummarized_messages(self, conversation, limit=None):
+        """Messages newer than the summary, newest first, as chat dicts with their ids"""
+        messages = conversation.messages.filter(
+            id__gt=conversation.summarized_through_id
+        ).exclude(message_type='system').order_by('-timestamp', '-id').values('id', 'message_type', 'content')[:limit]
+        return [
+            {'id': message['id'], 'role': 'user' if message['message_type'] == 'user' else 'assistant', 'content': message['content']}
+            for message in messages
+        ]
+
+    def build_messages(self, conversation, system_prompt, user_message, context=None, budget=None):
+        """
+        Chat messages for the next completion, oldest history first
+        History is added newest-first until the budget is used up. The static
+        system prompt leads and per-turn context goes right before the new
+        message, so consecutive turns share the longest possible prefix.
+        """
+        budget = budget or self._setting('AI_CONTEXT_TOKEN_BUDGET', 3000)
+        system = [{"role": "system", "content": system_prompt}]
+        if conversation.rolling_summary:
+            system.append({"role": "system", "content": f"Summary of the earlier conversation:\n{conversation.rolling_summary}"})
+        current = [{"role": "user", "content": user_message}]
+        if context:
+            current.insert(0, {"role": "system", "content": context})
+
+        remaining = budget - sum(message_tokens(message) for message in system + current)
+        # What is left for history bounds the recent window (see recent_window)
+        conversation.history_tokens = max(remaining, 0)
+        unsummarized = self.unsummarized_messages(conversation, limit=self.FETCH_LIMIT)
+        history = []
+        total = message_tokens(current[-1])
+        full = False
+        for message in unsummarized:
+            cost = message_tokens(message)
+            total += cost
+            if full or cost > remaining:
+                full = True
+                continue
+            remaining -= cost
+            history.append({"role": message['role'], "content": message['content']})
+
+        # Lets schedule_summary_update skip its query when nothing can need summarizing
+        conversation.unsummarized_tokens = total if len(unsummarized) < self.FETCH_LIMIT else None
+
+        history.reverse()
+        return system + history + current
+
+    def recent_window(self, conversation):
+        """
+        (tokens of history kept verbatim, whether that is less than AI_CONTEXT_RECENT_TOKENS)
+        After build_messages the window is capped at the history space the prompt had:
+        anything older is already missing from the prompt, so it must be summarized.
+        """
+        recent_budget = self._setting('AI_CONTEXT_RECENT_TOKENS', 1500)
+        history_tokens = getattr(conversation, 'history_tokens', None)
+        if history_tokens is not None and history_tokens < recent_budget:
+            return history_tokens, True
+        return recent_budget, False
+
+    def messages_to_summarize(self, conversation):
+        """
+        Messages (oldest first) that fell out of the recent window, once there are enough of them
+        Messages the prompt had no room for are returned straight away, however few.
+        """
+        recent_budget, capped = self.recent_window(conversation)
+        messages = self.unsummarized_messages(conversation, limit=None)
+
+        kept = 0
+        for index, message in enumerate(messages):
+            kept += message_tokens(message)
+            if kept > recent_budget:
+                older = list(reversed(messages[index:]))
+                if capped or sum(message_tokens(message) for message in older) >= self._setting('AI_CONTEXT_SUMMARY_BATCH_TOKENS', 600):
+                    return older
+                return []
+        return []
+
+    def update_summary(self, conversation, client):
+        """
+        Fold messages that left the recent window into the rolling summary
+        Returns True if the summary changed. The write only applies if nobody else
+        updated the summary meanwhile.
+        """
+        older = self.messages_to_summarize(conversation)
+        if not older:
+            return False
+
+        max_tokens = self._setting('AI_CONTEXT_SUMMARY_MAX_TOKENS', 300)
+        prompt = prompt_registry.get('conversation_summary')
+        response = llm_provider.complete(
+            client,
+            purpose='summary',
+            model=self._setting('AI_CONTEXT_SUMMARY_MODEL', None),
+            hedge=False,
+            prompt=prompt,
+            messages=prompt.messages(
+                max_words=max_tokens * 3 // 4,
+                summary=conversation.rolling_summary or '(none yet)',
+                transcript='\n'.join(f"{message['role']}: {message['content']}" for message in older)
+            ),
+            max_tokens=max_tokens,
+            temperature=0.2
+        )
+        summary = response.choices[0].message.content.strip()
+
+        through_id = max(message['id'] for message in older)
+        updated = Conversation.objects.filter(
+            pk=conversation.pk, summarized_through_id=conversation.summarized_through_id
+        ).update(rolling_summary=summary, summarized_through_id=through_id)
+        if updated:
+            conversation.rolling_summary = summary
+            conversation.summarized_through_id = through_id
+        return bool(updated)
+
+    def schedule_summary_update(self, conversation, client):
+        """Update the summary on a daemon thread so the reply is not delayed; one update per conversation at a time"""
+        # build_messages already measured the unsummarized history; below the window nothing can need folding
+        known = getattr(conversation, 'unsummarized_tokens', None)
+        recent_budget, capped = self.recent_window(conversation)
+        threshold = recent_budget if capped else recent_budget + self._setting('AI_CONTEXT_SUMMARY_BATCH_TOKENS', 600)
+        if known is not None and known < threshold:
+            return
+        if not self.messages_to_summarize(conversation):
+            return
+
+        with self._lock:
+            if conversation.pk in self._summarizing:
+                return
+            self._summarizing.add(conversation.pk)
+
+        def run():
+            try:
+                self.update_summary(conversation, client)
+            except Exception as e:
+                logger.warning(f"Rolling summary update failed for conversation {conversation.pk}: {type(e).__name__}: {e}")
+            finally:
+                with self._lock:
+                    self._summarizing.discard(conversation.pk)
+                connection.close()
+
+        threading.Thread(target=run, name=f'summary-{conversation.pk}', daemon=True).start()
+
+
+# Initialize global context builder instance
+context_builder = ConversationContextBuilder()
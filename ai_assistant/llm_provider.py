@@ -0,0 +1,237 @@
+"""
+LLM provider layer for tail-latency control
+Every chat completion gets a deadline. If the primary model has not answered by
+its observed p95 latency, a hedged request goes to a faster model and the first
+answer wins. If both fail, the fallback models are tried in order for whatever
+time is left. Per-process circuit breakers, one per purpose, fail calls
+immediately while the upstream is known to be bad for that kind of call.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from django.conf import settings
+from .circuit_breaker import CircuitBreaker
+
+
+logger = logging.getLogger(__name__)
+
+
+class LLMUnavailableError(Exception):
+    """No model produced an answer before the deadline"""
+
+
+class LLMCircuitOpenError(LLMUnavailableError):
+    """The circuit breaker is open; the call was not attempted"""
+
+
+class LatencyTracker:
+    """Recent successful call latencies per model, for the adaptive hedge delay"""
+
+    def __init__(self, window=200, min_samples=20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, model, seconds):
+        with self._lock:
+            self._samples[model].append(seconds)
+
+    def p95(self, model):
+        """95th percentile latency in seconds, or None until there are enough samples"""
+        with self._lock:
+            samples = sorted(self._samples[model])
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))]
+
+
+class LLMProvider:
+    """
+    Wraps chat.completions.create on any OpenAI-compatible client
+
+    Requests run on a shared thread pool so the caller can stop waiting at the
+    deadline; an abandoned request finishes in the background (bounded by the
+    per-request timeout passed to the client) and its answer is discarded.
+    """
+
+    def __init__(self):
+        self.latency = LatencyTracker()
+        self._breakers = {}
+        self._executor = None
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+
+    @property
+    def primary_model(self):
+        return getattr(settings, 'AI_LLM_PRIMARY_MODEL', 'gpt-4')
+
+    @property
+    def fallback_models(self):
+        return list(getattr(settings, 'AI_LLM_FALLBACK_MODELS', []))
+
+    @property
+    def hedge_model(self):
+        return getattr(settings, 'AI_LLM_HEDGE_MODEL', None)
+
+    def deadline_for(self, purpose):
+        deadlines = getattr(settings, 'AI_LLM_DEADLINES', {})
+        return deadlines.get(purpose, deadlines.get('default', 30))
+
+    def breaker(self, purpose):
+        """
+        Circuit breaker for one purpose
+        Purposes have very different latencies and volumes; separate breakers keep a
+        batch of slow content calls from opening the circuit for live chat.
+        """
+        with self._lock:
+            if purpose not in self._breakers:
+                self._breakers[purpose] = CircuitBreaker(f'openai:{purpose}')
+            return self._breakers[purpose]
+
+    def hedge_delay(self, model):
+        """Seconds to wait for a model before hedging: its observed p95, else the configured default"""
+        observed = self.latency.p95(model)
+        return observed if observed is not None else getattr(settings, 'AI_LLM_HEDGE_AFTER', 6.0)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def complete(self, client, messages, purpose='default', model=None, deadline=None, hedge=True, prompt=None, **kwargs):
+        """
+        Chat completion with deadline, hedging and fallbacks
+
+        Args:
+            client: OpenAI-compatible client
+            messages: Chat messages
+            purpose: Key into AI_LLM_DEADLINES ('chat', 'recognition', 'content', ...)
+            model: Primary model (default: AI_LLM_PRIMARY_MODEL)
+            deadline: Seconds for the whole call, overriding the purpose's deadline
+            hedge: Allow a hedged request to AI_LLM_HEDGE_MODEL
+            prompt: PromptTemplate the messages came from; its usage stats are updated
+            **kwargs: Passed through to chat.completions.create (max_tokens, temperature, ...)
+
+        Returns:
+            The first successful completion; its .model says which model answered
+
+        Raises:
+            LLMCircuitOpenError: the upstream is known to be bad; use the fallback path now
+            LLMUnavailableError: every attempt failed or the deadline passed
+        """
+        breaker = self.breaker(purpose)
+        if not breaker.allow_request():
+            self._count('short_circuited')
+            raise LLMCircuitOpenError('LLM circuit is open')
+
+        deadline = deadline or self.deadline_for(purpose)
+        started = time.monotonic()
+        try:
+            response = self._complete(client, messages, model, deadline, hedge, kwargs)
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success(time.monotonic() - started, deadline)
+        if prompt is not None:
+            prompt.record_usage(response)
+        return response
+
+    def _complete(self, client, messages, model, deadline, hedge, kwargs):
+        deadline_at = time.monotonic() + deadline
+        primary = model or self.primary_model
+        errors = []
+
+        self._count('requests')
+        response, tried = self._hedged(client, primary, messages, deadline_at, hedge, errors, kwargs)
+        if response is not None:
+            return response
+
+        for fallback in self.fallback_models:
+            if fallback in tried:
+                continue
+            tried.add(fallback)
+            if deadline_at - time.monotonic() <= 0:
+                break
+
+            self._count('fallbacks')
+            _answered_by, response = self._wait_any(client, {fallback: None}, messages, deadline_at, errors, kwargs)
+            if response is not None:
+                logger.warning(f"LLM fallback model {fallback} answered after: {'; '.join(errors)}")
+                return response
+
+        self._count('failures')
+        raise LLMUnavailableError('; '.join(errors) or 'deadline exceeded')
+
+    def _hedged(self, client, primary, messages, deadline_at, hedge, errors, kwargs):
+        """Primary request plus an optional hedge; returns (response or None, models tried)"""
+        futures = {primary: self._submit(client, primary, messages, deadline_at, kwargs)}
+
+        hedge_model = self.hedge_model if hedge else None
+        if hedge_model and hedge_model != primary:
+            wait_for = min(self.hedge_delay(primary), max(deadline_at - time.monotonic(), 0))
+            done, _pending = wait([futures[primary]], timeout=wait_for)
+            if not done and deadline_at - time.monotonic() > 0:
+                self._count('hedges')
+                futures[hedge_model] = None
+
+        answered_by, response = self._wait_any(client, futures, messages, deadline_at, errors, kwargs)
+        if response is not None and answered_by != primary:
+            self._count('hedge_wins')
+        return response, set(futures)
+
+    def _wait_any(self, client, futures, messages, deadline_at, errors, kwargs):
+        """Submit any unsubmitted models and return (model, response) for the first success, or (None, None)"""
+        owners = {}
+        for model, future in futures.items():
+            owners[future or self._submit(client, model, messages, deadline_at, kwargs)] = model
+
+        pending = set(owners)
+        while pending:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return owners[future], future.result()
+                except Exception as e:
+                    errors.append(f"{owners[future]}: {type(e).__name__}: {e}")
+
+        if pending:
+            errors.append(f"deadline exceeded waiting for {', '.join(owners[future] for future in pending)}")
+        return None, None
+
+    def _submit(self, client, model, messages, deadline_at, kwargs):
+        return self._get_executor().submit(self._call, client, model, messages, deadline_at, kwargs)
+
+    def _call(self, client, model, messages, deadline_at, kwargs):
+        started = time.monotonic()
+        response = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            timeout=max(deadline_at - started, 0.1),
+            **kwargs
+        )
+        self.latency.record(model, time.monotonic() - started)
+        return response
+
+    def _get_executor(self):
+        # Created on first use so forked workers each get their own threads
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=getattr(settings, 'AI_LLM_MAX_CONCURRENCY', 32),
+                        thread_name_prefix='llm'
+                    )
+        return self._executor
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+
+# Initialize global provider instance
+llm_provider = LLMProvider()
@@ -0,0 +1,160 @@
+"""
+Batched localization of the multi-language content columns
+Pages, blog posts and knowledge base entries keep their source text in the base
+fields (title, content, ...) and one column per language (content_nl, ...).
+One LLM call per object translates every language that needs it, objects are
+translated concurrently, and the results are written with bulk_update.
+
+Each object's translation_hashes records, per language, the hash of the source
+text it was translated from, so only languages whose source changed are
+regenerated. A language that has text but no recorded hash was written by hand
+and is left alone unless force is used.
+"""
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from django.apps import apps
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Model label -> source fields with a localized column per language
+LOCALIZED_FIELDS = {
+    'pages.Page': ['title', 'content'],
+    'blog.Post': ['title', 'excerpt', 'content'],
+    'ai_assistant.AIKnowledgeBase': ['content'],
+}
+
+
+def source_hash(obj, fields):
+    source = {name: getattr(obj, name) or '' for name in fields}
+    return hashlib.sha256(json.dumps(source, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def stale_languages(obj, fields, languages, force=False):
+    """Languages of obj whose translation is missing or was made from different source text"""
+    current = source_hash(obj, fields)
+    hashes = obj.translation_hashes or {}
+    stale = []
+    for language in languages:
+        recorded = hashes.get(language)
+        if recorded == current and not force:
+            continue
+        hand_written = recorded is None and any(getattr(obj, f'{name}_{language}') for name in fields)
+        if hand_written and not force:
+            continue
+        stale.append(language)
+    return stale
+
+
+def _column_value(obj, column, value):
+    """Translated text fitted to the column: translations can run longer than max_length allows"""
+    value = str(value or '')
+    max_length = obj._meta.get_field(column).max_length
+    return value[:max_length] if max_length else value
+
+
+def _max_tokens(obj, fields, language_count):
+    # Roughly 4 characters per token, with headroom for languages that run longer than English
+    source_tokens = sum(len(getattr(obj, name) or '') for name in fields) // 4
+    return min(200 + int(source_tokens * language_count * 1.3), getattr(settings, 'LOCALIZATION_MAX_TOKENS', 8000))
+
+
+def localize_objects(objects, fields, languages=None, force=False, magic=None):
+    """
+    Fill the localized columns of objects (all of one model) for stale languages
+    Returns {'objects': n, 'languages': n, 'calls': n, 'failed': n}.
+    """
+    from .magic_ai import MagicAI
+
+    source_language = settings.LANGUAGE_CODE
+    languages = languages or [code for code, _name in settings.LANGUAGES]
+    stats = {'objects': 0, 'languages': 0, 'calls': 0, 'failed': 0}
+
+    work = []
+    for obj in objects:
+        stale = stale_languages(obj, fields, languages, force)
+        if stale:
+            work.append((obj, stale))
+    if not work:
+        return stats
+
+    magic = magic or MagicAI()
+    translated = {}
+
+    # Worker threads only talk to the LLM; all database access stays in this thread
+    requests = [(obj, [language for language in stale if language != source_language]) for obj, stale in work]
+    requests = [(obj, targets) for obj, targets in requests if targets]
+    if requests:
+        concurrency = getattr(settings, 'LOCALIZATION_CONCURRENCY', 4)
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(requests)), thread_name_prefix='localize') as pool:
+            futures = {
+                pool.submit(
+                    magic.translate_fields,
+                    {name: getattr(obj, name) or '' for name in fields},
+                    targets,
+                    source_language,
+                    _max_tokens(obj, fields, len(targets))
+                ): (obj, targets)
+                for obj, targets in requests
+            }
+            for future in as_completed(futures):
+                obj, targets = futures[future]
+                stats['calls'] += 1
+                try:
+                    translated[obj.pk] = future.result()
+                except Exception as e:
+                    logger.warning(f"Localizing {obj._meta.label} {obj.pk} failed: {type(e).__name__}: {e}")
+                    translated[obj.pk] = {}
+
+    changed = []
+    for obj, stale in work:
+        current = source_hash(obj, fields)
+        results = translated.get(obj.pk, {})
+        if source_language in stale:
+            # The source language column is a copy of the source text
+            results[source_language] = {name: getattr(obj, name) or '' for name in fields}
+
+        hashes = dict(obj.translation_hashes or {})
+        for language in stale:
+            translation = results.get(language)
+            if not isinstance(translation, dict) or any(name not in translation for name in fields):
+                stats['failed'] += 1
+                continue
+            for name in fields:
+                column = f'{name}_{language}'
+                setattr(obj, column, _column_value(obj, column, translation[name]))
+            hashes[language] = current
+            stats['languages'] += 1
+
+        if hashes != (obj.translation_hashes or {}):
+            obj.translation_hashes = hashes
+            changed.append(obj)
+
+    if changed:
+        update_fields = [f'{name}_{language}' for name in fields for language in languages] + ['translation_hashes']
+        type(changed[0]).objects.bulk_update(changed, update_fields, batch_size=100)
+    stats['objects'] = len(changed)
+    return stats
+
+
+def localize_model(label, queryset=None, languages=None, force=False, magic=None, chunk_size=50):
+    """Localize every object of a LOCALIZED_FIELDS model (or the given queryset), chunk by chunk"""
+    fields = LOCALIZED_FIELDS[label]
+    if queryset is None:
+        queryset = apps.get_model(label).objects.all()
+
+    totals = {'objects': 0, 'languages': 0, 'calls': 0, 'failed': 0}
+    chunk = []
+    for obj in queryset.order_by('pk').iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            for key, value in localize_objects(chunk, fields, languages, force, magic).items():
+                totals[key] += value
+            chunk = []
+    if chunk:
+        for key, value in localize_objects(chunk, fields, languages, force, magic).items():
+            totals[key] += value
+    return totals
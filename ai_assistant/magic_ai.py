@@ -3,12 +3,24 @@ MagicAI Integration for JustCodeWorks
 OpenAI-powered content generation and AI assistant
 """
 import os
-import openai
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from django.conf import settings
 from django.utils import timezone
 from .models import Conversation, Message, AIKnowledgeBase
+from .context_builder import context_builder
+from .llm_provider import llm_provider
+from .prompts import prompt_registry
+
+
+LANGUAGE_NAMES = {
+    'en': 'English',
+    'nl': 'Dutch',
+    'de': 'German',
+    'fr': 'French',
+    'es': 'Spanish',
+    'pt': 'Portuguese'
+}
 
 
 class MagicAI:
@@ -17,49 +29,57 @@ class MagicAI:
     """
     
     def __init__(self):
-        """Initialize MagicAI with OpenAI configuration"""
-        self.api_key = settings.OPENAI_API_KEY
-        if not self.api_key:
-            raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in settings")
-        
-        # Configure OpenAI client
-        openai.api_key = self.api_key
-        self.client = openai.OpenAI(api_key=self.api_key)
+        """
+        Initialize MagicAI; the OpenAI client is created on first use so that
+        importing this module (every worker, every management command) stays cheap
+        """
+        self._client = None
         
         # Set up logging
         self.logger = logging.getLogger(__name__)
     
+    @property
+    def api_key(self):
+        return settings.OPENAI_API_KEY
+    
+    @property
+    def client(self):
+        """OpenAI client, built on first access"""
+        if self._client is None:
+            if not self.api_key:
+                raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in settings")
+            
+            # Deferred: the openai package and its HTTP stack take a noticeable share of startup
+            import openai
+            
+            openai.api_key = self.api_key
+            self._client = openai.OpenAI(
+                api_key=self.api_key, 
+                base_url=getattr(settings, 'OPENAI_BASE_URL', None)
+            )
+        return self._client
+    
+    @client.setter
+    def client(self, value):
+        self._client = value
+    
     def generate_website_content(self, business_info: Dict[str, Any]) -> Dict[str, str]:
         """
         Generate complete website content based on business information
         """
         try:
-            prompt = f"""
-            Generate professional website content for a {business_info.get('industry', 'business')} company:
-            
-            Company Name: {business_info.get('company_name', 'Business')}
-            Industry: {business_info.get('industry', 'General Business')}
-            Location: {business_info.get('location', 'Europe')}
-            Services: {business_info.get('services', 'Professional services')}
-            Target Audience: {business_info.get('target_audience', 'Business clients')}
-            
-            Generate content for:
-            1. Homepage hero section (compelling headline + description)
-            2. About Us page content
-            3. Services overview
-            4. Contact page content
-            5. SEO meta description
-            
-            Make it engaging, professional, and conversion-focused.
-            Return as JSON format with keys: hero_headline, hero_description, about_content, services_content, contact_content, meta_description
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert copywriter specializing in business websites. Generate compelling, professional content that drives conversions."},
-                    {"role": "user", "content": prompt}
-                ],
+            prompt = prompt_registry.get('website_content')
+            response = llm_provider.complete(
+                self.client,
+                purpose='content',
+                prompt=prompt,
+                messages=prompt.messages(
+                    company_name=business_info.get('company_name', 'Business'),
+                    industry=business_info.get('industry', 'General Business'),
+                    location=business_info.get('location', 'Europe'),
+                    services=business_info.get('services', 'Professional services'),
+                    target_audience=business_info.get('target_audience', 'Business clients')
+                ),
                 max_tokens=1000,
                 temperature=0.7
             )
@@ -79,61 +99,55 @@ class MagicAI:
             self.logger.error(f"Error generating website content: {e}")
             return self._get_fallback_content(business_info)
     
+    def generate_service_descriptions(self, business_info: Dict[str, Any], service_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate website copy for several services in one call
+        Returns {service_name: {short_description, detailed_description, features}};
+        raises on failure so the caller can decide how to fall back.
+        """
+        import json
+        
+        prompt = prompt_registry.get('service_descriptions')
+        response = llm_provider.complete(
+            self.client,
+            purpose='content',
+            prompt=prompt,
+            messages=prompt.messages(
+                company_name=business_info.get('company_name', 'Business'),
+                industry=business_info.get('industry', 'business'),
+                location=business_info.get('location', 'Europe'),
+                tone=business_info.get('tone', 'professional'),
+                service_lines='\n'.join(f"- {name}" for name in service_names)
+            ),
+            max_tokens=100 + 250 * len(service_names),
+            temperature=0.7
+        )
+        
+        items = json.loads(response.choices[0].message.content.strip())
+        return {
+            item['service_name']: item
+            for item in items
+            if isinstance(item, dict) and item.get('service_name') in service_names
+        }
+    
     def generate_blog_content(self, topic: str, content_type: str = 'tutorial', language: str = 'en') -> Dict[str, str]:
         """
         Generate blog post content for tutorials and business tips
         """
+        import json
+        
         try:
-            language_names = {
-                'en': 'English',
-                'nl': 'Dutch', 
-                'de': 'German',
-                'fr': 'French',
-                'es': 'Spanish',
-                'pt': 'Portuguese'
+            content, _tokens = self.request_blog_content(topic, content_type, language)
+            return content
+        
+        except json.JSONDecodeError:
+            return {
+                "title": f"How to {topic}",
+                "excerpt": f"Learn practical strategies for {topic} to grow your online business.",
+                "content": f"This comprehensive guide covers everything you need to know about {topic}...",
+                "meta_description": f"Learn {topic} with our step-by-step guide for small businesses.",
+                "tags": "business, tutorial, online, growth"
             }
-            
-            prompt = f"""
-            Write a comprehensive {content_type} blog post about: {topic}
-            
-            Target audience: Small business owners and entrepreneurs using JustCodeWorks
-            Language: {language_names.get(language, 'English')}
-            Focus: Actionable advice that helps grow online business
-            
-            Include:
-            1. Engaging title
-            2. Brief excerpt/summary (max 300 characters)
-            3. Full article content (800-1200 words)
-            4. SEO meta description
-            5. Suggested tags (comma-separated)
-            
-            Make it practical, actionable, and relate back to website/online business success.
-            Return as JSON: title, excerpt, content, meta_description, tags
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert business advisor and content creator. Write practical, actionable content that helps small businesses succeed online."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1500,
-                temperature=0.7
-            )
-            
-            content_text = response.choices[0].message.content.strip()
-            
-            try:
-                import json
-                return json.loads(content_text)
-            except json.JSONDecodeError:
-                return {
-                    "title": f"How to {topic}",
-                    "excerpt": f"Learn practical strategies for {topic} to grow your online business.",
-                    "content": f"This comprehensive guide covers everything you need to know about {topic}...",
-                    "meta_description": f"Learn {topic} with our step-by-step guide for small businesses.",
-                    "tags": "business, tutorial, online, growth"
-                }
                 
         except Exception as e:
             self.logger.error(f"Error generating blog content: {e}")
@@ -145,6 +159,59 @@ class MagicAI:
                 "tags": "business, guide"
             }
     
+    def request_blog_content(self, topic: str, content_type: str = 'tutorial', language: str = 'en') -> Tuple[Dict[str, str], int]:
+        """
+        Blog post content and the tokens the call used
+        Raises on failure or unparseable output, so batch generation never stores placeholder posts.
+        """
+        import json
+        
+        prompt = prompt_registry.get('blog_post')
+        response = llm_provider.complete(
+            self.client,
+            purpose='content',
+            prompt=prompt,
+            messages=prompt.messages(
+                topic=topic,
+                content_type=content_type,
+                language=LANGUAGE_NAMES.get(language, 'English')
+            ),
+            max_tokens=1500,
+            temperature=0.7
+        )
+        
+        usage = getattr(response, 'usage', None)
+        return json.loads(response.choices[0].message.content.strip()), getattr(usage, 'total_tokens', 0) or 0
+    
+    def translate_fields(self, fields: Dict[str, str], languages: List[str], source_language: str = 'en', max_tokens: int = 4000) -> Dict[str, Dict[str, str]]:
+        """
+        Translate several text fields into several languages in one call
+        Returns {language: {field: text}} for the languages that came back complete;
+        raises on failure so the caller can keep the existing translations.
+        """
+        import json
+        
+        prompt = prompt_registry.get('translate_fields')
+        response = llm_provider.complete(
+            self.client,
+            purpose='content',
+            prompt=prompt,
+            messages=prompt.messages(
+                source_language=LANGUAGE_NAMES.get(source_language, source_language),
+                targets=', '.join(f"{code} ({LANGUAGE_NAMES.get(code, code)})" for code in languages),
+                fields=json.dumps(fields, ensure_ascii=False)
+            ),
+            max_tokens=max_tokens,
+            temperature=0.2
+        )
+        
+        translations = json.loads(response.choices[0].message.content.strip())
+        return {
+            language: {name: str(translated[name]) for name in fields}
+            for language, translated in translations.items()
+            if language in languages and isinstance(translated, dict) and all(name in translated for name in fields)
+        }
+    
     def chat_with_assistant(self, user_message: str, conversation_id: str, language: str = 'en') -> Dict[str, Any]:
         """
         Handle AI assistant chat conversations
@@ -156,47 +223,25 @@ class MagicAI:
             # Get relevant knowledge base content
             knowledge_context = self._get_relevant_knowledge(user_message, language)
             
-            # Build conversation history
-            recent_messages = self._get_recent_messages(conversation)
-            
             # Analyze user intent
             user_intent = self._analyze_user_intent(user_message)
             
-            # Generate AI response
-            system_prompt = f"""
-            You are a helpful AI assistant for JustCodeWorks.EU, a platform that empowers anyone to create professional websites effortlessly.
-            
-            Language: English (EU-based platform)
-            User Intent: {user_intent}
-            
-            Key Information about JustCodeWorks:
-            - Empowers people to build websites without technical knowledge
-            - AI-powered platform that handles everything automatically  
-            - Focus on simplicity and independence - no customer service needed
-            - Clean, professional results without complexity
-            - EU-based platform serving European businesses
-            
-            Relevant Knowledge:
-            {knowledge_context}
-            
-            Be helpful and encouraging. Focus on how easy and empowering our platform is.
-            Avoid technical jargon - speak to entrepreneurs and small business owners.
-            """
-            
-            messages = [{"role": "system", "content": system_prompt}]
-            
-            # Add recent conversation history
-            for msg in recent_messages:
-                role = "user" if msg.message_type == "user" else "assistant"
-                messages.append({"role": role, "content": msg.content})
-            
-            # Add current user message
-            messages.append({"role": "user", "content": user_message})
+            # Static system prompt first (cacheable), then summary and history; intent and
+            # knowledge go right before the new message, as much history as fits the token budget
+            prompt = prompt_registry.get('assistant_chat')
+            messages = context_builder.build_messages(
+                conversation,
+                prompt.system,
+                user_message,
+                context=prompt.render(intent=user_intent, knowledge=knowledge_context.strip() or '(none)')
+            )
             
             # Get AI response
             start_time = timezone.now()
-            response = self.client.chat.completions.create(
-                model="gpt-4",
+            response = llm_provider.complete(
+                self.client,
+                purpose='chat',
+                prompt=prompt,
                 messages=messages,
                 max_tokens=500,
                 temperature=0.8
@@ -209,9 +254,12 @@ class MagicAI:
             # Save messages
             self._save_conversation_messages(
                 conversation, user_message, ai_response, 
-                user_intent, response_time, response.usage
+                user_intent, response_time, response.usage, response.model
             )
             
+            # Fold turns that left the recent window into the summary, off the request path
+            context_builder.schedule_summary_update(conversation, self.client)
+            
             # Generate smart suggestions
             suggestions = self._generate_smart_suggestions(user_intent, conversation)
             
@@ -256,10 +304,6 @@ class MagicAI:
         except Exception:
             return ""
     
-    def _get_recent_messages(self, conversation: Conversation, limit: int = 6) -> List[Message]:
-        """Get recent conversation messages"""
-        return conversation.messages.order_by('-timestamp')[:limit]
-    
     def _analyze_user_intent(self, message: str) -> str:
         """Analyze user message to determine intent"""
         message_lower = message.lower()
@@ -276,7 +320,8 @@ class MagicAI:
             return 'general_chat'
     
     def _save_conversation_messages(self, conversation: Conversation, user_message: str, 
-                                  ai_response: str, intent: str, response_time: float, usage):
+                                  ai_response: str, intent: str, response_time: float, usage,
+                                  model: str = 'gpt-4'):
         """Save conversation messages"""
         # Save user message
         Message.objects.create(
@@ -291,7 +336,7 @@ class MagicAI:
             conversation=conversation,
             message_type='assistant',
             content=ai_response,
-            ai_model='gpt-4',
+            ai_model=model or 'gpt-4',
             response_time=response_time,
             prompt_tokens=usage.prompt_tokens,
             completion_tokens=usage.completion_tokens
@@ -300,7 +345,8 @@ class MagicAI:
         # Update conversation stats
         conversation.message_count += 2
         conversation.detected_intent = intent
-        conversation.save()
+        # Only these fields: rolling_summary may be updated concurrently in the background
+        conversation.save(update_fields=['message_count', 'detected_intent', 'last_activity'])
     
     def _generate_smart_suggestions(self, intent: str, conversation: Conversation) -> List[str]:
         """Generate contextual suggestions"""
@@ -339,7 +385,10 @@ class MagicAI:
         ])
     
     def _get_fallback_content(self, business_info: Dict[str, Any]) -> Dict[str, str]:
-        """Provide fallback content when AI generation fails"""
+        """
+        Provide fallback content when AI generation fails
+        Marked with is_fallback so it can be regenerated once the AI is available again
+        """
         company_name = business_info.get('company_name', 'Your Business')
         industry = business_info.get('industry', 'business')
         
@@ -349,7 +398,8 @@ class MagicAI:
             "about_content": f"{company_name} is a trusted {industry} company committed to delivering exceptional results.",
             "services_content": f"We offer comprehensive {industry} solutions tailored to meet your specific needs.",
             "contact_content": f"Get in touch with {company_name} today to discuss your requirements.",
-            "meta_description": f"{company_name} - Professional {industry} services. Contact us for expert solutions."
+            "meta_description": f"{company_name} - Professional {industry} services. Contact us for expert solutions.",
+            "is_fallback": True
         }
 
     def crawl_website_pages(self, base_url: str = None) -> bool:
@@ -592,5 +642,5 @@ class MagicAI:
             self.logger.error(f"Error saving to knowledge base: {e}")
 
 
-# Initialize global MagicAI instance
+# Initialize global MagicAI instance (cheap; the OpenAI client is created lazily)
 magic_ai = MagicAI()
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+Management command to list the registered LLM prompts with their versions and static sizes
+Usage: python manage.py list_prompts
+       python manage.py list_prompts --show system --name website_content
+"""
+from django.core.management.base import BaseCommand, CommandError
+from ai_assistant.prompts import prompt_registry
+
+
+class Command(BaseCommand):
+    help = 'List registered prompt templates: version, static-prefix fingerprint and token count'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--name',
+            help='Only this prompt'
+        )
+        parser.add_argument(
+            '--show',
+            choices=['system', 'dynamic'],
+            help='Also print the static system message or the dynamic template'
+        )
+
+    def handle(self, *args, **options):
+        prompts = list(prompt_registry)
+        if options['name']:
+            prompts = [prompt for prompt in prompts if prompt.name == options['name']]
+            if not prompts:
+                raise CommandError(f'No prompt named {options["name"]}')
+
+        self.stdout.write(f'{"prompt":<28}{"version":>8}  {"fingerprint":<14}{"static tokens":>14}')
+        for prompt in prompts:
+            self.stdout.write(f'{prompt.name:<28}{prompt.version:>8}  {prompt.fingerprint:<14}{prompt.static_tokens:>14}')
+            if options['show']:
+                self.stdout.write('')
+                self.stdout.write(getattr(prompt, options['show']))
+                self.stdout.write('')
@@ -0,0 +1,65 @@
+"""
+Management command to fill the localized columns of pages, blog posts and knowledge base entries
+Usage: python manage.py localize_content
+       python manage.py localize_content --model blog.Post --language nl --language de
+       python manage.py localize_content --dry-run
+Only languages whose source text changed since their last translation are regenerated.
+"""
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ai_assistant.localization import LOCALIZED_FIELDS, localize_model, stale_languages
+
+
+class Command(BaseCommand):
+    help = 'Translate pages, blog posts and knowledge base content into all site languages, one LLM call per object'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            choices=list(LOCALIZED_FIELDS),
+            help='Only localize this model (repeatable; default: all)'
+        )
+        parser.add_argument(
+            '--language',
+            action='append',
+            help='Only fill this language (repeatable; default: all LANGUAGES)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Retranslate up-to-date and hand-written languages too'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the translations that would be generated'
+        )
+
+    def handle(self, *args, **options):
+        available = [code for code, _name in settings.LANGUAGES]
+        languages = options['language'] or available
+        unknown = set(languages) - set(available)
+        if unknown:
+            raise CommandError(f'Unknown language(s): {", ".join(sorted(unknown))}')
+
+        for label in options['model'] or LOCALIZED_FIELDS:
+            if options['dry_run']:
+                fields = LOCALIZED_FIELDS[label]
+                stale = [
+                    len(stale_languages(obj, fields, languages, options['force']))
+                    for obj in apps.get_model(label).objects.all()
+                ]
+                self.stdout.write(
+                    f'{label}: {sum(stale)} translation(s) pending across {sum(1 for count in stale if count)} object(s)'
+                )
+                continue
+
+            stats = localize_model(label, languages=languages, force=options['force'])
+            self.stdout.write(self.style.SUCCESS(
+                f'{label}: {stats["languages"]} translation(s) written for {stats["objects"]} object(s) '
+                f'in {stats["calls"]} LLM call(s)'
+            ))
+            if stats['failed']:
+                self.stdout.write(self.style.WARNING(f'{label}: {stats["failed"]} translation(s) failed; rerun to retry'))
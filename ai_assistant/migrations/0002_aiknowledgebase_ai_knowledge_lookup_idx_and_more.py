@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_assistant', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aiknowledgebase',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-priority', '-usage_count'], name='ai_knowledge_lookup_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'timestamp'], name='ai_message_conv_time_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_assistant', '0002_aiknowledgebase_ai_knowledge_lookup_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aiknowledgebase',
+            name='translation_hashes',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_assistant', '0003_aiknowledgebase_translation_hashes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='rolling_summary',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='summarized_through_id',
+            field=models.IntegerField(default=0),
+        ),
+    ]
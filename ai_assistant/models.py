@@ -46,6 +46,10 @@ class Conversation(models.Model):
     budget_signals = models.JSONField(default=dict, blank=True)
     lead_score = models.IntegerField(default=0)  # 0-100
     
+    # Prompt context: older turns are folded into a rolling summary
+    rolling_summary = models.TextField(blank=True)
+    summarized_through_id = models.IntegerField(default=0)  # id of the last message folded into rolling_summary
+    
     # Status
     is_active = models.BooleanField(default=True)
     requires_followup = models.BooleanField(default=False)
@@ -112,6 +116,10 @@ class Message(models.Model):
     
     class Meta:
         ordering = ['timestamp']
+        indexes = [
+            # Conversation history in order
+            models.Index(fields=['conversation', 'timestamp'], name='ai_message_conv_time_idx'),
+        ]
     
     def __str__(self):
         return f"{self.get_message_type_display()}: {self.content[:50]}..."
@@ -141,6 +149,7 @@ class AIKnowledgeBase(models.Model):
     content_fr = models.TextField(blank=True)
     content_es = models.TextField(blank=True)
     content_pt = models.TextField(blank=True)
+    translation_hashes = models.JSONField(default=dict, blank=True)  # {language: hash of the source text it was translated from}
     
     # Keywords and matching
     keywords = models.JSONField(default=list, help_text="Keywords that trigger this content")
@@ -160,6 +169,14 @@ class AIKnowledgeBase(models.Model):
     
     class Meta:
         ordering = ['-priority', 'title']
+        indexes = [
+            # Knowledge retrieval (active entries, most important and most used first)
+            models.Index(
+                fields=['-priority', '-usage_count'], 
+                condition=models.Q(is_active=True), 
+                name='ai_knowledge_lookup_idx'
+            ),
+        ]
     
     def get_localized_content(self, language='en'):
         """Get content in specific language"""
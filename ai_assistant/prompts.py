@@ -0,0 +1,293 @@
+"""
+Prompt registry for every LLM call the platform makes
+Each prompt is a versioned PromptTemplate. Its static part (persona, instructions,
+output format) is the system message and never varies between calls, so the
+request starts with a byte-stable prefix that providers can serve from their
+prompt cache. Everything call-specific (business details, intent, knowledge)
+is rendered into the messages that come last.
+
+Changing a template's text means bumping its version; the fingerprint of the
+static part is logged with usage so cache hit rates can be compared per version.
+"""
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from textwrap import dedent
+
+
+logger = logging.getLogger(__name__)
+
+# Chat formatting overhead per message (role and separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding('cl100k_base')
+except Exception:
+    _encoding = None
+
+
+def count_tokens(text):
+    """Token count with tiktoken when installed, else the usual ~4 characters per token estimate"""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return len(text) // 4 + 1
+
+
+class PromptTemplate:
+    """
+    Static system message plus a str.format template for the dynamic part
+
+    Args:
+        name: Registry name
+        version: Bumped whenever the text changes
+        system: Static system message (the cacheable prefix)
+        dynamic: Template for the per-call part, filled with render(**values)
+    """
+
+    def __init__(self, name, version, system, dynamic):
+        self.name = name
+        self.version = version
+        self.system = dedent(system).strip()
+        self.dynamic = dedent(dynamic).strip()
+        self.key = f'{name}@v{version}'
+        self.fingerprint = hashlib.sha256(self.system.encode()).hexdigest()[:12]
+        self.static_tokens = count_tokens(self.system) + MESSAGE_OVERHEAD_TOKENS
+        self._usage = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def render(self, **values):
+        return self.dynamic.format(**values)
+
+    def messages(self, **values):
+        """Chat messages for a single-shot call: static system message, then the rendered user message"""
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.render(**values)},
+        ]
+
+    def record_usage(self, response):
+        """Called by LLMProvider with each successful response made from this prompt"""
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return
+
+        prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = getattr(details, 'cached_tokens', 0) or 0
+        with self._lock:
+            self._usage['calls'] += 1
+            self._usage['prompt_tokens'] += prompt_tokens
+            self._usage['cached_tokens'] += cached_tokens
+            self._usage['completion_tokens'] += getattr(usage, 'completion_tokens', 0) or 0
+
+        logger.debug(
+            f"prompt {self.key} ({self.fingerprint}): {prompt_tokens} prompt tokens, "
+            f"{cached_tokens} cached, {self.static_tokens} static"
+        )
+
+    def stats(self):
+        with self._lock:
+            usage = dict(self._usage)
+        calls = usage.get('calls', 0)
+        return {
+            'key': self.key,
+            'fingerprint': self.fingerprint,
+            'static_tokens': self.static_tokens,
+            'calls': calls,
+            'avg_prompt_tokens': usage.get('prompt_tokens', 0) / calls if calls else 0,
+            'cache_hit_rate': usage.get('cached_tokens', 0) / usage['prompt_tokens'] if usage.get('prompt_tokens') else 0,
+        }
+
+
+class PromptRegistry:
+    """Named prompt templates; one version of each is live at a time"""
+
+    def __init__(self):
+        self._prompts = {}
+
+    def register(self, name, version, system, dynamic):
+        if name in self._prompts:
+            raise ValueError(f"Prompt {name} is already registered")
+        self._prompts[name] = PromptTemplate(name, version, system, dynamic)
+        return self._prompts[name]
+
+    def get(self, name):
+        return self._prompts[name]
+
+    def __iter__(self):
+        return iter(self._prompts.values())
+
+    def stats(self):
+        return [prompt.stats() for prompt in self]
+
+
+# Initialize global prompt registry
+prompt_registry = PromptRegistry()
+
+
+prompt_registry.register(
+    'assistant_chat', 2,
+    system="""
+        You are a helpful AI assistant for JustCodeWorks.EU, a platform that empowers anyone to create professional websites effortlessly.
+
+        Language: English (EU-based platform)
+
+        Key Information about JustCodeWorks:
+        - Empowers people to build websites without technical knowledge
+        - AI-powered platform that handles everything automatically
+        - Focus on simplicity and independence - no customer service needed
+        - Clean, professional results without complexity
+        - EU-based platform serving European businesses
+
+        Be helpful and encouraging. Focus on how easy and empowering our platform is.
+        Avoid technical jargon - speak to entrepreneurs and small business owners.
+        Use the user intent and relevant knowledge given with the latest message.
+    """,
+    dynamic="""
+        User Intent: {intent}
+
+        Relevant Knowledge:
+        {knowledge}
+    """,
+)
+
+prompt_registry.register(
+    'website_content', 2,
+    system="""
+        You are an expert copywriter specializing in business websites. Generate compelling, professional content that drives conversions.
+
+        Generate professional website content for the company described by the user:
+        1. Homepage hero section (compelling headline + description)
+        2. About Us page content
+        3. Services overview
+        4. Contact page content
+        5. SEO meta description
+
+        Make it engaging, professional, and conversion-focused.
+        Return as JSON format with keys: hero_headline, hero_description, about_content, services_content, contact_content, meta_description
+    """,
+    dynamic="""
+        Company Name: {company_name}
+        Industry: {industry}
+        Location: {location}
+        Services: {services}
+        Target Audience: {target_audience}
+    """,
+)
+
+prompt_registry.register(
+    'service_descriptions', 2,
+    system="""
+        You are an expert copywriter specializing in business websites. Generate compelling, professional content that drives conversions.
+
+        Write website copy for each service listed by the user. For every service write:
+        1. short_description: one sentence, max 150 characters
+        2. detailed_description: 2-3 sentences for the service page
+        3. features: 3-4 short benefit bullet points
+
+        Return a JSON array with one object per service, in the same order, with keys: service_name, short_description, detailed_description, features
+    """,
+    dynamic="""
+        Company Name: {company_name}
+        Industry: {industry}
+        Location: {location}
+        Tone: {tone}
+
+        Services:
+        {service_lines}
+    """,
+)
+
+prompt_registry.register(
+    'blog_post', 2,
+    system="""
+        You are an expert business advisor and content creator. Write practical, actionable content that helps small businesses succeed online.
+
+        Write a comprehensive blog post on the topic given by the user.
+
+        Target audience: Small business owners and entrepreneurs using JustCodeWorks
+        Focus: Actionable advice that helps grow online business
+
+        Include:
+        1. Engaging title
+        2. Brief excerpt/summary (max 300 characters)
+        3. Full article content (800-1200 words)
+        4. SEO meta description
+        5. Suggested tags (comma-separated)
+
+        Make it practical, actionable, and relate back to website/online business success.
+        Return as JSON: title, excerpt, content, meta_description, tags
+    """,
+    dynamic="""
+        Topic: {topic}
+        Post type: {content_type}
+        Language: {language}
+    """,
+)
+
+prompt_registry.register(
+    'translate_fields', 2,
+    system="""
+        You are a professional website translator. Return only valid JSON.
+
+        Keep HTML tags, links, placeholders and brand names (JustCodeWorks) unchanged.
+        Keep the meaning, tone and length of the original.
+
+        Return JSON with one key per requested language code, each holding an object with the same field names as the input.
+    """,
+    dynamic="""
+        Translate the JSON fields below from {source_language} into each of these languages: {targets}
+
+        Fields:
+        {fields}
+    """,
+)
+
+prompt_registry.register(
+    'conversation_summary', 2,
+    system="""
+        You maintain concise running summaries of conversations between website visitors and the JustCodeWorks assistant.
+
+        Update the current summary with the new messages.
+        Keep every fact about the visitor (name, business, needs, budget, decisions) and open questions.
+        Write plain sentences and stay within the requested length.
+    """,
+    dynamic="""
+        Maximum length: {max_words} words
+
+        Current summary:
+        {summary}
+
+        New messages:
+        {transcript}
+    """,
+)
+
+prompt_registry.register(
+    'business_recognition', 2,
+    system="""
+        You are Clippy 2.0, an enthusiastic AI assistant that helps build websites. You're knowledgeable about different industries and always encouraging. Keep responses concise but warm.
+
+        A business owner has just told you their business name, and their industry has been detected. You need to:
+        1. Give an enthusiastic, personalized recognition of their business
+        2. Suggest 8-10 relevant services they might offer
+        3. Keep the tone conversational and encouraging
+
+        Make the recognition message feel personal and specific to their business name and industry.
+        For multi-industry businesses, acknowledge how they combine different services.
+
+        Return as JSON:
+        {
+            "recognition_message": "Enthusiastic recognition message mentioning the business name and industry",
+            "suggested_services": ["Service 1", "Service 2", ..., "Service 8-10"]
+        }
+    """,
+    dynamic="""
+        Business name: "{business_name}"
+        Operates in: {industry_context}
+    """,
+)
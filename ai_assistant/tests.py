@@ -1,3 +1,308 @@
-from django.test import TestCase
+import time
+from types import SimpleNamespace
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from pages.models import Page
+from .circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from .context_builder import ConversationContextBuilder, message_tokens
+from .llm_provider import LLMCircuitOpenError, LLMProvider, LLMUnavailableError
+from .localization import localize_objects, source_hash, stale_languages
+from .models import Conversation, Message
 
-# Create your tests here.
+
+class FakeClient:
+    """
+    OpenAI-compatible client whose models answer after a delay or raise
+    behaviour: {model: seconds to answer, or an exception to raise}
+    """
+
+    def __init__(self, behaviour):
+        self.behaviour = behaviour
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, timeout=None, **kwargs):
+        self.calls.append(model)
+        outcome = self.behaviour.get(model, 0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        time.sleep(outcome)
+        return SimpleNamespace(model=model, choices=[SimpleNamespace(message=SimpleNamespace(content=f'from {model}'))])
+
+
+MESSAGES = [{'role': 'user', 'content': 'Hello'}]
+
+
+@override_settings(
+    AI_LLM_PRIMARY_MODEL='primary',
+    AI_LLM_HEDGE_MODEL='hedge',
+    AI_LLM_HEDGE_AFTER=0.05,
+    AI_LLM_FALLBACK_MODELS=['fallback'],
+    AI_LLM_DEADLINES={'default': 2},
+)
+class LLMProviderTests(SimpleTestCase):
+    def setUp(self):
+        self.provider = LLMProvider()
+
+    def test_fast_primary_is_not_hedged(self):
+        client = FakeClient({'primary': 0})
+
+        response = self.provider.complete(client, MESSAGES)
+
+        self.assertEqual(response.model, 'primary')
+        self.assertEqual(client.calls, ['primary'])
+        self.assertNotIn('hedges', self.provider.stats())
+
+    def test_slow_primary_is_hedged_and_hedge_wins(self):
+        client = FakeClient({'primary': 0.5, 'hedge': 0})
+
+        response = self.provider.complete(client, MESSAGES)
+
+        self.assertEqual(response.model, 'hedge')
+        self.assertEqual(self.provider.stats()['hedge_wins'], 1)
+
+    def test_failed_primary_falls_back(self):
+        client = FakeClient({'primary': RuntimeError('boom')})
+
+        response = self.provider.complete(client, MESSAGES, hedge=False)
+
+        self.assertEqual(response.model, 'fallback')
+        self.assertEqual(client.calls, ['primary', 'fallback'])
+
+    def test_all_models_failing_raises(self):
+        client = FakeClient({model: RuntimeError('boom') for model in ('primary', 'hedge', 'fallback')})
+
+        with self.assertRaises(LLMUnavailableError):
+            self.provider.complete(client, MESSAGES)
+
+    def test_deadline_bounds_the_wait(self):
+        client = FakeClient({'primary': 1, 'hedge': 1, 'fallback': 1})
+
+        started = time.monotonic()
+        with self.assertRaisesMessage(LLMUnavailableError, 'deadline exceeded'):
+            self.provider.complete(client, MESSAGES, deadline=0.2)
+
+        self.assertLess(time.monotonic() - started, 0.8)
+
+    def test_hedge_delay_follows_observed_p95(self):
+        for _ in range(self.provider.latency.min_samples):
+            self.provider.latency.record('primary', 0.3)
+
+        self.assertEqual(self.provider.hedge_delay('primary'), 0.3)
+        self.assertEqual(self.provider.hedge_delay('other'), 0.05)
+
+
+@override_settings(AI_CIRCUIT_BREAKER={
+    'window': 10, 'min_calls': 4, 'error_rate': 0.5,
+    'slow_call_fraction': 0.5, 'slow_call_rate': 0.5, 'open_seconds': 0.05,
+})
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker('test')
+
+    def test_opens_on_error_rate_after_min_calls(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+        self.breaker.record_success(0.1, deadline=10)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_opens_on_calls_slow_for_their_deadline(self):
+        # 4s is fast for a 30s content call but slow for a 5s chat reply
+        for _ in range(4):
+            self.breaker.record_success(4, deadline=30)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+        for _ in range(4):
+            self.breaker.record_success(4, deadline=5)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_single_probe_after_cool_down_closes_circuit(self):
+        recovered = []
+        self.breaker.add_recovery_listener(lambda: recovered.append(True))
+        self.breaker._trip('test')
+
+        time.sleep(0.06)
+        self.assertTrue(self.breaker.allow_request())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+        self.breaker.record_success(0.1, deadline=10)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(recovered, [True])
+
+    def test_failed_probe_reopens_circuit(self):
+        self.breaker._trip('test')
+        time.sleep(0.06)
+        self.assertTrue(self.breaker.allow_request())
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_provider_keeps_one_breaker_per_purpose(self):
+        provider = LLMProvider()
+        provider.breaker('content')._trip('test')
+
+        with self.assertRaises(LLMCircuitOpenError):
+            provider.complete(FakeClient({}), MESSAGES, purpose='content')
+
+        self.assertEqual(provider.breaker('chat').state, CLOSED)
+        self.assertIs(provider.breaker('chat'), provider.breaker('chat'))
+
+
+class FakeTranslator:
+    """Stands in for MagicAI.translate_fields; answers every language unless told to leave some out"""
+
+    def __init__(self, missing=(), text=None):
+        self.missing = set(missing)
+        self.text = text
+        self.calls = []
+
+    def translate_fields(self, fields, languages, source_language, max_tokens):
+        self.calls.append(list(languages))
+        return {
+            language: {name: self.text or f'{value} [{language}]' for name, value in fields.items()}
+            for language in languages if language not in self.missing
+        }
+
+
+class LocalizationTests(TestCase):
+    fields = ['title', 'content']
+    languages = ['en', 'nl', 'de']
+
+    def setUp(self):
+        author = User.objects.create_user('author', 'author@example.com', 'password')
+        self.page = Page.objects.create(title='About us', content='We fix pipes.', author=author)
+
+    def test_untranslated_languages_are_stale(self):
+        self.assertEqual(stale_languages(self.page, self.fields, self.languages), self.languages)
+
+    def test_translation_of_current_source_is_not_stale(self):
+        self.page.translation_hashes = {'nl': source_hash(self.page, self.fields)}
+
+        self.assertEqual(stale_languages(self.page, self.fields, self.languages), ['en', 'de'])
+        self.assertEqual(stale_languages(self.page, self.fields, self.languages, force=True), self.languages)
+
+    def test_changed_source_makes_translation_stale(self):
+        self.page.translation_hashes = {'nl': source_hash(self.page, self.fields)}
+        self.page.content = 'We fix pipes and boilers.'
+
+        self.assertIn('nl', stale_languages(self.page, self.fields, self.languages))
+
+    def test_hand_written_translation_is_kept(self):
+        self.page.title_nl = 'Over ons'
+
+        self.assertEqual(stale_languages(self.page, self.fields, self.languages), ['en', 'de'])
+        self.assertIn('nl', stale_languages(self.page, self.fields, self.languages, force=True))
+
+    def test_one_call_translates_all_stale_languages(self):
+        translator = FakeTranslator()
+
+        stats = localize_objects([self.page], self.fields, self.languages, magic=translator)
+
+        self.assertEqual(translator.calls, [['nl', 'de']])
+        self.assertEqual(stats, {'objects': 1, 'languages': 3, 'calls': 1, 'failed': 0})
+        self.page.refresh_from_db()
+        self.assertEqual(self.page.title_en, 'About us')
+        self.assertEqual(self.page.title_nl, 'About us [nl]')
+        self.assertEqual(stale_languages(self.page, self.fields, self.languages), [])
+
+    def test_missing_language_is_failed_and_retried_later(self):
+        stats = localize_objects([self.page], self.fields, self.languages, magic=FakeTranslator(missing=['de']))
+
+        self.assertEqual(stats['failed'], 1)
+        self.page.refresh_from_db()
+        self.assertEqual(self.page.title_de, '')
+        self.assertEqual(stale_languages(self.page, self.fields, self.languages), ['de'])
+
+    def test_long_translation_is_fitted_to_the_column(self):
+        localize_objects([self.page], self.fields, ['nl'], magic=FakeTranslator(text='x' * 500))
+
+        self.page.refresh_from_db()
+        self.assertEqual(len(self.page.title_nl), 200)
+        self.assertEqual(len(self.page.content_nl), 500)
+
+
+@override_settings(AI_CONTEXT_RECENT_TOKENS=300, AI_CONTEXT_SUMMARY_BATCH_TOKENS=200, AI_LLM_HEDGE_MODEL=None)
+class ContextBuilderTests(TestCase):
+    def setUp(self):
+        self.builder = ConversationContextBuilder()
+        self.conversation = Conversation.objects.create(session_id='test-session')
+        for i in range(30):
+            Message.objects.create(
+                conversation=self.conversation,
+                message_type='user' if i % 2 == 0 else 'assistant',
+                content=f'Message {i}: ' + 'about my bakery website ' * 5
+            )
+        self.contents = [f'Message {i}: ' + 'about my bakery website ' * 5 for i in range(30)]
+
+    def test_history_is_newest_messages_within_budget(self):
+        messages = self.builder.build_messages(self.conversation, 'You are Clippy.', 'Hi again', budget=400)
+
+        self.assertEqual(messages[0], {'role': 'system', 'content': 'You are Clippy.'})
+        self.assertEqual(messages[-1], {'role': 'user', 'content': 'Hi again'})
+        self.assertLessEqual(sum(message_tokens(message) for message in messages), 400)
+
+        history = [message['content'] for message in messages[1:-1]]
+        self.assertTrue(0 < len(history) < 30)
+        self.assertEqual(history, self.contents[-len(history):])
+        self.assertEqual(messages[-2]['role'], 'assistant')
+
+    def test_rolling_summary_and_context_are_included(self):
+        self.conversation.rolling_summary = 'The visitor runs a bakery.'
+
+        messages = self.builder.build_messages(
+            self.conversation, 'You are Clippy.', 'Hi again', context='Page: pricing', budget=400
+        )
+
+        self.assertIn('The visitor runs a bakery.', messages[1]['content'])
+        self.assertEqual(messages[-2], {'role': 'system', 'content': 'Page: pricing'})
+
+    def test_only_messages_outside_recent_window_are_summarized(self):
+        older = self.builder.messages_to_summarize(self.conversation)
+
+        self.assertTrue(older)
+        self.assertEqual([message['content'] for message in older], self.contents[:len(older)])
+        # The newest messages stay verbatim up to AI_CONTEXT_RECENT_TOKENS
+        recent_tokens = sum(message_tokens(message) for message in self.builder.unsummarized_messages(self.conversation)[:30 - len(older)])
+        self.assertLessEqual(recent_tokens, 300)
+        self.assertGreater(recent_tokens + message_tokens(older[-1]), 300)
+
+    def test_update_summary_folds_older_messages(self):
+        older = self.builder.messages_to_summarize(self.conversation)
+
+        self.assertTrue(self.builder.update_summary(self.conversation, FakeClient({})))
+
+        self.conversation.refresh_from_db()
+        self.assertTrue(self.conversation.rolling_summary)
+        self.assertEqual(self.conversation.summarized_through_id, older[-1]['id'])
+        self.assertEqual(self.builder.messages_to_summarize(self.conversation), [])
+
+    def test_turns_dropped_for_a_large_context_are_summarized(self):
+        ids = list(self.conversation.messages.order_by('id').values_list('id', flat=True))
+        large_context = 'Knowledge base: ' + 'fresh bread every morning ' * 40
+
+        messages = self.builder.build_messages(
+            self.conversation, 'You are Clippy.', 'Hi again', context=large_context, budget=500
+        )
+        in_prompt = [message['content'] for message in messages if message['content'] in self.contents]
+        # The context leaves less room for history than the 300-token recent window
+        history_tokens, capped = self.builder.recent_window(self.conversation)
+        self.assertTrue(capped)
+        self.assertLess(history_tokens, 300)
+
+        self.assertTrue(self.builder.update_summary(self.conversation, FakeClient({})))
+
+        # Every turn is either folded into the summary or still in the prompt
+        summarized = [pk for pk in ids if pk <= self.conversation.summarized_through_id]
+        self.assertEqual(len(summarized) + len(in_prompt), 30)
+        self.assertEqual(in_prompt, self.contents[len(summarized):])
+
+    def test_concurrent_summary_update_is_not_overwritten(self):
+        stale = Conversation.objects.get(pk=self.conversation.pk)
+        self.builder.update_summary(self.conversation, FakeClient({}))
+
+        self.assertFalse(self.builder.update_summary(stale, FakeClient({})))
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class AnalyticsIntegrationConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'analytics_integration'
+    verbose_name = 'Analytics Integration'
+    
+    def ready(self):
+        """
+        Register signals that keep the materialized tracking snippets up to date
+        """
+        from . import signals  # noqa: F401
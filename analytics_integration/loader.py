@@ -0,0 +1,69 @@
+# Analytics Integration - Deferred Tracking Loader
+
+import json
+
+
+# Trackers whose integration requires consent only load once the visitor accepts;
+# the choice is remembered per visitor. Unless the site sets
+# window.jcwAnalyticsBanner=false and calls window.jcwAnalyticsConsent(true|false)
+# from its own cookie banner, a minimal Accept/Decline banner asks for it.
+# Nothing is fetched from third parties before the page has loaded and the
+# browser is idle.
+LOADER_TEMPLATE = """<script>
+(function(w,d,trackers){
+var KEY='jcw_analytics_consent',loaded={},banner=null;
+function decision(){try{return w.localStorage.getItem(KEY);}catch(e){return null;}}
+function inject(src){var s=d.createElement('script');s.async=true;s.src=src;d.head.appendChild(s);return s;}
+var loaders={
+google_analytics:function(id){w.dataLayer=w.dataLayer||[];w.gtag=w.gtag||function(){w.dataLayer.push(arguments);};w.gtag('js',new Date());w.gtag('config',id);inject('https://www.googletagmanager.com/gtag/js?id='+encodeURIComponent(id));},
+facebook_pixel:function(id){if(!w.fbq){var n=w.fbq=function(){n.callMethod?n.callMethod.apply(n,arguments):n.queue.push(arguments);};if(!w._fbq)w._fbq=n;n.push=n;n.loaded=true;n.version='2.0';n.queue=[];inject('https://connect.facebook.net/en_US/fbevents.js');}w.fbq('init',id);w.fbq('track','PageView');},
+bing_ads:function(id){w.uetq=w.uetq||[];inject('https://bat.bing.com/bat.js').onload=function(){var o={ti:id};o.q=w.uetq;w.uetq=new UET(o);w.uetq.push('pageLoad');};}
+};
+function start(){var granted=decision()==='granted';for(var i=0;i<trackers.length;i++){var t=trackers[i],load=loaders[t.provider];if(loaded[i]||!load||(t.consent&&!granted))continue;loaded[i]=true;try{load(t.id);}catch(e){}}}
+function idle(){(w.requestIdleCallback||function(cb){return setTimeout(cb,1);})(start,{timeout:3000});}
+function schedule(fn){if(d.readyState==='complete'){fn();}else{w.addEventListener('load',fn);}}
+function showBanner(){
+if(banner||w.jcwAnalyticsBanner===false||decision()!==null)return;
+var needed=false;for(var i=0;i<trackers.length;i++){if(trackers[i].consent)needed=true;}if(!needed)return;
+banner=d.createElement('div');banner.setAttribute('role','dialog');banner.setAttribute('aria-label','Cookie consent');
+banner.style.cssText='position:fixed;left:16px;right:16px;bottom:16px;z-index:2147483647;max-width:560px;margin:0 auto;padding:12px 16px;background:#fff;color:#222;border-radius:8px;box-shadow:0 2px 12px rgba(0,0,0,.25);font:14px/1.4 sans-serif';
+var text=d.createElement('span');text.textContent='We use analytics cookies to understand how visitors use this site.';banner.appendChild(text);
+function button(label,granted){var b=d.createElement('button');b.type='button';b.textContent=label;b.style.cssText='margin-left:8px;padding:4px 12px;cursor:pointer';b.onclick=function(){w.jcwAnalyticsConsent(granted);};banner.appendChild(b);}
+button('Accept',true);button('Decline',false);d.body.appendChild(banner);
+}
+w.jcwAnalyticsConsent=function(granted){try{w.localStorage.setItem(KEY,granted?'granted':'denied');}catch(e){}if(banner){banner.parentNode.removeChild(banner);banner=null;}if(granted)schedule(idle);};
+schedule(function(){idle();showBanner();});
+})(window,document,%(trackers)s);
+</script>"""
+
+
+def build_tracking_loader(integrations):
+    """
+    Build a single deferred loader script for all configured trackers
+    
+    Replaces the separate inline snippets from AnalyticsIntegration.tracking_code,
+    which each blocked rendering and fetched their library during page load.
+    
+    Args:
+        integrations: iterable of AnalyticsIntegration instances
+        
+    Returns:
+        str: <script> tag, or an empty string when no tracker is configured
+    """
+    trackers = []
+    for integration in integrations:
+        tracker_id = integration.tracker_id
+        if tracker_id:
+            trackers.append({
+                'provider': integration.provider.name,
+                'id': tracker_id,
+                'consent': integration.require_consent,
+            })
+    
+    if not trackers:
+        return ''
+    
+    # Escape "<" so a tracker ID can never close the surrounding script tag
+    trackers_json = json.dumps(trackers, separators=(',', ':')).replace('<', '\\u003c')
+    
+    return LOADER_TEMPLATE % {'trackers': trackers_json}
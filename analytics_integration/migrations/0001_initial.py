@@ -0,0 +1,120 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:37
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsProvider',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(choices=[('google_analytics', 'Google Analytics'), ('facebook_pixel', 'Facebook Pixel'), ('bing_ads', 'Bing Ads'), ('google_tag_manager', 'Google Tag Manager')], max_length=50, unique=True)),
+                ('display_name', models.CharField(max_length=100)),
+                ('is_active', models.BooleanField(default=True)),
+                ('api_endpoint', models.URLField(blank=True, null=True)),
+                ('documentation_url', models.URLField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AnalyticsIntegration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('not_connected', 'Not Connected'), ('pending', 'Pending'), ('connected', 'Connected'), ('error', 'Error')], default='not_connected', max_length=20)),
+                ('google_email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('property_id', models.CharField(blank=True, max_length=50, null=True)),
+                ('measurement_id', models.CharField(blank=True, max_length=50, null=True)),
+                ('facebook_email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('pixel_id', models.CharField(blank=True, max_length=20, null=True, validators=[django.core.validators.RegexValidator(message='Enter a valid Facebook Pixel ID', regex='^\\d{15,16}$')])),
+                ('bing_email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('uet_tag_id', models.CharField(blank=True, max_length=20, null=True)),
+                ('auto_inject', models.BooleanField(default=True)),
+                ('track_conversions', models.BooleanField(default=True)),
+                ('track_events', models.BooleanField(default=True)),
+                ('track_ecommerce', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('last_sync', models.DateTimeField(blank=True, null=True)),
+                ('sync_error', models.TextField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('provider', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='analytics_integration.analyticsprovider')),
+            ],
+            options={
+                'unique_together': {('user', 'provider')},
+            },
+        ),
+        migrations.CreateModel(
+            name='WebsiteIntegrationStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_active', models.BooleanField(default=True)),
+                ('installed_at', models.DateTimeField(auto_now_add=True)),
+                ('last_verified', models.DateTimeField(blank=True, null=True)),
+                ('verification_status', models.CharField(choices=[('pending', 'Pending'), ('verified', 'Verified'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('integration', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='analytics_integration.analyticsintegration')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WebsiteTracking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('website_url', models.URLField()),
+                ('website_name', models.CharField(max_length=200)),
+                ('auto_inject_enabled', models.BooleanField(default=True)),
+                ('inject_in_head', models.BooleanField(default=True)),
+                ('inject_in_body', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('integrations', models.ManyToManyField(through='analytics_integration.WebsiteIntegrationStatus', to='analytics_integration.analyticsintegration')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='websiteintegrationstatus',
+            name='website',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='analytics_integration.websitetracking'),
+        ),
+        migrations.CreateModel(
+            name='AnalyticsEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('page_view', 'Page View'), ('form_submit', 'Form Submit'), ('purchase', 'Purchase'), ('signup', 'Sign Up'), ('download', 'Download'), ('custom', 'Custom Event')], max_length=20)),
+                ('event_name', models.CharField(max_length=100)),
+                ('event_data', models.JSONField(blank=True, default=dict)),
+                ('user_ip', models.GenericIPAddressField(blank=True, null=True)),
+                ('user_agent', models.TextField(blank=True, null=True)),
+                ('referrer', models.URLField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(auto_now_add=True)),
+                ('integration', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='analytics_integration.analyticsintegration')),
+                ('website', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='analytics_integration.websitetracking')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='websiteintegrationstatus',
+            unique_together={('website', 'integration')},
+        ),
+        migrations.CreateModel(
+            name='TrackingSnippet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('html', models.TextField(blank=True)),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tracking_snippets', to=settings.AUTH_USER_MODEL)),
+                ('website', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tracking_snippets', to='analytics_integration.websitetracking')),
+            ],
+            options={
+                'unique_together': {('user', 'website')},
+            },
+        ),
+    ]
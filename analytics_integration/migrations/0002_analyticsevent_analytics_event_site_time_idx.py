@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics_integration', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='analyticsevent',
+            index=models.Index(fields=['website', 'timestamp'], name='analytics_event_site_time_idx'),
+        ),
+    ]
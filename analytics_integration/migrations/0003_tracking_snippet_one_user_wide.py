@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def drop_duplicate_user_wide_snippets(apps, schema_editor):
+    """Keep the most recently updated user-wide snippet of each user"""
+    TrackingSnippet = apps.get_model('analytics_integration', 'TrackingSnippet')
+    
+    seen_users = set()
+    snippets = TrackingSnippet.objects.filter(website__isnull=True).order_by('user_id', '-updated_at', '-pk')
+    for snippet in snippets.only('pk', 'user_id'):
+        if snippet.user_id in seen_users:
+            snippet.delete()
+        seen_users.add(snippet.user_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics_integration', '0002_analyticsevent_analytics_event_site_time_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_user_wide_snippets, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='trackingsnippet',
+            constraint=models.UniqueConstraint(condition=models.Q(('website__isnull', True)), fields=('user',), name='analytics_snippet_one_user_wide'),
+        ),
+    ]
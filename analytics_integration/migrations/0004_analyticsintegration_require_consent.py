@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+def rebuild_tracking_snippets(apps, schema_editor):
+    """
+    Rebuild materialized snippets so they carry the per-tracker consent flags
+    
+    Goes through the service (and so the current models) because the loader
+    is built from model properties that historical models don't have.
+    """
+    from django.contrib.auth.models import User
+    from analytics_integration.services import analytics_service
+    
+    TrackingSnippet = apps.get_model('analytics_integration', 'TrackingSnippet')
+    
+    user_ids = TrackingSnippet.objects.values_list('user_id', flat=True).distinct()
+    for user in User.objects.filter(pk__in=user_ids):
+        analytics_service.rebuild_user_snippets(user)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics_integration', '0003_tracking_snippet_one_user_wide'),
+    ]
+
+    operations = [
+        # Existing integrations were tracking without a consent gate; keep them that way
+        migrations.AddField(
+            model_name='analyticsintegration',
+            name='require_consent',
+            field=models.BooleanField(default=False, help_text='Only load this tracker once the visitor accepts analytics cookies'),
+        ),
+        migrations.AlterField(
+            model_name='analyticsintegration',
+            name='require_consent',
+            field=models.BooleanField(default=True, help_text='Only load this tracker once the visitor accepts analytics cookies'),
+        ),
+        migrations.RunPython(rebuild_tracking_snippets, migrations.RunPython.noop),
+    ]
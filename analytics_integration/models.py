@@ -57,6 +57,10 @@ class AnalyticsIntegration(models.Model):
     
     # Configuration settings
     auto_inject = models.BooleanField(default=True)
+    require_consent = models.BooleanField(
+        default=True,
+        help_text='Only load this tracker once the visitor accepts analytics cookies'
+    )
     track_conversions = models.BooleanField(default=True)
     track_events = models.BooleanField(default=True)
     track_ecommerce = models.BooleanField(default=False)
@@ -115,6 +119,16 @@ fbq('track', 'PageView');
 </script>'''
         
         return ''
+    
+    @property
+    def tracker_id(self):
+        """Tracker ID consumed by the deferred site loader (see loader.py)"""
+        tracker_ids = {
+            'google_analytics': self.measurement_id,
+            'facebook_pixel': self.pixel_id,
+            'bing_ads': self.uet_tag_id,
+        }
+        return tracker_ids.get(self.provider.name)
 
 
 class WebsiteTracking(models.Model):
@@ -191,5 +205,44 @@ class AnalyticsEvent(models.Model):
     
     timestamp = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            # Per-website event timelines and reports
+            models.Index(fields=['website', 'timestamp'], name='analytics_event_site_time_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.event_name} - {self.website.website_name}"
+
+
+class TrackingSnippet(models.Model):
+    """Materialized combined tracking code for a user (website=None) or a specific website"""
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tracking_snippets')
+    website = models.ForeignKey(
+        WebsiteTracking, 
+        on_delete=models.CASCADE, 
+        blank=True, 
+        null=True,
+        related_name='tracking_snippets'
+    )
+    
+    html = models.TextField(blank=True)
+    version = models.PositiveIntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['user', 'website']
+        constraints = [
+            # unique_together never matches NULLs, so it allows many user-wide snippets
+            models.UniqueConstraint(
+                fields=['user'], 
+                condition=models.Q(website__isnull=True), 
+                name='analytics_snippet_one_user_wide'
+            ),
+        ]
+    
     def __str__(self):
-        return f"{self.event_name} - {self.website.website_name}"
\ No newline at end of file
+        target = self.website.website_name if self.website else 'all websites'
+        return f"{self.user.username} - {target} (v{self.version})"
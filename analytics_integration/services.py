@@ -1,11 +1,11 @@
 # Analytics Integration Services
 
-import requests
 import json
 from datetime import datetime
 from django.conf import settings
 from django.contrib.auth.models import User
-from .models import AnalyticsIntegration, AnalyticsProvider, WebsiteTracking
+from .models import AnalyticsIntegration, AnalyticsProvider, WebsiteTracking, TrackingSnippet
+from .loader import build_tracking_loader
 
 
 class AnalyticsIntegrationService:
@@ -244,6 +244,7 @@ class AnalyticsIntegrationService:
                 'last_sync': integration.last_sync,
                 'tracking_code': integration.tracking_code,
                 'auto_inject': integration.auto_inject,
+                'require_consent': integration.require_consent,
                 'config': {
                     'google_email': integration.google_email,
                     'property_id': integration.property_id,
@@ -295,22 +296,98 @@ class AnalyticsIntegrationService:
     
     def generate_combined_tracking_code(self, user, website_url=None):
         """
-        Generate combined tracking code for all active integrations
+        Get the combined deferred tracking loader for all active integrations
+        
+        Served from the materialized TrackingSnippet; it is only rebuilt here
+        when no snippet exists yet (signals keep existing snippets current).
+        """
+        website = None
+        if website_url:
+            website = WebsiteTracking.objects.filter(user=user, website_url=website_url).first()
+        
+        snippet = TrackingSnippet.objects.filter(user=user, website=website).first()
+        if snippet is None:
+            snippet = self.rebuild_tracking_snippet(user, website)
+        
+        return snippet.html
+    
+    def rebuild_tracking_snippet(self, user, website=None):
+        """
+        Rebuild the materialized tracking snippet for a user or one of their websites
+        
+        The version only increases when the generated code actually changed, so
+        published sites can tell whether their embedded copy is stale.
         """
         integrations = AnalyticsIntegration.objects.filter(
             user=user,
-            status='connected'
+            status='connected',
+            auto_inject=True,
+            provider__is_active=True
         ).select_related('provider')
         
-        combined_code = "<!-- JustCodeWorks Analytics Integration -->\n"
+        if website is not None:
+            integrations = integrations.filter(
+                websiteintegrationstatus__website=website,
+                websiteintegrationstatus__is_active=True
+            )
         
-        for integration in integrations:
-            if integration.tracking_code:
-                combined_code += f"\n{integration.tracking_code}\n"
+        html = self._build_combined_tracking_code(integrations)
+        
+        snippet, created = TrackingSnippet.objects.get_or_create(
+            user=user,
+            website=website,
+            defaults={'html': html, 'version': 1}
+        )
+        
+        if not created and snippet.html != html:
+            snippet.html = html
+            snippet.version += 1
+            snippet.save()
+        
+        return snippet
+    
+    def rebuild_user_snippets(self, user):
+        """
+        Rebuild the user-wide snippet and the snippet of every tracked website
+        """
+        self.rebuild_tracking_snippet(user)
+        
+        for website in WebsiteTracking.objects.filter(user=user):
+            self.rebuild_tracking_snippet(user, website)
+    
+    def embed_tracking_code(self, html, user, website_url=None):
+        """
+        Embed the materialized tracking loader into a site's HTML at publish time
+        
+        Published pages carry the loader inline, so serving them never has to
+        touch the analytics tables. It goes right before </body> so it never
+        delays first paint.
+        """
+        snippet_html = self.generate_combined_tracking_code(user, website_url)
+        
+        if not snippet_html:
+            return html
+        
+        body_end = html.lower().rfind('</body>')
+        if body_end == -1:
+            return html + snippet_html
+        
+        return html[:body_end] + snippet_html + html[body_end:]
+    
+    def _build_combined_tracking_code(self, integrations):
+        """
+        Build the combined tracking code HTML for the given integrations
+        """
+        loader_script = build_tracking_loader(integrations)
         
-        combined_code += "\n<!-- End JustCodeWorks Analytics Integration -->\n"
+        if not loader_script:
+            return ''
         
-        return combined_code
+        return (
+            "<!-- JustCodeWorks Analytics Integration -->\n"
+            f"{loader_script}\n"
+            "<!-- End JustCodeWorks Analytics Integration -->\n"
+        )
 
 
 # Service instance
@@ -0,0 +1,50 @@
+# Analytics Integration Signals
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import AnalyticsIntegration, AnalyticsProvider, WebsiteIntegrationStatus, WebsiteTracking
+
+
+def _schedule_snippet_rebuild(user_id=None, website_id=None):
+    """
+    Rebuild materialized snippets once the surrounding transaction commits,
+    so cascaded deletes never recreate rows for a user that is going away
+    """
+    def rebuild():
+        from .services import analytics_service
+        
+        if website_id is not None:
+            website = WebsiteTracking.objects.filter(pk=website_id).select_related('user').first()
+            if website is not None:
+                analytics_service.rebuild_tracking_snippet(website.user, website)
+            return
+        
+        user = User.objects.filter(pk=user_id).first()
+        if user is not None:
+            analytics_service.rebuild_user_snippets(user)
+    
+    transaction.on_commit(rebuild)
+
+
+@receiver(post_save, sender=AnalyticsIntegration)
+@receiver(post_delete, sender=AnalyticsIntegration)
+def refresh_snippets_for_integration(sender, instance, **kwargs):
+    """An integration feeds every snippet of its user"""
+    _schedule_snippet_rebuild(user_id=instance.user_id)
+
+
+@receiver(post_save, sender=WebsiteIntegrationStatus)
+@receiver(post_delete, sender=WebsiteIntegrationStatus)
+def refresh_snippet_for_website(sender, instance, **kwargs):
+    """A website status only changes that website's snippet"""
+    _schedule_snippet_rebuild(website_id=instance.website_id)
+
+
+@receiver(post_save, sender=AnalyticsProvider)
+def refresh_snippets_for_provider(sender, instance, **kwargs):
+    """(De)activating a provider changes the snippets of every user integrated with it"""
+    user_ids = AnalyticsIntegration.objects.filter(provider=instance).values_list('user_id', flat=True).distinct()
+    for user_id in user_ids:
+        _schedule_snippet_rebuild(user_id=user_id)
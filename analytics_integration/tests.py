@@ -0,0 +1,42 @@
+import json
+from types import SimpleNamespace
+from django.test import SimpleTestCase
+from .loader import build_tracking_loader
+
+
+def integration(provider, tracker_id, require_consent=True):
+    return SimpleNamespace(
+        provider=SimpleNamespace(name=provider),
+        tracker_id=tracker_id,
+        require_consent=require_consent,
+    )
+
+
+class TrackingLoaderTests(SimpleTestCase):
+    def trackers(self, script):
+        return json.loads(script.rsplit('})(window,document,', 1)[1].split(');', 1)[0])
+
+    def test_each_tracker_carries_its_consent_setting(self):
+        script = build_tracking_loader([
+            integration('google_analytics', 'G-123'),
+            integration('bing_ads', '456', require_consent=False),
+        ])
+
+        self.assertEqual(self.trackers(script), [
+            {'provider': 'google_analytics', 'id': 'G-123', 'consent': True},
+            {'provider': 'bing_ads', 'id': '456', 'consent': False},
+        ])
+
+    def test_loader_ships_its_own_consent_banner(self):
+        script = build_tracking_loader([integration('google_analytics', 'G-123')])
+
+        self.assertIn('showBanner()', script)
+        self.assertIn('w.jcwAnalyticsBanner===false', script)
+
+    def test_tracker_ids_cannot_close_the_script_tag(self):
+        script = build_tracking_loader([integration('google_analytics', '</script><script>')])
+
+        self.assertEqual(script.count('</script>'), 1)
+
+    def test_no_trackers_builds_nothing(self):
+        self.assertEqual(build_tracking_loader([integration('google_analytics', None)]), '')
@@ -0,0 +1,227 @@
+"""
+Batch generation of blog posts from a list of topics
+Generations run concurrently (bounded by the batch's concurrency) until every
+topic is done or the token budget is spent. Each finished generation is saved
+on the PostGenerationBatch straight away, so an interrupted batch resumes where
+it stopped; the posts are then written with one bulk_create.
+"""
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from ai_assistant.localization import LOCALIZED_FIELDS, source_hash
+from .models import Post, PostGenerationBatch
+
+
+logger = logging.getLogger(__name__)
+
+# Tokens to reserve for a generation still in flight (prompt plus max_tokens)
+ESTIMATED_TOKENS_PER_POST = 1800
+
+# A running batch that has not checkpointed for this long was interrupted (e.g. by a restart)
+STALE_AFTER = timedelta(minutes=5)
+
+
+class BatchAlreadyRunning(Exception):
+    """Another run holds the batch"""
+
+
+def create_batch(topics, category, author, content_type='tutorial', language='en', post_status='draft',
+                 concurrency=4, token_budget=None):
+    """New batch for the given topics (blank and duplicate topics are dropped)"""
+    topics = list(dict.fromkeys(topic.strip() for topic in topics if topic and topic.strip()))
+    return PostGenerationBatch.objects.create(
+        topics=topics,
+        category=category,
+        author=author,
+        content_type=content_type,
+        language=language,
+        post_status=post_status,
+        concurrency=max(1, concurrency),
+        token_budget=token_budget,
+    )
+
+
+def unique_slugs(titles):
+    """Slugs for titles that are unique among existing posts and each other"""
+    bases = [slugify(title)[:190] or 'post' for title in titles]
+    taken = set()
+    for base in set(bases):
+        taken.update(Post.objects.filter(slug__startswith=base).values_list('slug', flat=True))
+
+    slugs = []
+    for base in bases:
+        slug = base
+        suffix = 2
+        while slug in taken:
+            slug = f'{base}-{suffix}'
+            suffix += 1
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def _over_budget(batch, in_flight):
+    if batch.token_budget is None:
+        return False
+    return batch.tokens_used + (in_flight + 1) * ESTIMATED_TOKENS_PER_POST > batch.token_budget
+
+
+def generate_pending(batch, magic=None):
+    """
+    Generate content for the batch's pending topics, checkpointing after each one
+    Returns True if every topic was generated.
+    """
+    from ai_assistant.magic_ai import MagicAI
+
+    magic = magic or MagicAI()
+    pending = batch.pending_topics
+    futures = {}
+
+    # Worker threads only talk to the LLM; the batch row is saved from this thread
+    with ThreadPoolExecutor(max_workers=batch.concurrency, thread_name_prefix='blog-batch') as pool:
+        while pending or futures:
+            while pending and len(futures) < batch.concurrency and not _over_budget(batch, len(futures)):
+                topic = pending.pop(0)
+                futures[pool.submit(magic.request_blog_content, topic, batch.content_type, batch.language)] = topic
+
+            if not futures:
+                # Budget spent; the remaining topics stay pending for a later run
+                break
+
+            done, _running = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                topic = futures.pop(future)
+                try:
+                    content, tokens = future.result()
+                except Exception as e:
+                    batch.errors[topic] = f'{type(e).__name__}: {e}'
+                    logger.warning(f"Blog batch {batch.batch_id}: '{topic}' failed: {batch.errors[topic]}")
+                    continue
+
+                batch.results[topic] = content
+                batch.errors.pop(topic, None)
+                batch.tokens_used += tokens
+            batch.save(update_fields=['results', 'errors', 'tokens_used', 'updated_at'])
+
+    return not batch.pending_topics
+
+
+def write_posts(batch):
+    """bulk_create posts for generated topics that have none yet; returns the number written"""
+    topics = [topic for topic in batch.topics if topic in batch.results and not batch.results[topic].get('post_id')]
+    if not topics:
+        return 0
+
+    contents = [batch.results[topic] for topic in topics]
+    slugs = unique_slugs([content.get('title') or topic for topic, content in zip(topics, contents)])
+    localized = LOCALIZED_FIELDS['blog.Post']
+    now = timezone.now()
+
+    posts = []
+    for topic, content, slug in zip(topics, contents, slugs):
+        post = Post(
+            title=(content.get('title') or topic)[:200],
+            slug=slug,
+            excerpt=(content.get('excerpt') or '')[:300],
+            content=content.get('content') or '',
+            meta_description=(content.get('meta_description') or '')[:160],
+            category=batch.category,
+            content_type=batch.content_type,
+            status=batch.post_status,
+            publish_date=now,
+            author=batch.author,
+        )
+        post.reading_time = Post.estimate_reading_time(post.content)
+
+        # The generated text is also the translation for the batch language
+        for name in localized:
+            setattr(post, f'{name}_{batch.language}', getattr(post, name))
+        post.translation_hashes = {batch.language: source_hash(post, localized)}
+        posts.append(post)
+
+    with transaction.atomic():
+        created = Post.objects.bulk_create(posts)
+        for topic, content, post in zip(topics, contents, created):
+            tags = [tag.strip() for tag in str(content.get('tags') or '').split(',') if tag.strip()]
+            if tags:
+                post.tags.add(*tags)
+            content['post_id'] = post.pk
+        batch.save(update_fields=['results', 'updated_at'])
+
+    return len(created)
+
+
+def claim_batch(batch):
+    """
+    Atomically mark the batch running; False if another run already holds it
+    Compare-and-set on status, so two concurrent resumes cannot both start it.
+    """
+    now = timezone.now()
+    claimed = PostGenerationBatch.objects.filter(pk=batch.pk).exclude(
+        status='running', updated_at__gte=now - STALE_AFTER
+    ).update(status='running', updated_at=now)
+    if claimed:
+        batch.status = 'running'
+    return bool(claimed)
+
+
+def run_batch(batch, magic=None):
+    """
+    Claim, generate and write the batch (resuming from its checkpoint); returns the batch
+    Raises BatchAlreadyRunning when another run holds it.
+    """
+    if not claim_batch(batch):
+        raise BatchAlreadyRunning(f'Batch {batch.batch_id} is already running')
+    return _run_claimed(batch, magic)
+
+
+def _run_claimed(batch, magic=None):
+    try:
+        complete = generate_pending(batch, magic)
+        write_posts(batch)
+    except Exception as e:
+        logger.error(f"Blog batch {batch.batch_id} failed: {type(e).__name__}: {e}")
+        batch.status = 'failed'
+    else:
+        batch.status = 'completed' if complete else 'partial'
+
+    batch.finished_at = timezone.now()
+    batch.save(update_fields=['status', 'finished_at', 'updated_at'])
+    return batch
+
+
+def start_batch(batch):
+    """
+    Claim the batch and run it on a daemon thread (for the API); progress is visible on the batch row
+    Returns False, without starting anything, when another run holds the batch.
+    """
+    if not claim_batch(batch):
+        return False
+
+    def run():
+        try:
+            _run_claimed(batch)
+        finally:
+            connection.close()
+
+    threading.Thread(target=run, name=f'blog-batch-{batch.pk}', daemon=True).start()
+    return True
+
+
+def serialize_batch(batch):
+    """Batch state for JSON APIs"""
+    return {
+        'id': str(batch.batch_id),
+        'status': batch.status,
+        'topics': len(batch.topics),
+        'generated': len(batch.results),
+        'posts_created': batch.posts_created,
+        'pending': len(batch.pending_topics),
+        'errors': batch.errors,
+        'tokens_used': batch.tokens_used,
+        'token_budget': batch.token_budget,
+    }
@@ -0,0 +1 @@
+# Commands package
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+Management command to generate a batch of blog posts from a list of topics
+Usage: python manage.py generate_blog_posts --topics-file calendar.txt --category tips --author admin
+       python manage.py generate_blog_posts --topic "SEO basics" --topic "Google Business Profile" --category tips --author admin
+       python manage.py generate_blog_posts --resume <batch_id>
+An interrupted batch keeps every finished generation; --resume continues with the remaining topics.
+"""
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from blog.batch_generation import BatchAlreadyRunning, create_batch, run_batch, serialize_batch
+from blog.models import Category, Post, PostGenerationBatch
+
+
+class Command(BaseCommand):
+    help = 'Generate blog posts for many topics concurrently, within a token budget, with resumable checkpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--topic',
+            action='append',
+            default=[],
+            help='Topic to write about (repeatable)'
+        )
+        parser.add_argument(
+            '--topics-file',
+            help='File with one topic per line'
+        )
+        parser.add_argument(
+            '--category',
+            help='Slug of the category for the new posts'
+        )
+        parser.add_argument(
+            '--author',
+            help='Username of the post author'
+        )
+        parser.add_argument(
+            '--content-type',
+            choices=[choice for choice, _label in Post.CONTENT_TYPE_CHOICES],
+            default='tutorial',
+            help='Post content type (default: tutorial)'
+        )
+        parser.add_argument(
+            '--language',
+            choices=[code for code, _name in settings.LANGUAGES],
+            default=settings.LANGUAGE_CODE,
+            help='Language to write in (default: LANGUAGE_CODE)'
+        )
+        parser.add_argument(
+            '--status',
+            choices=[choice for choice, _label in Post.STATUS_CHOICES],
+            default='draft',
+            help='Status of the created posts (default: draft)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=getattr(settings, 'BLOG_BATCH_CONCURRENCY', 4),
+            help='Generations running at the same time (default: BLOG_BATCH_CONCURRENCY)'
+        )
+        parser.add_argument(
+            '--token-budget',
+            type=int,
+            default=getattr(settings, 'BLOG_BATCH_TOKEN_BUDGET', None),
+            help='Stop starting generations once this many tokens are used (default: BLOG_BATCH_TOKEN_BUDGET)'
+        )
+        parser.add_argument(
+            '--resume',
+            metavar='BATCH_ID',
+            help='Continue an interrupted or partial batch'
+        )
+
+    def handle(self, *args, **options):
+        batch = self._resume(options) if options['resume'] else self._create(options)
+
+        self.stdout.write(
+            f'Batch {batch.batch_id}: {len(batch.pending_topics)} of {len(batch.topics)} topic(s) to generate, '
+            f'concurrency {batch.concurrency}...'
+        )
+        try:
+            batch = run_batch(batch)
+        except BatchAlreadyRunning as e:
+            raise CommandError(str(e))
+        summary = serialize_batch(batch)
+
+        for topic, error in summary['errors'].items():
+            self.stdout.write(self.style.WARNING(f'{topic}: {error}'))
+
+        style = self.style.SUCCESS if batch.status == 'completed' else self.style.WARNING
+        self.stdout.write(style(
+            f'{batch.get_status_display()}: {summary["posts_created"]} post(s) created, '
+            f'{summary["pending"]} topic(s) pending, {summary["tokens_used"]} tokens used'
+        ))
+        if summary['pending']:
+            self.stdout.write(f'Resume with: python manage.py generate_blog_posts --resume {batch.batch_id}')
+
+    def _create(self, options):
+        topics = list(options['topic'])
+        if options['topics_file']:
+            try:
+                with open(options['topics_file']) as f:
+                    topics.extend(line.strip() for line in f)
+            except FileNotFoundError:
+                raise CommandError(f'{options["topics_file"]} does not exist')
+        if not any(topic.strip() for topic in topics):
+            raise CommandError('Give at least one --topic or a --topics-file')
+        if not options['category'] or not options['author']:
+            raise CommandError('--category and --author are required for a new batch')
+
+        try:
+            category = Category.objects.get(slug=options['category'])
+        except Category.DoesNotExist:
+            raise CommandError(f'No category with slug {options["category"]}')
+        try:
+            author = User.objects.get(username=options['author'])
+        except User.DoesNotExist:
+            raise CommandError(f'No user named {options["author"]}')
+
+        return create_batch(
+            topics,
+            category,
+            author,
+            content_type=options['content_type'],
+            language=options['language'],
+            post_status=options['status'],
+            concurrency=options['concurrency'],
+            token_budget=options['token_budget'],
+        )
+
+    def _resume(self, options):
+        try:
+            batch = PostGenerationBatch.objects.get(batch_id=options['resume'])
+        except (PostGenerationBatch.DoesNotExist, ValidationError):
+            raise CommandError(f'No batch with id {options["resume"]}')
+
+        if options['token_budget'] is not None:
+            batch.token_budget = options['token_budget']
+        batch.concurrency = max(1, options['concurrency'])
+        # update() leaves updated_at alone: it tells whether a running batch was interrupted
+        PostGenerationBatch.objects.filter(pk=batch.pk).update(
+            token_budget=batch.token_budget, concurrency=batch.concurrency
+        )
+        return batch
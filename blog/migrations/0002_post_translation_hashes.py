@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='translation_hashes',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:14
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_post_translation_hashes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0, help_text='Estimated minutes, updated on save'),
+        ),
+        migrations.CreateModel(
+            name='PostGenerationBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('topics', models.JSONField(default=list)),
+                ('content_type', models.CharField(choices=[('tutorial', 'Tutorial'), ('tip', 'Business Tip'), ('guide', 'How-to Guide'), ('news', 'News & Updates'), ('case_study', 'Case Study')], default='tutorial', max_length=20)),
+                ('language', models.CharField(default='en', max_length=10)),
+                ('post_status', models.CharField(choices=[('draft', 'Draft'), ('published', 'Published'), ('scheduled', 'Scheduled')], default='draft', max_length=20)),
+                ('concurrency', models.PositiveIntegerField(default=4)),
+                ('token_budget', models.PositiveIntegerField(blank=True, help_text='Stop starting generations once this many tokens are used', null=True)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('partial', 'Partially Completed'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('results', models.JSONField(blank=True, default=dict)),
+                ('errors', models.JSONField(blank=True, default=dict)),
+                ('tokens_used', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blog_generation_batches', to=settings.AUTH_USER_MODEL)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='generation_batches', to='blog.category')),
+            ],
+            options={
+                'verbose_name': 'Post Generation Batch',
+                'verbose_name_plural': 'Post Generation Batches',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
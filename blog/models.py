@@ -6,8 +6,10 @@ from django.urls import reverse
 from django.contrib.auth.models import User
 from ckeditor.fields import RichTextField
 from taggit.managers import TaggableManager
+from django.utils.html import strip_tags
 from django.utils.text import slugify
 from django.utils import timezone
+import uuid
 
 
 class Category(models.Model):
@@ -102,6 +104,7 @@ class Post(models.Model):
     content_fr = RichTextField(blank=True)
     content_es = RichTextField(blank=True)
     content_pt = RichTextField(blank=True)
+    translation_hashes = models.JSONField(default=dict, blank=True)  # {language: hash of the source text it was translated from}
     
     # Organization
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='posts')
@@ -130,6 +133,7 @@ class Post(models.Model):
     
     # Analytics
     view_count = models.PositiveIntegerField(default=0)
+    reading_time = models.PositiveIntegerField(default=0, help_text="Estimated minutes, updated on save")
     
     class Meta:
         ordering = ['-publish_date', '-created_at']
@@ -137,8 +141,15 @@ class Post(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+        self.reading_time = self.estimate_reading_time(self.content)
         super().save(*args, **kwargs)
     
+    @staticmethod
+    def estimate_reading_time(content):
+        """Reading time in minutes for (HTML) content"""
+        word_count = len(strip_tags(content or '').split())
+        return max(1, word_count // 200)  # Average 200 words per minute
+    
     @property
     def is_published(self):
         return self.status == 'published' and self.publish_date <= timezone.now()
@@ -160,8 +171,58 @@ class Post(models.Model):
     
     def get_reading_time(self):
         """Estimate reading time in minutes"""
-        word_count = len(self.content.split())
-        return max(1, word_count // 200)  # Average 200 words per minute
+        return self.reading_time or self.estimate_reading_time(self.content)
     
     def __str__(self):
         return self.title
+
+
+class PostGenerationBatch(models.Model):
+    """
+    Batch of AI-generated blog posts; its results double as the resume checkpoint
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('partial', 'Partially Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    batch_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    topics = models.JSONField(default=list)
+    content_type = models.CharField(max_length=20, choices=Post.CONTENT_TYPE_CHOICES, default='tutorial')
+    language = models.CharField(max_length=10, default='en')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='generation_batches')
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='blog_generation_batches')
+    post_status = models.CharField(max_length=20, choices=Post.STATUS_CHOICES, default='draft')
+    
+    # Limits
+    concurrency = models.PositiveIntegerField(default=4)
+    token_budget = models.PositiveIntegerField(null=True, blank=True, help_text="Stop starting generations once this many tokens are used")
+    
+    # Progress / checkpoint
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    results = models.JSONField(default=dict, blank=True)  # {topic: generated content, plus post_id once written}
+    errors = models.JSONField(default=dict, blank=True)  # {topic: last error}
+    tokens_used = models.PositiveIntegerField(default=0)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Post Generation Batch"
+        verbose_name_plural = "Post Generation Batches"
+    
+    @property
+    def pending_topics(self):
+        return [topic for topic in self.topics if topic not in self.results]
+    
+    @property
+    def posts_created(self):
+        return sum(1 for result in self.results.values() if result.get('post_id'))
+    
+    def __str__(self):
+        return f"Batch {self.batch_id} ({len(self.topics)} topics, {self.get_status_display()})"
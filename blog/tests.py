@@ -1,3 +1,95 @@
+from datetime import timedelta
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.utils import timezone
+from .batch_generation import BatchAlreadyRunning, claim_batch, create_batch, run_batch, unique_slugs
+from .models import Category, Post, PostGenerationBatch
 
-# Create your tests here.
+
+class FakeBlogWriter:
+    """Stands in for MagicAI.request_blog_content; topics in `failing` raise"""
+
+    def __init__(self, failing=(), tokens=500):
+        self.failing = set(failing)
+        self.tokens = tokens
+        self.topics = []
+
+    def request_blog_content(self, topic, content_type, language):
+        self.topics.append(topic)
+        if topic in self.failing:
+            raise RuntimeError('LLM down')
+        content = {
+            'title': topic.title(),
+            'excerpt': f'All about {topic}',
+            'content': f'{topic} explained. ' * 50,
+            'meta_description': f'All about {topic}',
+            'tags': 'guide, tips',
+        }
+        return content, self.tokens
+
+
+class BlogBatchTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user('writer', 'writer@example.com', 'password')
+        self.category = Category.objects.create(name='Guides')
+
+    def _batch(self, topics, **options):
+        return create_batch(topics, self.category, self.author, concurrency=2, **options)
+
+    def test_unique_slugs_avoid_existing_posts_and_each_other(self):
+        Post.objects.create(
+            title='Grow your business', slug='grow-your-business', excerpt='x', content='x',
+            category=self.category, author=self.author
+        )
+
+        slugs = unique_slugs(['Grow your business', 'Grow your business', 'Other topic', ''])
+
+        self.assertEqual(slugs, ['grow-your-business-2', 'grow-your-business-3', 'other-topic', 'post'])
+
+    def test_create_batch_drops_blank_and_duplicate_topics(self):
+        batch = self._batch(['SEO basics', ' SEO basics ', '', 'Hosting'])
+
+        self.assertEqual(batch.topics, ['SEO basics', 'Hosting'])
+
+    def test_batch_is_claimed_once_until_stale(self):
+        batch = self._batch(['SEO basics'])
+
+        self.assertTrue(claim_batch(batch))
+        self.assertFalse(claim_batch(batch))
+        with self.assertRaises(BatchAlreadyRunning):
+            run_batch(batch, magic=FakeBlogWriter())
+
+        # A run that stopped checkpointing was interrupted and can be taken over
+        PostGenerationBatch.objects.filter(pk=batch.pk).update(updated_at=timezone.now() - timedelta(minutes=6))
+        self.assertTrue(claim_batch(batch))
+
+    def test_run_writes_posts_and_resumes_failed_topics(self):
+        batch = self._batch(['SEO basics', 'Hosting', 'Email marketing'])
+
+        with self.assertLogs('blog.batch_generation', 'WARNING'):
+            run_batch(batch, magic=FakeBlogWriter(failing=['Hosting']))
+
+        self.assertEqual(batch.status, 'partial')
+        self.assertEqual(list(batch.errors), ['Hosting'])
+        self.assertEqual(Post.objects.count(), 2)
+
+        writer = FakeBlogWriter()
+        run_batch(batch, magic=writer)
+
+        self.assertEqual(writer.topics, ['Hosting'])
+        self.assertEqual(batch.status, 'completed')
+        self.assertEqual(batch.errors, {})
+        self.assertEqual(Post.objects.count(), 3)
+        post = Post.objects.get(title='Hosting')
+        self.assertEqual(post.title_en, 'Hosting')
+        self.assertEqual(sorted(post.tags.names()), ['guide', 'tips'])
+
+    def test_token_budget_stops_new_generations(self):
+        batch = self._batch(['SEO basics', 'Hosting', 'Email marketing'], token_budget=2000)
+        batch.concurrency = 1
+
+        run_batch(batch, magic=FakeBlogWriter(tokens=500))
+
+        self.assertEqual(batch.status, 'partial')
+        self.assertEqual(batch.tokens_used, 500)
+        self.assertEqual(batch.pending_topics, ['Hosting', 'Email marketing'])
@@ -24,4 +24,6 @@ urlpatterns = [
     path('analytics/integration/', admin_views.analytics_integration, name='analytics_integration'),
     path('translations/', admin_views.translations_management, name='translations'),
     path('api/ai-chat/', admin_views.ai_chat_endpoint, name='ai_chat'),
+    path('api/blog/generate-batch/', admin_views.blog_batch_generate_api, name='blog_batch_generate'),
+    path('api/blog/batches/<uuid:batch_id>/', admin_views.blog_batch_status_api, name='blog_batch_status'),
 ]
\ No newline at end of file
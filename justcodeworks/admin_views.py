@@ -8,9 +8,11 @@ from django.http import JsonResponse
 from pages.models import Page
 from blog.models import Post, Category
 from ai_assistant.models import Conversation, Message
+from .db_routers import read_only_view
 
 
 @login_required
+@read_only_view
 def admin_dashboard(request):
     """
     Main admin dashboard view with Website Builder integration
@@ -226,6 +228,85 @@ def ai_chat_endpoint(request):
     return JsonResponse({'error': 'Method not allowed'}, status=405)
 
 
+@staff_member_required
+def blog_batch_generate_api(request):
+    """
+    Start a batch of AI-generated blog posts
+    POST {"topics": [...], "category": "<slug>", "content_type", "language", "status", "concurrency", "token_budget"}
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    from django.conf import settings
+    from blog.batch_generation import create_batch, serialize_batch, start_batch
+    
+    try:
+        import json
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+    
+    topics = data.get('topics') or []
+    if not isinstance(topics, list) or not any(isinstance(topic, str) and topic.strip() for topic in topics):
+        return JsonResponse({'error': 'topics must be a non-empty list of strings'}, status=400)
+    
+    category = Category.objects.filter(slug=data.get('category')).first()
+    if category is None:
+        return JsonResponse({'error': 'Unknown category'}, status=400)
+    
+    content_type = data.get('content_type', 'tutorial')
+    language = data.get('language', settings.LANGUAGE_CODE)
+    post_status = data.get('status', 'draft')
+    if content_type not in dict(Post.CONTENT_TYPE_CHOICES):
+        return JsonResponse({'error': f'Unknown content_type: {content_type}'}, status=400)
+    if language not in dict(settings.LANGUAGES):
+        return JsonResponse({'error': f'Unknown language: {language}'}, status=400)
+    if post_status not in dict(Post.STATUS_CHOICES):
+        return JsonResponse({'error': f'Unknown status: {post_status}'}, status=400)
+    
+    try:
+        concurrency = int(data.get('concurrency') or getattr(settings, 'BLOG_BATCH_CONCURRENCY', 4))
+        token_budget = data.get('token_budget', getattr(settings, 'BLOG_BATCH_TOKEN_BUDGET', None))
+        token_budget = int(token_budget) if token_budget is not None else None
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'concurrency and token_budget must be integers'}, status=400)
+    
+    batch = create_batch(
+        [topic for topic in topics if isinstance(topic, str)],
+        category,
+        request.user,
+        content_type=content_type,
+        language=language,
+        post_status=post_status,
+        concurrency=min(concurrency, getattr(settings, 'BLOG_BATCH_MAX_CONCURRENCY', 8)),
+        token_budget=token_budget,
+    )
+    start_batch(batch)
+    
+    return JsonResponse({'success': True, 'batch': serialize_batch(batch)}, status=202)
+
+
+@staff_member_required
+def blog_batch_status_api(request, batch_id):
+    """
+    Progress of a blog generation batch; POST resumes an interrupted or partial batch
+    """
+    from blog.batch_generation import serialize_batch, start_batch
+    from blog.models import PostGenerationBatch
+    
+    batch = PostGenerationBatch.objects.filter(batch_id=batch_id).first()
+    if batch is None:
+        return JsonResponse({'error': 'Batch not found'}, status=404)
+    
+    if request.method == 'POST':
+        # Only one run at a time; a running batch that stopped checkpointing was interrupted and can be resumed
+        if not start_batch(batch):
+            return JsonResponse({'error': 'Batch is already running'}, status=409)
+        return JsonResponse({'success': True, 'batch': serialize_batch(batch)}, status=202)
+    
+    return JsonResponse({'success': True, 'batch': serialize_batch(batch)})
+
+
 @login_required
 def subscription_management(request):
     """
@@ -0,0 +1,89 @@
+"""
+Database routing for read replicas
+Read-only views (marked with @read_only_view) read from a replica; everything
+else, and every write, goes to the primary ('default') database.
+"""
+import random
+from contextvars import ContextVar
+from functools import wraps
+from django.conf import settings
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_use_replica = ContextVar('use_replica', default=False)
+_wrote = ContextVar('wrote', default=False)
+
+
+def get_replica_aliases():
+    """Database aliases starting with 'replica' (e.g. 'replica', 'replica_2')"""
+    return [alias for alias in settings.DATABASES if alias.startswith('replica')]
+
+
+def begin_request():
+    """Reset routing state for a new request; returns tokens for end_request()"""
+    return _use_replica.set(False), _wrote.set(False)
+
+
+def end_request(tokens):
+    use_replica_token, wrote_token = tokens
+    _use_replica.reset(use_replica_token)
+    _wrote.reset(wrote_token)
+
+
+def request_wrote():
+    """True if anything was written to the primary during this request"""
+    return _wrote.get()
+
+
+def reading_from_replica():
+    """True if reads made now would be served by a (possibly lagging) replica"""
+    return _use_replica.get() and not _wrote.get() and bool(get_replica_aliases())
+
+
+def read_only_view(view_func):
+    """
+    Route the view's reads to a replica
+    
+    Only safe-method requests are routed, and only when the client has not
+    written recently (see ReplicaPinningMiddleware); otherwise the view reads
+    from the primary so users always see their own changes.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS or getattr(request, 'db_pinned_to_primary', False):
+            return view_func(request, *args, **kwargs)
+        
+        token = _use_replica.set(True)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+    
+    return wrapper
+
+
+class ReplicaRouter:
+    """
+    Send reads to a replica inside read-only views, all writes to the primary
+    
+    Once a request writes, its remaining reads also go to the primary.
+    """
+    
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and not _wrote.get():
+            replicas = get_replica_aliases()
+            if replicas:
+                return random.choice(replicas)
+        return 'default'
+    
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return 'default'
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
@@ -0,0 +1,50 @@
+"""
+Project-wide middleware
+"""
+import time
+from django.conf import settings
+from .db_routers import begin_request, end_request, request_wrote
+
+
+class ReplicaPinningMiddleware:
+    """
+    Read-your-writes for replica routing
+    
+    After a request writes to the primary, the client gets a short-lived cookie
+    that pins its reads to the primary, so replication lag never hides a user's
+    own changes (e.g. right after update_project_api).
+    """
+    
+    cookie_name = 'jcw_db_pin'
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    @property
+    def pin_seconds(self):
+        return getattr(settings, 'REPLICA_READ_YOUR_WRITES_SECONDS', 10)
+    
+    def __call__(self, request):
+        tokens = begin_request()
+        
+        try:
+            pinned_until = float(request.COOKIES.get(self.cookie_name, 0))
+        except ValueError:
+            pinned_until = 0
+        request.db_pinned_to_primary = pinned_until > time.time()
+        
+        try:
+            response = self.get_response(request)
+            
+            if request_wrote():
+                response.set_cookie(
+                    self.cookie_name, 
+                    str(time.time() + self.pin_seconds), 
+                    max_age=self.pin_seconds, 
+                    httponly=True, 
+                    samesite='Lax'
+                )
+        finally:
+            end_request(tokens)
+        
+        return response
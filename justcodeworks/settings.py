@@ -56,11 +56,15 @@ INSTALLED_APPS = [
     'ai_assistant',
     'website_builder',  # AI Website Builder with Clippy 2.0
     'translations',  # Translation management system
+    'analytics_integration',  # Analytics tracking codes for customer websites
+    'performance',  # Benchmarks, query-plan checks and synthetic datasets
 ]
 
 MIDDLEWARE = [
     # 'django_tenants.middleware.main.TenantMainMiddleware',  # Disabled for development
     'django.middleware.security.SecurityMiddleware',
+    'tenants.middleware.TenantResolutionMiddleware',  # Host -> Tenant via in-memory domain map
+    'justcodeworks.middleware.ReplicaPinningMiddleware',  # Read-your-writes for replica routing
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',  # For internationalization
@@ -100,17 +104,46 @@ DATABASES = {
     }
 }
 
+# Optional read replica stand-in for local testing (a copy of db.sqlite3)
+if os.getenv('DB_REPLICA_PATH'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('DB_REPLICA_PATH'),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Reads inside @read_only_view views go to 'replica*' databases when configured
+DATABASE_ROUTERS = ['justcodeworks.db_routers.ReplicaRouter']
+REPLICA_READ_YOUR_WRITES_SECONDS = 10  # reads pinned to the primary after a client's write
+
 # PostgreSQL Configuration (uncomment for production)
+# tenants.postgresql_backend wraps django_tenants.postgresql_backend and skips
+# redundant SET search_path calls; CONN_MAX_AGE keeps connections (and their
+# applied search_path) alive across same-tenant requests.
 # DATABASES = {
 #     'default': {
-#         'ENGINE': 'django_tenants.postgresql_backend',
+#         'ENGINE': 'tenants.postgresql_backend',
 #         'NAME': os.getenv('DB_NAME', 'justcodeworks_db'),
 #         'USER': os.getenv('DB_USER', 'postgres'),
 #         'PASSWORD': os.getenv('DB_PASSWORD', 'password'),
 #         'HOST': os.getenv('DB_HOST', 'localhost'),
 #         'PORT': os.getenv('DB_PORT', '5432'),
-#     }
+#         'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '600')),
+#         'CONN_HEALTH_CHECKS': True,
+#     },
+#     'replica': {
+#         'ENGINE': 'tenants.postgresql_backend',
+#         'NAME': os.getenv('DB_NAME', 'justcodeworks_db'),
+#         'USER': os.getenv('DB_USER', 'postgres'),
+#         'PASSWORD': os.getenv('DB_PASSWORD', 'password'),
+#         'HOST': os.getenv('DB_REPLICA_HOST', 'localhost'),
+#         'PORT': os.getenv('DB_PORT', '5432'),
+#         'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '600')),
+#         'CONN_HEALTH_CHECKS': True,
+#         'TEST': {'MIRROR': 'default'},
+#     },
 # }
+# TENANT_SKIP_REDUNDANT_SEARCH_PATH = True
 
 
 # Password validation
@@ -163,9 +196,82 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # TENANT_MODEL = "tenants.Tenant"
 # TENANT_DOMAIN_MODEL = "tenants.Domain"
 # PUBLIC_SCHEMA_URLCONF = 'justcodeworks.urls_public'
+# TENANT_BASE_SCHEMA = 'tenant_template'  # Pre-migrated schema new tenants are cloned from
+
+# Tenant resolution (tenants.middleware.TenantResolutionMiddleware)
+TENANT_DOMAIN_MAP_CHECK_INTERVAL = 5  # seconds between domain map version checks
+TENANT_NEGATIVE_CACHE_TTL = 60  # seconds an unknown host is remembered
+TENANT_NEGATIVE_CACHE_SIZE = 10000  # max unknown hosts remembered per process
+
+# Cache shared by all worker processes: tenant cache generations, domain map version, single-flight locks.
+# Without REDIS_URL every process has its own local-memory cache, and invalidations only reach that process.
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+
+# Per-tenant cache (tenants.cache.TenantCache)
+TENANT_CACHE_TIMEOUT = 300  # seconds entries live in the shared cache
+TENANT_CACHE_REPLICA_TIMEOUT = 5  # max seconds for entries computed from replica reads
+TENANT_CACHE_L1_TTL = 2  # seconds entries and generations live in the in-process tier
+TENANT_CACHE_L1_SIZE = 1000  # max entries in the in-process tier
 
 # OpenAI Configuration
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL')  # e.g. the local simulator: manage.py llm_simulator
+
+# LLM requests (ai_assistant.llm_provider.LLMProvider)
+AI_LLM_PRIMARY_MODEL = 'gpt-4'
+AI_LLM_HEDGE_MODEL = 'gpt-3.5-turbo'  # faster model raced against a slow primary; None disables hedging
+AI_LLM_HEDGE_AFTER = 6.0  # seconds before hedging until enough samples give the primary's p95
+AI_LLM_FALLBACK_MODELS = ['gpt-4o-mini', 'gpt-3.5-turbo']  # tried in order when primary and hedge fail
+AI_LLM_DEADLINES = {  # seconds per call, by purpose
+    'chat': 15,
+    'recognition': 12,
+    'content': 45,
+    'summary': 20,
+    'default': 30,
+}
+AI_LLM_MAX_CONCURRENCY = 32  # threads per process for in-flight LLM requests
+AI_CIRCUIT_BREAKER = {  # ai_assistant.circuit_breaker.CircuitBreaker, one per purpose in each worker process
+    'window': 20,  # recent calls considered
+    'min_calls': 5,  # calls needed before the circuit can open
+    'error_rate': 0.5,  # failed fraction that opens the circuit
+    'slow_call_fraction': 0.75,  # latency SLO per call, as a fraction of its purpose's deadline
+    'slow_call_rate': 0.5,  # fraction over the SLO that opens the circuit
+    'open_seconds': 30.0,  # cool-down before a probe call
+}
+
+# Background generation jobs (website_builder.jobs, run by manage.py run_generation_worker)
+GENERATION_JOBS_EAGER = False  # True runs jobs inline in the request (development without a worker)
+GENERATION_JOB_MAX_ATTEMPTS = 3  # attempts before a job is marked failed
+GENERATION_JOB_RETRY_DELAY = 10  # seconds before the first retry, doubled for each further attempt
+GENERATION_JOB_LEASE_SECONDS = 300  # a running job whose worker is silent this long is picked up again
+GENERATION_JOB_STALL_SECONDS = 120  # the chat UI stops waiting for a job left unclaimed this long (no worker running)
+SPECULATIVE_CONTENT_ENABLED = True  # generate site content before the user reaches the content step
+SPECULATIVE_CONTENT_STEPS = ['template_selection']  # entering these steps queues speculative content
+SPECULATIVE_CONTENT_WAIT = 60  # seconds the content job waits for a matching speculative job in progress
+SERVICE_DESCRIPTION_CONCURRENCY = 8  # parallel LLM calls when describing a project's services
+SERVICE_DESCRIPTION_MAX_BATCH = 5  # services sharing one prompt at most
+LOCALIZATION_CONCURRENCY = 4  # objects translated in parallel by localize_content
+LOCALIZATION_MAX_TOKENS = 8000  # completion token cap for one object's translations into all languages
+BLOG_BATCH_CONCURRENCY = 4  # blog posts generated at the same time by generate_blog_posts / the batch API
+BLOG_BATCH_MAX_CONCURRENCY = 8  # upper limit for the concurrency requested through the batch API
+BLOG_BATCH_TOKEN_BUDGET = None  # default token budget per batch (None = unlimited)
+AI_CONTEXT_TOKEN_BUDGET = 3000  # prompt tokens for a chat turn: system prompt, summary, history and new message
+AI_CONTEXT_RECENT_TOKENS = 1500  # most recent history kept verbatim; older messages are summarized
+AI_CONTEXT_SUMMARY_BATCH_TOKENS = 600  # summarize once this much history has left the recent window
+AI_CONTEXT_SUMMARY_MAX_TOKENS = 300  # length cap of a conversation's rolling summary
+AI_CONTEXT_SUMMARY_MODEL = 'gpt-3.5-turbo'  # cheaper model that writes rolling summaries
+
+# Single-flight coalescing of identical concurrent work (previews, recognition, exports)
+SINGLEFLIGHT_WAIT = 30  # seconds a request waits for another's identical computation before doing it itself
+SINGLEFLIGHT_LOCK_TIMEOUT = 60  # cache lock lifetime; frees the key if the computing process dies
+SINGLEFLIGHT_RESULT_TTL = 5  # seconds a result stays in the cache for processes polling for it
+SINGLEFLIGHT_POLL_INTERVAL = 0.05  # seconds between cache checks while another process computes
 
 # CKEditor Configuration
 CKEDITOR_CONFIGS = {
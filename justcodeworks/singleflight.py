@@ -0,0 +1,157 @@
+"""
+Single-flight coalescing of identical concurrent computations
+When several requests need the same expensive result at the same time (a
+template preview render, a business-recognition LLM call, an export ZIP), one
+of them computes it and the others wait and receive that result.
+
+Within a process the waiters share an in-memory call. Across processes the
+leader takes a short lock in the Django cache and publishes its result there
+briefly; processes that found the lock taken poll for it instead of computing.
+This needs a shared cache backend (Redis, Memcached, database cache) to span processes;
+with the default local-memory cache it coalesces per process. Any cache error
+falls back to computing locally, so coalescing never makes a request fail.
+"""
+import hashlib
+import logging
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+from django.conf import settings
+from django.core.cache import cache
+
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def make_key(*parts):
+    """Cache-safe key from arbitrary parts (names, ids, content hashes)"""
+    return hashlib.sha256('\x1f'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    do(key, fn) runs fn once per key among concurrent callers and returns its result to all of them
+
+    Settings:
+        SINGLEFLIGHT_WAIT: Seconds a caller waits on another's computation before computing itself
+        SINGLEFLIGHT_LOCK_TIMEOUT: Lifetime of the cross-process lock (covers a crashed leader)
+        SINGLEFLIGHT_RESULT_TTL: Seconds a published result stays readable by processes still polling
+        SINGLEFLIGHT_POLL_INTERVAL: Seconds between checks for another process's result
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    def _setting(self, name, default):
+        return getattr(settings, name, default)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def do(self, key, fn, shared=True):
+        """
+        Result of fn() for this key, computed once among concurrent callers
+        An exception raised by the leader is raised in every waiting caller too.
+
+        Args:
+            key: Identifies the computation; must cover every input that affects the result
+            fn: Zero-argument callable; its result must be picklable when shared
+            shared: Also coalesce with other processes through the cache
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            self._counters['leader' if leader else 'coalesced'] += 1
+
+        if not leader:
+            if not call.done.wait(self._setting('SINGLEFLIGHT_WAIT', 30)):
+                self._count('wait_timeouts')
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._shared(key, fn) if shared else fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _shared(self, key, fn):
+        """Coalesce with other processes: compute under the cache lock, or wait for the lock holder's result"""
+        lock_key = f'singleflight:lock:{key}'
+        result_key = f'singleflight:result:{key}'
+        deadline = time.monotonic() + self._setting('SINGLEFLIGHT_WAIT', 30)
+
+        try:
+            acquired = self._acquire(lock_key, result_key)
+            # Another process is computing it: wait for its result. Results are only
+            # read after seeing the lock held, so a finished computation is never
+            # reused by a later request (this coalesces, it does not cache).
+            while not acquired and time.monotonic() < deadline:
+                time.sleep(self._setting('SINGLEFLIGHT_POLL_INTERVAL', 0.05))
+                value = cache.get(result_key, _MISSING)
+                if value is not _MISSING:
+                    self._count('shared')
+                    return value
+                if cache.get(lock_key) is None:
+                    # The leader failed (or its result expired); take over
+                    acquired = self._acquire(lock_key, result_key)
+        except Exception as e:
+            logger.warning(f"Single-flight cache unavailable, computing locally: {type(e).__name__}: {e}")
+            return fn()
+
+        if not acquired:
+            # The other process is too slow (or died holding the lock)
+            self._count('wait_timeouts')
+            return fn()
+
+        try:
+            value = fn()
+            try:
+                cache.set(result_key, value, self._setting('SINGLEFLIGHT_RESULT_TTL', 5))
+            except Exception as e:
+                logger.warning(f"Single-flight result not published: {type(e).__name__}: {e}")
+            return value
+        finally:
+            try:
+                cache.delete(lock_key)
+            except Exception:
+                pass
+
+    def _acquire(self, lock_key, result_key):
+        if not cache.add(lock_key, self._owner, self._setting('SINGLEFLIGHT_LOCK_TIMEOUT', 60)):
+            return False
+        # A result left by an earlier computation must not be mistaken for this one
+        cache.delete(result_key)
+        return True
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+
+# Process-wide single-flight group
+singleflight = SingleFlight()
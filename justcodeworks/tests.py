@@ -0,0 +1,92 @@
+import threading
+import time
+from unittest import mock
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from .singleflight import SingleFlight, make_key
+
+
+@override_settings(SINGLEFLIGHT_WAIT=5, SINGLEFLIGHT_POLL_INTERVAL=0.01)
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.group = SingleFlight()
+        self.key = make_key('preview', 42)
+
+    def _run_concurrently(self, fn, callers=5, shared=True):
+        """Start callers that all ask for self.key while fn is running; returns their results or errors"""
+        outcomes = []
+
+        def caller():
+            try:
+                outcomes.append(self.group.do(self.key, fn, shared=shared))
+            except Exception as e:
+                outcomes.append(e)
+
+        threads = [threading.Thread(target=caller) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_concurrent_callers_share_one_computation(self):
+        calls = []
+
+        def render():
+            calls.append(1)
+            time.sleep(0.2)
+            return '<html>'
+
+        self.assertEqual(self._run_concurrently(render), ['<html>'] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.group.stats(), {'leader': 1, 'coalesced': 4})
+
+    def test_leader_error_reaches_every_waiter(self):
+        def render():
+            time.sleep(0.2)
+            raise ValueError('render failed')
+
+        outcomes = self._run_concurrently(render, shared=False)
+
+        self.assertEqual(len(outcomes), 5)
+        self.assertTrue(all(isinstance(outcome, ValueError) for outcome in outcomes))
+
+    def test_finished_results_are_not_reused(self):
+        results = iter(['first', 'second'])
+
+        self.assertEqual(self.group.do(self.key, lambda: next(results)), 'first')
+        self.assertEqual(self.group.do(self.key, lambda: next(results)), 'second')
+
+    def test_waits_for_result_published_by_another_process(self):
+        cache.add(f'singleflight:lock:{self.key}', 'other-host:1', 60)
+
+        def other_process_finishes():
+            time.sleep(0.1)
+            cache.set(f'singleflight:result:{self.key}', 'from other process', 5)
+            cache.delete(f'singleflight:lock:{self.key}')
+
+        threading.Thread(target=other_process_finishes).start()
+        fn = mock.Mock(return_value='computed here')
+
+        self.assertEqual(self.group.do(self.key, fn), 'from other process')
+        fn.assert_not_called()
+        self.assertEqual(self.group.stats().get('shared'), 1)
+
+    def test_takes_over_when_other_process_fails(self):
+        cache.add(f'singleflight:lock:{self.key}', 'other-host:1', 60)
+        threading.Timer(0.1, cache.delete, [f'singleflight:lock:{self.key}']).start()
+
+        self.assertEqual(self.group.do(self.key, lambda: 'computed here'), 'computed here')
+
+    def test_cache_errors_fall_back_to_computing_locally(self):
+        with mock.patch('justcodeworks.singleflight.cache.add', side_effect=ConnectionError('cache down')):
+            with self.assertLogs('justcodeworks.singleflight', 'WARNING'):
+                self.assertEqual(self.group.do(self.key, lambda: 'computed here'), 'computed here')
+
+    def test_leader_errors_are_not_retried_as_cache_errors(self):
+        fn = mock.Mock(side_effect=ValueError('render failed'))
+
+        with self.assertRaises(ValueError):
+            self.group.do(self.key, fn)
+        self.assertEqual(fn.call_count, 1)
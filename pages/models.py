@@ -31,6 +31,7 @@ class Page(models.Model):
     content_fr = RichTextField(blank=True)
     content_es = RichTextField(blank=True)
     content_pt = RichTextField(blank=True)
+    translation_hashes = models.JSONField(default=dict, blank=True)  # {language: hash of the source text it was translated from}
     
     # SEO fields
     meta_description = models.CharField(max_length=160, blank=True)
@@ -0,0 +1,11 @@
+"""
+Performance App Configuration
+Benchmarks, query-plan checks and synthetic data for performance work
+"""
+from django.apps import AppConfig
+
+
+class PerformanceConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'performance'
+    verbose_name = 'Performance Tooling'
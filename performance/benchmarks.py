@@ -0,0 +1,159 @@
+"""
+Benchmark cases for the platform's hot paths
+Each case is a callable taking the shared fixtures; run them with `manage.py run_benchmarks`.
+"""
+import uuid
+from django.contrib.auth.models import User
+from django.test import Client
+from ai_assistant.magic_ai import MagicAI
+from ai_assistant.models import AIKnowledgeBase
+from translations.models import Translation, TranslationKey, get_translation
+from website_builder.clippy_assistant import ClippyWebsiteBuilder
+from website_builder.models import WebsiteBuilderConversation, WebsiteProject, WebsiteTemplate
+from .stub_llm import StubLLMClient
+
+
+BENCHMARK_HOST = 'localhost'
+
+INDUSTRY_INPUTS = [
+    "Jo's Tyres",
+    'Bella Napoli Pizzeria',
+    'Smile Dental Clinic',
+    'Urban Builders & Renovation',
+    'Glow Beauty Salon and Spa',
+    'Acme Consulting Group',
+]
+
+TEMPLATE_HTML = '''
+<html><head><title>{{ business_name }}</title></head>
+<body>
+  <header><h1>{{ business_name }}</h1><p>{{ business_description }}</p></header>
+  <section>{% for service in services %}<div class="service">{{ service }}</div>{% endfor %}</section>
+  <section>{% for feature in features %}<div class="feature">{{ feature }}</div>{% endfor %}</section>
+  <footer>{{ contact_phone }} | {{ contact_email }} | {{ address|safe }}</footer>
+</body></html>
+'''
+
+
+class Fixtures:
+    """Rows and clients shared by all benchmark cases (created inside a rolled-back transaction)"""
+
+    def __init__(self):
+        suffix = uuid.uuid4().hex[:8]
+
+        self.user = User.objects.create(username=f'bench_{suffix}', is_staff=True)
+        self.client = Client(HTTP_HOST=BENCHMARK_HOST)
+        self.client.force_login(self.user)
+
+        self.template = WebsiteTemplate.objects.create(
+            template_id=f'bench-{suffix}',
+            name='Benchmark Template',
+            category='business',
+            description='Benchmark template',
+            html_template=TEMPLATE_HTML,
+            css_template='body { font-family: sans-serif; }',
+        )
+
+        self.project = WebsiteProject.objects.create(
+            user=self.user,
+            project_name='Benchmark Project',
+            business_name="Jo's Tyres",
+            industry='tires',
+            final_html='<html><body>' + '<p>Benchmark content</p>' * 500 + '</body></html>',
+            final_css='p { margin: 0; }' * 200,
+            final_js='console.log("benchmark");',
+        )
+        self.conversation = WebsiteBuilderConversation.objects.create(project=self.project)
+
+        for i in range(20):
+            AIKnowledgeBase.objects.create(
+                title=f'Benchmark knowledge {i}',
+                content_type='faq',
+                content=f'Benchmark knowledge content {i}',
+                priority=i % 5,
+                created_by=self.user,
+            )
+
+        self.translation_keys = []
+        for i in range(50):
+            key = TranslationKey.objects.create(key=f'bench.{suffix}.label{i}')
+            for language, _name in Translation.LANGUAGE_CHOICES:
+                Translation.objects.create(key=key, language=language, value=f'{key.key} {language}')
+            self.translation_keys.append(key.key)
+
+        self.llm = StubLLMClient()
+
+        self.magic = MagicAI()
+        self.magic.client = self.llm
+
+        self.clippy = ClippyWebsiteBuilder()
+        self.clippy.client = self.llm
+
+        self.chat_session = f'bench-chat-{suffix}'
+
+
+def clippy_industry_detection(fixtures):
+    for business_name in INDUSTRY_INPUTS:
+        fixtures.clippy._detect_multiple_industries(business_name.lower())
+
+
+def clippy_step_business_name(fixtures):
+    conversation = fixtures.conversation
+    conversation.current_step = 'business_name'
+    conversation.conversation_data = {}
+    fixtures.clippy._step_business_name(conversation, "Jo's Tyres")
+
+
+def clippy_step_services_selection(fixtures):
+    conversation = fixtures.conversation
+    conversation.current_step = 'services_selection'
+    fixtures.project.services.all().delete()
+    fixtures.clippy._step_services_selection(conversation, 'Tire repair, wheel alignment and balancing')
+
+
+def template_render(fixtures):
+    response = fixtures.client.get(f'/en/website-builder/template-preview/{fixtures.template.template_id}/')
+    assert response.status_code == 200, response.status_code
+
+
+def zip_export(fixtures):
+    response = fixtures.client.get(f'/en/website-builder/download/{fixtures.project.project_id}/')
+    assert response['Content-Type'] == 'application/zip', response.status_code
+
+
+def translation_lookup(fixtures):
+    for key in fixtures.translation_keys:
+        get_translation(key, 'nl')
+
+
+def translations_management(fixtures):
+    response = fixtures.client.get('/en/admin/translations/')
+    assert response.status_code == 200, response.status_code
+
+
+def dashboard_view(fixtures):
+    response = fixtures.client.get('/en/website-builder/dashboard/')
+    assert response.status_code == 200, response.status_code
+
+
+def magic_ai_chat(fixtures):
+    result = fixtures.magic.chat_with_assistant('How much does a website cost?', fixtures.chat_session)
+    assert result['intent'] != 'error', result
+
+
+def knowledge_retrieval(fixtures):
+    fixtures.magic._get_relevant_knowledge('pricing', 'en')
+
+
+BENCHMARKS = [
+    ('clippy_industry_detection', clippy_industry_detection),
+    ('clippy_step_business_name', clippy_step_business_name),
+    ('clippy_step_services_selection', clippy_step_services_selection),
+    ('template_render', template_render),
+    ('zip_export', zip_export),
+    ('get_translation', translation_lookup),
+    ('translations_management', translations_management),
+    ('dashboard_view', dashboard_view),
+    ('magic_ai_chat', magic_ai_chat),
+    ('knowledge_retrieval', knowledge_retrieval),
+]
@@ -0,0 +1,262 @@
+"""
+Export recorded Clippy conversations to a JSONL corpus and replay them
+Each corpus record holds the project fields, the step the conversation started
+at and the user turns (with the recorded assistant reply where one exists).
+Replaying a record recreates the project under a throwaway user, feeds every
+turn through ClippyWebsiteBuilder.process_conversation with the LLM stubbed or
+served from a response cache, and times each step (including any background
+jobs the turn queued, which are run inline).
+"""
+import hashlib
+import json
+import time
+import uuid
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from ai_assistant.models import Conversation
+from website_builder.clippy_assistant import ClippyWebsiteBuilder
+from website_builder.jobs import latest_job, run_pending_jobs, serialize_job
+from website_builder.models import WebsiteBuilderConversation, WebsiteProject
+from .stub_llm import StubLLMClient
+
+
+CORPUS_VERSION = 1
+
+PROJECT_FIELDS = [
+    'project_name', 'business_name', 'industry', 'page_type', 'business_description',
+    'target_audience', 'location', 'business_address', 'phone', 'business_email',
+    'whatsapp_number', 'opening_times', 'website_type', 'template_id', 'color_scheme',
+    'font_style', 'content_tone', 'language',
+]
+
+# Fields the chat steps fill in; a replay starts with them empty unless the
+# project came through onboarding, where they were collected up front
+CHAT_COLLECTED_FIELDS = ['template_id', 'business_description', 'target_audience']
+
+STEP_ORDER = [step for step, _label in WebsiteBuilderConversation.CONVERSATION_STEPS]
+
+ONBOARDING_START_STEP = 'template_selection'
+
+REPLAY_USER_PREFIX = 'replay_'
+
+
+def _input_for_step(step, data, project):
+    """Best-effort reconstruction of what the user typed at a step from conversation_data"""
+    if step == 'welcome':
+        return 'Hi!'
+    if step == 'business_name':
+        return data.get('business_name') or project.business_name
+    if step == 'industry_selection':
+        return data.get('industry_input') or data.get('industry') or project.industry
+    if step == 'services_selection':
+        services = data.get('services') or [service.service_name for service in project.services.all()]
+        return ', '.join(services)
+    if step == 'business_details':
+        details = ', '.join(
+            value for value in (project.business_address, project.phone, project.business_email) if value
+        )
+        return project.business_description or details or f'{project.business_name} is a local {project.industry} business'
+    if step == 'template_selection':
+        return data.get('template_choice') or project.template_id or 'The professional template please'
+    if step == 'content_generation':
+        return project.content_tone or 'Professional'
+    if step == 'content_review':
+        return 'Looks good, I approve'
+    if step == 'final_review':
+        return 'BUILD MY WEBSITE'
+    return 'Yes'
+
+
+def _recorded_turns(project):
+    """User turns from the linked assistant conversation, paired with the reply that followed"""
+    if not project.assistant_conversation_id:
+        return []
+
+    conversation = Conversation.objects.filter(session_id=project.assistant_conversation_id).first()
+    if not conversation:
+        return []
+
+    turns = []
+    for message in conversation.messages.exclude(message_type='system').order_by('timestamp', 'id'):
+        if message.message_type == 'user':
+            turns.append({'input': message.content, 'expected': None})
+        elif turns and turns[-1]['expected'] is None:
+            turns[-1]['expected'] = message.content
+    return turns
+
+
+def export_conversation(conversation):
+    """Corpus record for one WebsiteBuilderConversation"""
+    project = conversation.project
+    data = conversation.conversation_data or {}
+    onboarded = bool(data.get('onboarding_completed'))
+    start_step = ONBOARDING_START_STEP if onboarded else 'business_name'
+
+    turns = _recorded_turns(project)
+    source = 'messages'
+    if not turns:
+        source = 'conversation_data'
+        end_index = STEP_ORDER.index(conversation.current_step) if conversation.current_step in STEP_ORDER else 0
+        turns = [
+            {'input': _input_for_step(step, data, project), 'expected': None}
+            for step in STEP_ORDER[STEP_ORDER.index(start_step):end_index]
+        ]
+
+    project_fields = {field: getattr(project, field) for field in PROJECT_FIELDS}
+    if not onboarded:
+        for field in CHAT_COLLECTED_FIELDS:
+            project_fields[field] = ''
+
+    return {
+        'version': CORPUS_VERSION,
+        'id': str(project.project_id),
+        'source': source,
+        'project': project_fields,
+        'start_step': start_step,
+        'seed_data': data if onboarded else {},
+        'final_step': conversation.current_step,
+        'turns': turns,
+    }
+
+
+def response_digest(text, project_id):
+    """Hash of a reply with the per-run project id masked out"""
+    normalized = ' '.join((text or '').replace(str(project_id), '<project>').split())
+    return hashlib.sha256(normalized.encode()).hexdigest()[:16]
+
+
+def llm_cache_key(model, messages):
+    payload = json.dumps({'model': model, 'messages': messages}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class CachedLLMClient(StubLLMClient):
+    """
+    StubLLMClient that answers from recorded responses first
+
+    Args:
+        responses: Dict of llm_cache_key -> response content
+        upstream: Optional real client used for misses; without one misses get the canned reply
+    """
+
+    def __init__(self, responses, upstream=None, latency=0.0):
+        super().__init__(latency=latency)
+        self.responses = responses
+        self.upstream = upstream
+        self.recorded = {}
+        self.hits = 0
+        self.misses = 0
+
+    def respond(self, model, messages, **kwargs):
+        key = llm_cache_key(model, messages)
+        if key in self.responses:
+            self.hits += 1
+            return self.responses[key]
+
+        self.misses += 1
+        if self.upstream is None:
+            return super().respond(model, messages, **kwargs)
+
+        response = self.upstream.chat.completions.create(model=model, messages=messages, **kwargs)
+        content = response.choices[0].message.content
+        self.recorded[key] = content
+        return content
+
+
+def _make_llm(llm_mode, llm_cache, latency):
+    if llm_mode == 'stub':
+        return StubLLMClient(latency=latency)
+
+    upstream = None
+    if llm_mode == 'record':
+        from ai_assistant.magic_ai import magic_ai
+        upstream = magic_ai.client
+    return CachedLLMClient(llm_cache or {}, upstream=upstream, latency=latency)
+
+
+def replay_record(record, llm_mode='stub', llm_cache=None, latency=0.0):
+    """
+    Replay one corpus record and return per-turn timings and digests
+    Errors are returned rather than raised so one record cannot abort the run.
+    """
+    clippy = ClippyWebsiteBuilder()
+    clippy.client = _make_llm(llm_mode, llm_cache, latency)
+
+    user = None
+    turns = []
+    error = None
+
+    queries = []
+
+    def count_queries(execute, sql, *args):
+        queries.append(sql)
+        return execute(sql, *args)
+
+    try:
+        user = User.objects.create(username=f'{REPLAY_USER_PREFIX}{uuid.uuid4().hex[:12]}')
+        project = WebsiteProject.objects.create(user=user, **record['project'])
+        WebsiteBuilderConversation.objects.create(
+            project=project,
+            current_step=record['start_step'],
+            conversation_data=record.get('seed_data') or {},
+        )
+
+        for turn in record['turns']:
+            step = WebsiteBuilderConversation.objects.filter(project=project).values_list('current_step', flat=True).first()
+            del queries[:]
+
+            started_wall = time.perf_counter()
+            started_cpu = time.process_time()
+            with connection.execute_wrapper(count_queries):
+                result = clippy.process_conversation(str(project.project_id), turn['input'], user)
+                # Background jobs (content generation) run inline, standing in for a worker
+                if run_pending_jobs(project=project, clippy=clippy):
+                    job = serialize_job(latest_job(project, 'content_generation'))
+                    result['message'] = f"{result.get('message') or ''}\n{job['message'] or job['error'] or ''}"
+                    result['current_step'] = WebsiteBuilderConversation.objects.filter(
+                        project=project
+                    ).values_list('current_step', flat=True).first()
+            cpu_ms = (time.process_time() - started_cpu) * 1000
+            wall_ms = (time.perf_counter() - started_wall) * 1000
+
+            message = result.get('message') or ''
+            turns.append({
+                'step': step,
+                'next_step': result.get('current_step'),
+                'success': bool(result.get('success')),
+                'digest': response_digest(message, project.project_id),
+                'matches_recorded': (
+                    None if turn.get('expected') is None
+                    else response_digest(turn['expected'], record['id']) == response_digest(message, project.project_id)
+                ),
+                'wall_ms': round(wall_ms, 3),
+                'cpu_ms': round(cpu_ms, 3),
+                'queries': len(queries),
+            })
+            if not result.get('success'):
+                break
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}'
+    finally:
+        if user is not None:
+            try:
+                user.delete()
+            except Exception:
+                pass
+
+    llm = clippy.client
+    return {
+        'id': record['id'],
+        'error': error,
+        'turns': turns,
+        'llm_calls': llm.calls,
+        'llm_recorded': getattr(llm, 'recorded', {}),
+    }
+
+
+def replay_worker(record, llm_mode, llm_cache, latency):
+    """Worker entry point for process pools; closes inherited connections when done"""
+    try:
+        return replay_record(record, llm_mode, llm_cache, latency)
+    finally:
+        connections.close_all()
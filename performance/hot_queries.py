@@ -0,0 +1,83 @@
+"""
+The platform's hottest queries, shared by the query-plan checks and benchmarks
+Each entry mirrors the queryset used by the view or service named in its description.
+"""
+import re
+import time
+from ai_assistant.models import AIKnowledgeBase, Message
+from analytics_integration.models import AnalyticsEvent
+from translations.models import Translation
+from website_builder.models import WebsiteProject, WebsiteTemplate
+
+
+# Full table scans: "SCAN <table>" without an index (SQLite), "Seq Scan" (PostgreSQL)
+SEQ_SCAN_PATTERNS = [
+    re.compile(r'\bSCAN (?!.*\bINDEX\b)'),
+    re.compile(r'\bSeq Scan\b'),
+]
+
+
+def uses_sequential_scan(plan):
+    """True if EXPLAIN output contains a full table scan"""
+    return any(pattern.search(plan) for pattern in SEQ_SCAN_PATTERNS)
+
+
+def median_query_ms(build_queryset, iterations):
+    """Median wall time of fully evaluating the query"""
+    timings = []
+    for _ in range(max(iterations, 1)):
+        queryset = build_queryset()
+        started = time.perf_counter()
+        list(queryset)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def _sample_value(model, field):
+    """A real value to filter on, so plans reflect actual data distribution"""
+    value = model.objects.order_by().values_list(field, flat=True).first()
+    return value if value is not None else 1
+
+
+def dashboard_projects():
+    user_id = _sample_value(WebsiteProject, 'user_id')
+    return WebsiteProject.objects.filter(user_id=user_id).order_by('-created_at')[:5]
+
+
+def conversation_messages():
+    conversation_id = _sample_value(Message, 'conversation_id')
+    return Message.objects.filter(
+        conversation_id=conversation_id, id__gt=0
+    ).exclude(message_type='system').order_by('-timestamp', '-id')[:100]
+
+
+def template_gallery():
+    return WebsiteTemplate.objects.filter(
+        is_active=True, 
+        category='business'
+    ).order_by('-rating', '-usage_count')
+
+
+def translation_statistics():
+    return Translation.objects.filter(language='nl', is_active=True)
+
+
+def knowledge_retrieval():
+    return AIKnowledgeBase.objects.filter(is_active=True).order_by('-priority', '-usage_count')[:3]
+
+
+def website_events():
+    website_id = _sample_value(AnalyticsEvent, 'website_id')
+    return AnalyticsEvent.objects.filter(website_id=website_id).order_by('timestamp')
+
+
+HOT_QUERIES = [
+    ('dashboard_projects', 'website_builder.views.dashboard', dashboard_projects),
+    ('conversation_messages', 'ConversationContextBuilder.unsummarized_messages', conversation_messages),
+    ('template_gallery', 'website_builder.views.templates_gallery', template_gallery),
+    ('translation_statistics', 'translations.models.get_translation_statistics', translation_statistics),
+    ('knowledge_retrieval', 'MagicAI._get_relevant_knowledge', knowledge_retrieval),
+    ('website_events', 'analytics_integration event reports', website_events),
+]
@@ -0,0 +1,279 @@
+"""
+Deterministic OpenAI-compatible HTTP server for load and latency testing
+Serves /v1/chat/completions (plain and streaming) with canned responses from
+performance.stub_llm, simulated latency distributions and injected errors.
+Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:8765/v1
+"""
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .stub_llm import canned_response
+
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'normal', 'lognormal', 'pareto')
+
+INJECTED_ERRORS = [
+    (429, 'rate_limit_exceeded', 'Rate limit reached for requests'),
+    (500, 'server_error', 'The server had an error while processing your request'),
+    (503, 'service_unavailable', 'The engine is currently overloaded'),
+]
+
+
+def request_key(body):
+    """Canonical form of a request body; identical requests share a key"""
+    return json.dumps(body, sort_keys=True)
+
+
+class SimulatorConfig:
+    """
+    Args:
+        latency_distribution: One of LATENCY_DISTRIBUTIONS
+        latency_ms: Median time to first token
+        latency_spread: Sigma (normal/lognormal), +/- fraction (uniform) or alpha (pareto)
+        tokens_per_second: Generation speed after the first token (0 = instant)
+        error_rate: Fraction of requests answered with 429/500/503
+        timeout_rate: Fraction of requests that hang for timeout_seconds
+    """
+
+    def __init__(self, latency_distribution='lognormal', latency_ms=800.0, latency_spread=0.5,
+                 tokens_per_second=50.0, error_rate=0.0, timeout_rate=0.0, timeout_seconds=60.0, seed=42):
+        self.latency_distribution = latency_distribution
+        self.latency_ms = latency_ms
+        self.latency_spread = latency_spread
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_seconds = timeout_seconds
+        self.seed = seed
+
+
+class SimulatorStats:
+    """Thread-safe request counters exposed at GET /stats"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.streamed = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.completion_tokens = 0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'streamed': self.streamed,
+                'errors': self.errors,
+                'timeouts': self.timeouts,
+                'completion_tokens': self.completion_tokens,
+            }
+
+
+class SimulatedCompletion:
+    """
+    Everything random about one request, drawn from an RNG seeded by the
+    simulator seed, the request body and the attempt number (how many times
+    this body was sent before). The n-th attempt of a request always gets the
+    same latency, outcome and content regardless of arrival order, and a retry
+    of a failed request gets a fresh draw, so it can succeed.
+    """
+
+    def __init__(self, config, body, attempt=0):
+        digest = hashlib.sha256(f'{config.seed}:{request_key(body)}:{attempt}'.encode()).hexdigest()
+        rng = random.Random(int(digest[:16], 16))
+
+        self.model = body.get('model', 'gpt-4')
+        self.content = canned_response(body.get('messages') or [])
+        self.prompt_tokens = sum(len(m.get('content') or '') for m in body.get('messages') or []) // 4
+        self.tokens = self._tokenize(self.content)
+
+        roll = rng.random()
+        self.error = None
+        self.timeout = False
+        if roll < config.error_rate:
+            self.error = INJECTED_ERRORS[rng.randrange(len(INJECTED_ERRORS))]
+        elif roll < config.error_rate + config.timeout_rate:
+            self.timeout = True
+
+        self.first_token_delay = self._draw_latency(config, rng) / 1000
+        self.token_delay = 1 / config.tokens_per_second if config.tokens_per_second > 0 else 0
+
+    def _draw_latency(self, config, rng):
+        median = config.latency_ms
+        spread = config.latency_spread
+        distribution = config.latency_distribution
+
+        if distribution == 'fixed':
+            value = median
+        elif distribution == 'uniform':
+            value = rng.uniform(median * (1 - spread), median * (1 + spread))
+        elif distribution == 'normal':
+            value = rng.gauss(median, median * spread)
+        elif distribution == 'pareto':
+            # Heavy tail: most requests near the minimum, a few very slow ones
+            alpha = spread if spread > 1 else 1.5
+            value = median / (2 ** (1 / alpha)) * rng.paretovariate(alpha)
+        else:
+            value = rng.lognormvariate(math.log(median), spread)
+
+        return max(value, 0)
+
+    def _tokenize(self, content):
+        """Word-level tokens; close enough to real tokenization for timing"""
+        words = content.split(' ')
+        return [word if i == 0 else f' {word}' for i, word in enumerate(words)]
+
+
+class SimulatorHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible subset: POST /v1/chat/completions, GET /v1/models, GET /stats"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/models'):
+            self._send_json(200, {
+                'object': 'list',
+                'data': [{'id': model, 'object': 'model', 'owned_by': 'simulator'} for model in ('gpt-4', 'gpt-3.5-turbo')],
+            })
+        elif self.path.rstrip('/') == '/stats':
+            self._send_json(200, self.server.stats.as_dict())
+        else:
+            self._send_json(404, {'error': {'message': f'Unknown path {self.path}', 'type': 'invalid_request_error'}})
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': f'Unknown path {self.path}', 'type': 'invalid_request_error'}})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json(400, {'error': {'message': 'Invalid JSON body', 'type': 'invalid_request_error'}})
+            return
+
+        completion = SimulatedCompletion(self.server.config, body, self.server.next_attempt(body))
+        self.server.stats.add(requests=1)
+
+        if completion.timeout:
+            self.server.stats.add(timeouts=1)
+            time.sleep(self.server.config.timeout_seconds)
+
+        time.sleep(completion.first_token_delay)
+
+        if completion.error:
+            status, code, message = completion.error
+            self.server.stats.add(errors=1)
+            self._send_json(status, {'error': {'message': message, 'type': code, 'code': code}})
+            return
+
+        self.server.stats.add(completion_tokens=len(completion.tokens))
+
+        if body.get('stream'):
+            self.server.stats.add(streamed=1)
+            self._stream(completion)
+        else:
+            time.sleep(completion.token_delay * len(completion.tokens))
+            self._send_json(200, self._completion_payload(completion))
+
+    def _completion_payload(self, completion):
+        return {
+            'id': f'chatcmpl-{uuid.uuid4().hex}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': completion.model,
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': completion.content},
+                'finish_reason': 'stop',
+            }],
+            'usage': {
+                'prompt_tokens': completion.prompt_tokens,
+                'completion_tokens': len(completion.tokens),
+                'total_tokens': completion.prompt_tokens + len(completion.tokens),
+            },
+        }
+
+    def _stream(self, completion):
+        """Server-sent events in the chat.completion.chunk format"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        chunk_id = f'chatcmpl-{uuid.uuid4().hex}'
+
+        def send_chunk(delta, finish_reason=None):
+            chunk = {
+                'id': chunk_id,
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': completion.model,
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+            }
+            self.wfile.write(f'data: {json.dumps(chunk)}\n\n'.encode())
+            self.wfile.flush()
+
+        try:
+            send_chunk({'role': 'assistant', 'content': ''})
+            for token in completion.tokens:
+                send_chunk({'content': token})
+                time.sleep(completion.token_delay)
+            send_chunk({}, finish_reason='stop')
+            self.wfile.write(b'data: [DONE]\n\n')
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up (e.g. its own deadline expired)
+            pass
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if status == 429:
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class LLMSimulatorServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config=None, verbose=False, max_tracked_requests=10000):
+        super().__init__(address, SimulatorHandler)
+        self.config = config or SimulatorConfig()
+        self.stats = SimulatorStats()
+        self.verbose = verbose
+        # Attempt counts per request body, least recently seen first; capped so
+        # a long run of distinct prompts doesn't grow the server without bound
+        self._attempts = OrderedDict()
+        self._attempts_lock = threading.Lock()
+        self.max_tracked_requests = max_tracked_requests
+
+    def next_attempt(self, body):
+        """Number of earlier requests with this body (0 for the first, or once it was evicted)"""
+        key = hashlib.sha256(request_key(body).encode()).hexdigest()
+        with self._attempts_lock:
+            attempt = self._attempts.pop(key, 0)
+            self._attempts[key] = attempt + 1
+            while len(self._attempts) > self.max_tracked_requests:
+                self._attempts.popitem(last=False)
+        return attempt
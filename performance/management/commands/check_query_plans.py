@@ -0,0 +1,62 @@
+"""
+Management command to check that hot queries are served by indexes
+Captures EXPLAIN output for each hot query and fails if a sequential scan appears
+Usage: python manage.py check_query_plans --iterations 20
+Run against a seeded dataset for meaningful PostgreSQL plans and timings;
+`manage.py test performance` runs the same check as a test.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from performance.hot_queries import HOT_QUERIES, median_query_ms, uses_sequential_scan
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot queries, time them and fail if any uses a sequential scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Executions per query for the timings (default: 20)'
+        )
+        parser.add_argument(
+            '--query',
+            action='append',
+            dest='queries',
+            help='Only check the named hot query (can be repeated)'
+        )
+        parser.add_argument(
+            '--show-plans',
+            action='store_true',
+            help='Print the full EXPLAIN output for every query'
+        )
+
+    def handle(self, *args, **options):
+        failures = []
+
+        for name, source, build_queryset in HOT_QUERIES:
+            if options['queries'] and name not in options['queries']:
+                continue
+
+            queryset = build_queryset()
+            plan = queryset.explain()
+            timing_ms = median_query_ms(build_queryset, options['iterations'])
+            seq_scan = uses_sequential_scan(plan)
+
+            status = self.style.ERROR('SEQ SCAN') if seq_scan else self.style.SUCCESS('indexed')
+            self.stdout.write(f'{name:<24} {status:<10} median {timing_ms:8.2f} ms   ({source})')
+
+            if seq_scan or options['show_plans']:
+                self.stdout.write(self._indent(plan))
+
+            if seq_scan:
+                failures.append(name)
+
+        if failures:
+            raise CommandError(f'Sequential scans in hot queries: {", ".join(failures)}')
+
+        self.stdout.write(self.style.SUCCESS(f'All hot query plans use indexes ({connection.vendor})'))
+
+    def _indent(self, plan):
+        return '\n'.join(f'    {line}' for line in plan.splitlines())
@@ -0,0 +1,75 @@
+"""
+Management command to export recorded Clippy conversations to a JSONL replay corpus
+Usage: python manage.py export_conversations --output conversations.jsonl
+       python manage.py export_conversations --reached completion --limit 500
+Replay the corpus with `manage.py replay_conversations conversations.jsonl`.
+"""
+import json
+from django.core.management.base import BaseCommand, CommandError
+from performance.conversation_replay import REPLAY_USER_PREFIX, STEP_ORDER, export_conversation
+from website_builder.models import WebsiteBuilderConversation
+
+
+class Command(BaseCommand):
+    help = 'Export WebsiteBuilderConversation history to a compact JSONL corpus for replay'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default='conversations.jsonl',
+            help='Corpus file to write (default: conversations.jsonl)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Export at most this many conversations, newest first'
+        )
+        parser.add_argument(
+            '--reached',
+            choices=STEP_ORDER,
+            help='Only export conversations that got at least this far'
+        )
+        parser.add_argument(
+            '--include-empty',
+            action='store_true',
+            help='Also export conversations without any user turns'
+        )
+
+    def handle(self, *args, **options):
+        conversations = (
+            WebsiteBuilderConversation.objects
+            .select_related('project')
+            .exclude(project__user__username__startswith=REPLAY_USER_PREFIX)
+            .order_by('-created_at')
+        )
+        if options['reached']:
+            conversations = conversations.filter(
+                current_step__in=STEP_ORDER[STEP_ORDER.index(options['reached']):]
+            )
+        if options['limit']:
+            conversations = conversations[:options['limit']]
+
+        exported = 0
+        skipped = 0
+        sources = {}
+
+        try:
+            with open(options['output'], 'w') as f:
+                for conversation in conversations.iterator(chunk_size=500):
+                    record = export_conversation(conversation)
+                    if not record['turns'] and not options['include_empty']:
+                        skipped += 1
+                        continue
+
+                    f.write(json.dumps(record, separators=(',', ':'), default=str) + '\n')
+                    exported += 1
+                    sources[record['source']] = sources.get(record['source'], 0) + 1
+        except OSError as e:
+            raise CommandError(f'Could not write {options["output"]}: {e}')
+
+        breakdown = ', '.join(f'{count} from {source}' for source, count in sorted(sources.items()))
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {exported} conversation(s) to {options["output"]}' + (f' ({breakdown})' if breakdown else '')
+        ))
+        if skipped:
+            self.stdout.write(f'Skipped {skipped} conversation(s) without user turns')
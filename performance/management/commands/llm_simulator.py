@@ -0,0 +1,98 @@
+"""
+Management command to run the local OpenAI-compatible LLM simulator
+Usage: python manage.py llm_simulator --port 8765 --latency-ms 800 --error-rate 0.02
+Then start the app with OPENAI_BASE_URL=http://127.0.0.1:8765/v1
+"""
+from django.core.management.base import BaseCommand
+from performance.llm_simulator import LATENCY_DISTRIBUTIONS, LLMSimulatorServer, SimulatorConfig
+
+
+class Command(BaseCommand):
+    help = 'Serve a deterministic OpenAI-compatible chat completions API for load and latency tests'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+        parser.add_argument('--port', type=int, default=8765, help='Port (default: 8765)')
+        parser.add_argument(
+            '--latency-distribution',
+            choices=LATENCY_DISTRIBUTIONS,
+            default='lognormal',
+            help='Time-to-first-token distribution (default: lognormal)'
+        )
+        parser.add_argument(
+            '--latency-ms',
+            type=float,
+            default=800.0,
+            help='Median time to first token in milliseconds (default: 800)'
+        )
+        parser.add_argument(
+            '--latency-spread',
+            type=float,
+            default=0.5,
+            help='Sigma for normal/lognormal, +/- fraction for uniform, alpha for pareto (default: 0.5)'
+        )
+        parser.add_argument(
+            '--tokens-per-second',
+            type=float,
+            default=50.0,
+            help='Generation speed after the first token; 0 for instant (default: 50)'
+        )
+        parser.add_argument(
+            '--error-rate',
+            type=float,
+            default=0.0,
+            help='Fraction of requests answered with 429/500/503 (default: 0)'
+        )
+        parser.add_argument(
+            '--timeout-rate',
+            type=float,
+            default=0.0,
+            help='Fraction of requests that hang for --timeout-seconds (default: 0)'
+        )
+        parser.add_argument(
+            '--timeout-seconds',
+            type=float,
+            default=60.0,
+            help='How long hanging requests stall (default: 60)'
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+        parser.add_argument(
+            '--max-tracked-requests',
+            type=int,
+            default=10000,
+            help='Distinct request bodies whose retry count is remembered (default: 10000)'
+        )
+        parser.add_argument('--log-requests', action='store_true', help='Log every request')
+
+    def handle(self, *args, **options):
+        config = SimulatorConfig(
+            latency_distribution=options['latency_distribution'],
+            latency_ms=options['latency_ms'],
+            latency_spread=options['latency_spread'],
+            tokens_per_second=options['tokens_per_second'],
+            error_rate=options['error_rate'],
+            timeout_rate=options['timeout_rate'],
+            timeout_seconds=options['timeout_seconds'],
+            seed=options['seed'],
+        )
+        server = LLMSimulatorServer(
+            (options['host'], options['port']),
+            config,
+            verbose=options['log_requests'],
+            max_tracked_requests=options['max_tracked_requests'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'LLM simulator listening on http://{options["host"]}:{options["port"]}/v1 '
+            f'({config.latency_distribution} {config.latency_ms:.0f} ms, '
+            f'{config.tokens_per_second:.0f} tok/s, {config.error_rate:.0%} errors)'
+        ))
+        self.stdout.write(f'Set OPENAI_BASE_URL=http://{options["host"]}:{options["port"]}/v1 for the app under test')
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f'Served: {server.stats.as_dict()}')
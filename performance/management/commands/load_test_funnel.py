@@ -0,0 +1,290 @@
+"""
+Management command to load test the onboarding funnel against a running server
+Each virtual user: create_from_business_details -> chat_api turns through the
+conversation steps -> preview_generated_website -> download_website
+Usage: python manage.py load_test_funnel --base-url http://127.0.0.1:8000 --users 20 --duration 120
+Run the server with OPENAI_BASE_URL pointing at `manage.py llm_simulator` to avoid API costs,
+and `manage.py run_generation_worker` for the background content generation jobs.
+"""
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Reply sent for each conversation step; chosen so every step advances
+SCRIPTED_REPLIES = {
+    'welcome': 'Hi!',
+    'business_name': "Jo's Tyres",
+    'industry_selection': 'Tires and automotive',
+    'services_selection': 'Tire repair, wheel alignment and balancing',
+    'business_details': 'We are located in Amsterdam, phone 0612345678, info@jostyres.example',
+    'template_selection': 'The professional template please',
+    'content_generation': 'Professional',
+    'content_review': 'Looks good, I approve',
+    'final_review': 'BUILD MY WEBSITE',
+}
+
+BUSINESS_TYPES = ['tires', 'restaurant', 'construction', 'dental', 'beauty_salon', 'plumbing']
+
+
+class FunnelStats:
+    """Latency samples and errors per funnel step, shared by all virtual users"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.completed_funnels = 0
+        self.failed_funnels = 0
+
+    def record(self, step, seconds, ok):
+        with self._lock:
+            self.latencies[step].append(seconds * 1000)
+            if not ok:
+                self.errors[step] += 1
+
+    def funnel_done(self, ok):
+        with self._lock:
+            if ok:
+                self.completed_funnels += 1
+            else:
+                self.failed_funnels += 1
+
+
+class FunnelError(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Drive concurrent virtual users through the onboarding funnel and report per-step latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url',
+            default='http://127.0.0.1:8000',
+            help='Server under test (default: http://127.0.0.1:8000)'
+        )
+        parser.add_argument(
+            '--language',
+            default='en',
+            help='URL language prefix (default: en)'
+        )
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=10,
+            help='Concurrent virtual users (default: 10)'
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=60,
+            help='Seconds to keep starting new funnels (default: 60)'
+        )
+        parser.add_argument(
+            '--ramp-up',
+            type=float,
+            default=10,
+            help='Seconds over which virtual users are started (default: 10)'
+        )
+        parser.add_argument(
+            '--think-min',
+            type=float,
+            default=1.0,
+            help='Minimum think time between steps in seconds (default: 1)'
+        )
+        parser.add_argument(
+            '--think-max',
+            type=float,
+            default=5.0,
+            help='Maximum think time between steps in seconds (default: 5)'
+        )
+        parser.add_argument(
+            '--max-turns',
+            type=int,
+            default=15,
+            help='Give up on a funnel after this many chat turns (default: 15)'
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=120,
+            help='Per-request timeout in seconds (default: 120)'
+        )
+        parser.add_argument(
+            '--job-poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds between status polls while a background job runs (default: 2, like the chat UI)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for think times and business data (default: 42)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            import requests  # noqa: F401
+        except ImportError:
+            raise CommandError('The load generator needs the requests package')
+
+        self.options = options
+        self.base_url = f'{options["base_url"].rstrip("/")}/{options["language"]}'
+        self.stats = FunnelStats()
+        self.deadline = time.monotonic() + options['ramp_up'] + options['duration']
+
+        self.stdout.write(
+            f'Load testing {self.base_url} with {options["users"]} virtual users '
+            f'for {options["duration"]:.0f}s (+{options["ramp_up"]:.0f}s ramp-up)...'
+        )
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['users']) as pool:
+            for user_index in range(options['users']):
+                pool.submit(self._virtual_user, user_index)
+        elapsed = time.perf_counter() - started
+
+        self._report(elapsed)
+
+    def _virtual_user(self, user_index):
+        rng = random.Random(self.options['seed'] * 1000 + user_index)
+
+        # Spread virtual user start times evenly over the ramp-up period
+        if self.options['users'] > 1:
+            time.sleep(self.options['ramp_up'] * user_index / (self.options['users'] - 1))
+
+        iteration = 0
+        while time.monotonic() < self.deadline:
+            try:
+                self._run_funnel(rng, f'{user_index}-{iteration}')
+                self.stats.funnel_done(True)
+            except FunnelError as e:
+                self.stats.funnel_done(False)
+                if self.options['verbosity'] > 1:
+                    self.stderr.write(f'Virtual user {user_index}: {e}')
+            except Exception as e:
+                self.stats.funnel_done(False)
+                self.stderr.write(f'Virtual user {user_index}: {type(e).__name__}: {e}')
+            iteration += 1
+
+    def _run_funnel(self, rng, funnel_id):
+        import requests
+
+        session = requests.Session()
+
+        # The homepage sets the CSRF cookie the onboarding form posts with
+        self._request(session, 'homepage', 'GET', '/')
+        csrf_token = session.cookies.get('csrftoken', '')
+
+        response = self._request(session, 'create_from_business_details', 'POST', '/website-builder/api/create-from-business-details/', json={
+            'business_name': f'Load Test Business {funnel_id}',
+            'business_type': rng.choice(BUSINESS_TYPES),
+            'business_address': 'Damrak 1, Amsterdam',
+            'phone_number': '+31 6 12345678',
+            'business_email': f'loadtest-{funnel_id}@example.test',
+            'opening_times': 'Mon-Fri 9:00-17:00',
+            'website_type': 'one_page',
+        }, headers={'X-CSRFToken': csrf_token, 'Referer': self.base_url})
+        project_id = response.json().get('project_id')
+        if not project_id:
+            raise FunnelError(f'project was not created: {response.json().get("message")}')
+
+        current_step = 'template_selection'
+        for _turn in range(self.options['max_turns']):
+            self._think(rng)
+            reply = SCRIPTED_REPLIES.get(current_step, 'Yes')
+            response = self._request(session, f'chat_api:{current_step}', 'POST', f'/website-builder/api/chat/{project_id}/', json={
+                'message': reply,
+            })
+            data = response.json()
+            if not data.get('success'):
+                raise FunnelError(f'chat failed at {current_step}: {data.get("message")}')
+
+            current_step = data.get('current_step', current_step)
+            job = data.get('job') or {}
+            if job.get('status') in ('queued', 'running'):
+                current_step = self._wait_for_job(session, project_id, job['id'])
+
+            if current_step == 'completion':
+                break
+        else:
+            raise FunnelError(f'conversation did not complete within {self.options["max_turns"]} turns')
+
+        self._think(rng)
+        self._request(session, 'preview_generated_website', 'GET', f'/website-builder/preview-website/{project_id}/')
+
+        self._think(rng)
+        response = self._request(session, 'download_website', 'GET', f'/website-builder/download-website/{project_id}/')
+        if response.headers.get('Content-Type') != 'application/zip':
+            raise FunnelError('download did not return a ZIP file')
+
+    def _wait_for_job(self, session, project_id, job_id):
+        """Poll project_status_api like the chat UI until the background job finishes; returns the new step"""
+        started = time.perf_counter()
+        ok = False
+        try:
+            while time.perf_counter() - started < self.options['timeout']:
+                time.sleep(self.options['job_poll_interval'])
+                data = self._request(session, 'project_status_api', 'GET', f'/website-builder/api/project/{project_id}/status/').json()
+                job = data.get('job') or {}
+                if job.get('id') != job_id:
+                    raise FunnelError('background job disappeared')
+                if job.get('status') == 'failed':
+                    raise FunnelError(f'background job failed: {job.get("error")}')
+                if job.get('status') == 'succeeded':
+                    ok = True
+                    return data['project']['current_step']
+            raise FunnelError('background job did not finish in time (is run_generation_worker running?)')
+        finally:
+            self.stats.record('background_job', time.perf_counter() - started, ok)
+
+    def _request(self, session, step, method, path, **kwargs):
+        started = time.perf_counter()
+        ok = False
+        try:
+            response = session.request(method, self.base_url + path, timeout=self.options['timeout'], **kwargs)
+            ok = response.status_code < 400
+            if not ok:
+                raise FunnelError(f'{step} returned HTTP {response.status_code}')
+            return response
+        finally:
+            self.stats.record(step, time.perf_counter() - started, ok)
+
+    def _think(self, rng):
+        time.sleep(rng.uniform(self.options['think_min'], self.options['think_max']))
+
+    def _report(self, elapsed):
+        stats = self.stats
+        total_requests = sum(len(samples) for samples in stats.latencies.values())
+        total_errors = sum(stats.errors.values())
+
+        self.stdout.write('')
+        self.stdout.write(f'{"step":<40}{"requests":>9}{"errors":>8}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}{"max ms":>10}')
+        for step, samples in stats.latencies.items():
+            samples = sorted(samples)
+            self.stdout.write(
+                f'{step:<40}{len(samples):>9}{stats.errors[step]:>8}'
+                f'{self._percentile(samples, 50):>10.0f}{self._percentile(samples, 95):>10.0f}'
+                f'{self._percentile(samples, 99):>10.0f}{samples[-1]:>10.0f}'
+            )
+
+        self.stdout.write('')
+        self.stdout.write(f'Duration:           {elapsed:.1f}s')
+        self.stdout.write(f'Requests:           {total_requests} ({total_requests / elapsed:.2f}/s, {total_errors} errors)')
+        self.stdout.write(f'Completed funnels:  {stats.completed_funnels} ({stats.completed_funnels / elapsed * 60:.1f}/min)')
+
+        if stats.failed_funnels:
+            self.stdout.write(self.style.WARNING(f'Failed funnels:     {stats.failed_funnels}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('All funnels completed'))
+
+    def _percentile(self, sorted_values, percentile):
+        if not sorted_values:
+            return 0
+        index = min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))
+        return sorted_values[index]
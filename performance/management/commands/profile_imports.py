@@ -0,0 +1,121 @@
+"""
+Management command to profile import time of the whole project
+Runs a fresh interpreter with `python -X importtime`, loads Django and every URLconf
+(which imports all views), and reports the slowest modules and packages.
+Usage: python manage.py profile_imports
+       python manage.py profile_imports --top 40 --by-package
+       python manage.py profile_imports --runs 5 --max-ms 800
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+# What a gunicorn worker does before serving its first request
+STARTUP_SCRIPT = '''
+import django
+django.setup()
+from django.urls import get_resolver
+from {wsgi_module} import application
+get_resolver().url_patterns
+'''
+
+
+class Command(BaseCommand):
+    help = 'Profile import time of Django setup, the WSGI application and all URLconfs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=25,
+            help='Number of modules to list (default: 25)'
+        )
+        parser.add_argument(
+            '--by-package',
+            action='store_true',
+            help='Aggregate self time per top-level package instead of listing modules'
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=3,
+            help='Fresh interpreters to start; the median total is reported (default: 3)'
+        )
+        parser.add_argument(
+            '--max-ms',
+            type=float,
+            help='Exit with an error when the median total import time exceeds this (for CI)'
+        )
+
+    def handle(self, *args, **options):
+        wsgi_module = settings.WSGI_APPLICATION.rsplit('.', 1)[0]
+        script = STARTUP_SCRIPT.format(wsgi_module=wsgi_module)
+
+        runs = [self._profile(script) for _ in range(max(options['runs'], 1))]
+        totals = [sum(self_us for self_us, _cumulative, _depth in run.values()) / 1000 for run in runs]
+        median_total = statistics.median(totals)
+
+        # Report the run closest to the median so the table matches the headline number
+        modules = min(zip(totals, runs), key=lambda pair: abs(pair[0] - median_total))[1]
+
+        if options['by_package']:
+            self._report_packages(modules, options['top'])
+        else:
+            self._report_modules(modules, options['top'])
+
+        self.stdout.write('')
+        self.stdout.write(f'Modules imported: {len(modules)}')
+        self.stdout.write(
+            f'Total import time: {median_total:.0f} ms (median of {len(totals)}: '
+            f'{", ".join(f"{total:.0f}" for total in totals)})'
+        )
+
+        if options['max_ms'] is not None and median_total > options['max_ms']:
+            raise CommandError(f'Import time {median_total:.0f} ms exceeds the {options["max_ms"]:.0f} ms budget')
+
+    def _profile(self, script):
+        """Dict of module -> (self us, cumulative us, nesting depth) for one fresh interpreter"""
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'justcodeworks.settings'))
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            raise CommandError(f'Startup script failed:\n{completed.stderr[-2000:]}')
+
+        modules = {}
+        for line in completed.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if match:
+                self_us, cumulative_us, indent, name = match.groups()
+                modules[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+        return modules
+
+    def _report_modules(self, modules, top):
+        self.stdout.write(f'{"module":<60}{"self ms":>10}{"cumulative ms":>15}')
+        ranked = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (self_us, cumulative_us, _depth) in ranked[:top]:
+            self.stdout.write(f'{name:<60}{self_us / 1000:>10.1f}{cumulative_us / 1000:>15.1f}')
+
+    def _report_packages(self, modules, top):
+        packages = defaultdict(lambda: [0, 0])
+        for name, (self_us, _cumulative, _depth) in modules.items():
+            package = packages[name.split('.')[0]]
+            package[0] += self_us
+            package[1] += 1
+
+        self.stdout.write(f'{"package":<40}{"modules":>9}{"self ms":>10}')
+        ranked = sorted(packages.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (self_us, count) in ranked[:top]:
+            self.stdout.write(f'{name:<40}{count:>9}{self_us / 1000:>10.1f}')
@@ -0,0 +1,225 @@
+"""
+Management command to replay a conversation corpus through ClippyWebsiteBuilder
+Compares step transitions and replies against a previous run and times every step
+Usage: python manage.py replay_conversations conversations.jsonl --save-results baseline.jsonl
+       python manage.py replay_conversations conversations.jsonl --baseline baseline.jsonl --workers 4
+       python manage.py replay_conversations conversations.jsonl --llm record --llm-cache llm_cache.json
+The LLM is stubbed by default; --llm cache serves recorded responses from --llm-cache and
+--llm record fills that cache from the real API.
+"""
+import json
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from performance.conversation_replay import CORPUS_VERSION, STEP_ORDER, replay_record, replay_worker
+
+
+class Command(BaseCommand):
+    help = 'Replay recorded Clippy conversations with the LLM stubbed or cached, comparing outputs and timing each step'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'corpus',
+            help='JSONL corpus written by export_conversations'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Worker processes; 1 replays in-process (default: 1)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Replay at most this many records'
+        )
+        parser.add_argument(
+            '--llm',
+            choices=['stub', 'cache', 'record'],
+            default='stub',
+            help='stub: canned replies; cache: replies from --llm-cache; record: fill --llm-cache from the API (default: stub)'
+        )
+        parser.add_argument(
+            '--llm-cache',
+            default='llm_cache.json',
+            help='LLM response cache for --llm cache/record (default: llm_cache.json)'
+        )
+        parser.add_argument(
+            '--latency',
+            type=float,
+            default=0.0,
+            help='Seconds of simulated latency per stubbed LLM call (default: 0)'
+        )
+        parser.add_argument(
+            '--baseline',
+            help='Results file from an earlier run to compare step transitions and replies against'
+        )
+        parser.add_argument(
+            '--save-results',
+            help='Write per-turn results to this JSONL file (usable as a later --baseline)'
+        )
+        parser.add_argument(
+            '--fail-on-diff',
+            action='store_true',
+            help='Exit with an error when outputs differ from the baseline or a replay fails (for CI)'
+        )
+
+    def handle(self, *args, **options):
+        records = self._load_jsonl(options['corpus'])
+        if options['limit']:
+            records = records[:options['limit']]
+        if not records:
+            raise CommandError(f'No records in {options["corpus"]}')
+
+        unsupported = {record.get('version') for record in records} - {CORPUS_VERSION}
+        if unsupported:
+            raise CommandError(f'Unsupported corpus version(s): {", ".join(map(str, unsupported))}')
+
+        llm_cache = {}
+        if options['llm'] != 'stub':
+            llm_cache = self._load_llm_cache(options['llm_cache'])
+
+        self.stdout.write(
+            f'Replaying {len(records)} conversation(s) with {options["workers"]} worker(s), LLM: {options["llm"]}...'
+        )
+
+        started = time.perf_counter()
+        results = self._replay(records, options, llm_cache)
+        elapsed = time.perf_counter() - started
+
+        recorded = {}
+        for result in results:
+            recorded.update(result.pop('llm_recorded', {}))
+        if options['llm'] == 'record' and recorded:
+            llm_cache.update(recorded)
+            with open(options['llm_cache'], 'w') as f:
+                json.dump(llm_cache, f)
+            self.stdout.write(f'Recorded {len(recorded)} new LLM response(s) to {options["llm_cache"]}')
+
+        results.sort(key=lambda result: result['id'])
+        self._report_steps(results, elapsed)
+
+        failures = [result for result in results if result['error'] or not all(turn['success'] for turn in result['turns'])]
+        for result in failures:
+            reason = result['error'] or f'step {result["turns"][-1]["step"]} returned an error'
+            self.stdout.write(self.style.ERROR(f'Replay failed for {result["id"]}: {reason}'))
+
+        self._report_recorded_matches(results)
+
+        diffs = []
+        if options['baseline']:
+            diffs = self._compare(results, self._load_jsonl(options['baseline']))
+
+        if options['save_results']:
+            with open(options['save_results'], 'w') as f:
+                for result in results:
+                    f.write(json.dumps(result, separators=(',', ':')) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Results saved to {options["save_results"]}'))
+
+        if options['fail_on_diff'] and (diffs or failures):
+            raise CommandError(f'{len(diffs)} conversation(s) differ from the baseline, {len(failures)} failed')
+
+    def _replay(self, records, options, llm_cache):
+        replay_args = (options['llm'], llm_cache, options['latency'])
+
+        if options['workers'] <= 1:
+            return [replay_record(record, *replay_args) for record in records]
+
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+        results = []
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            futures = [pool.submit(replay_worker, record, *replay_args) for record in records]
+            for done, future in enumerate(as_completed(futures), start=1):
+                results.append(future.result())
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'[{done}/{len(records)}] {results[-1]["id"]}')
+        return results
+
+    def _report_steps(self, results, elapsed):
+        wall = defaultdict(list)
+        cpu = defaultdict(list)
+        queries = defaultdict(list)
+        for result in results:
+            for turn in result['turns']:
+                wall[turn['step']].append(turn['wall_ms'])
+                cpu[turn['step']].append(turn['cpu_ms'])
+                queries[turn['step']].append(turn['queries'])
+
+        self.stdout.write('')
+        self.stdout.write(f'{"step":<24}{"turns":>7}{"p50 ms":>10}{"p95 ms":>10}{"max ms":>10}{"cpu ms":>10}{"queries":>9}')
+        steps = sorted(wall, key=lambda step: STEP_ORDER.index(step) if step in STEP_ORDER else len(STEP_ORDER))
+        for step in steps:
+            samples = sorted(wall[step])
+            self.stdout.write(
+                f'{step:<24}{len(samples):>7}{self._percentile(samples, 50):>10.1f}'
+                f'{self._percentile(samples, 95):>10.1f}{samples[-1]:>10.1f}'
+                f'{sum(cpu[step]) / len(cpu[step]):>10.1f}{sum(queries[step]) / len(queries[step]):>9.1f}'
+            )
+
+        total_turns = sum(len(samples) for samples in wall.values())
+        total_cpu = sum(sum(samples) for samples in cpu.values()) / 1000
+        self.stdout.write('')
+        self.stdout.write(f'Duration:       {elapsed:.1f}s')
+        self.stdout.write(f'Turns:          {total_turns} ({total_turns / max(elapsed, 1e-9):.1f}/s)')
+        self.stdout.write(f'CPU time:       {total_cpu:.2f}s')
+        self.stdout.write(f'LLM calls:      {sum(result["llm_calls"] for result in results)}')
+
+    def _report_recorded_matches(self, results):
+        checked = [turn['matches_recorded'] for result in results for turn in result['turns'] if turn['matches_recorded'] is not None]
+        if checked:
+            self.stdout.write(f'Recorded replies reproduced: {sum(checked)}/{len(checked)}')
+
+    def _compare(self, results, baseline_results):
+        """Report conversations whose step path or replies changed; returns their ids"""
+        baseline = {result['id']: result for result in baseline_results}
+        diffs = []
+        compared = 0
+
+        for result in results:
+            previous = baseline.get(result['id'])
+            if previous is None:
+                continue
+            compared += 1
+
+            problems = []
+            for index, (turn, old) in enumerate(zip(result['turns'], previous['turns'])):
+                if (turn['step'], turn['next_step']) != (old['step'], old['next_step']):
+                    problems.append(f'turn {index}: {old["step"]}->{old["next_step"]} became {turn["step"]}->{turn["next_step"]}')
+                elif turn['digest'] != old['digest']:
+                    problems.append(f'turn {index} ({turn["step"]}): reply changed')
+            if len(result['turns']) != len(previous['turns']):
+                problems.append(f'{len(previous["turns"])} turns became {len(result["turns"])}')
+
+            if problems:
+                diffs.append(result['id'])
+                self.stdout.write(self.style.WARNING(f'{result["id"]}: {"; ".join(problems)}'))
+
+        if compared and not diffs:
+            self.stdout.write(self.style.SUCCESS(f'All {compared} conversation(s) match the baseline'))
+        elif diffs:
+            self.stdout.write(self.style.WARNING(f'{len(diffs)} of {compared} conversation(s) differ from the baseline'))
+
+        return diffs
+
+    def _load_jsonl(self, path):
+        try:
+            with open(path) as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            raise CommandError(f'{path} does not exist')
+        except ValueError as e:
+            raise CommandError(f'{path} is not valid JSONL: {e}')
+
+    def _load_llm_cache(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _percentile(self, sorted_values, percentile):
+        index = min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))
+        return sorted_values[index]
@@ -0,0 +1,206 @@
+"""
+Management command to benchmark the platform's hot paths
+Reports latency percentiles, allocations and query counts, and compares them to stored baselines
+Usage: python manage.py run_benchmarks
+       python manage.py run_benchmarks --save-baseline
+       python manage.py run_benchmarks --bench get_translation --iterations 500
+All fixtures are created in a transaction that is rolled back afterwards.
+"""
+import gc
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from performance.benchmarks import BENCHMARKS, Fixtures
+
+
+BASELINE_DIR = Path(__file__).resolve().parents[2] / 'baselines'
+
+
+class Command(BaseCommand):
+    help = 'Run the hot-path benchmark suite and flag regressions against the stored baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='Timed iterations per benchmark (default: 50)'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=5,
+            help='Untimed warm-up iterations per benchmark (default: 5)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Timed rounds per benchmark; the round with the lowest p50 is kept (default: 3)'
+        )
+        parser.add_argument(
+            '--bench',
+            action='append',
+            dest='benches',
+            help='Only run the named benchmark (can be repeated)'
+        )
+        parser.add_argument(
+            '--baseline',
+            help='Baseline file (default: performance/baselines/<database vendor>.json)'
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Store this run as the new baseline'
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.25,
+            help='Allowed p50 latency increase before flagging a regression (default: 0.25 = 25%%)'
+        )
+        parser.add_argument(
+            '--min-delta-ms',
+            type=float,
+            default=1.0,
+            help='Ignore p50 increases smaller than this, to absorb timer noise (default: 1.0)'
+        )
+        parser.add_argument(
+            '--fail-on-regression',
+            action='store_true',
+            help='Exit with an error when a regression is flagged (for CI)'
+        )
+
+    def handle(self, *args, **options):
+        benchmarks = [
+            (name, func) for name, func in BENCHMARKS
+            if not options['benches'] or name in options['benches']
+        ]
+        if not benchmarks:
+            raise CommandError(f'Unknown benchmark; available: {", ".join(name for name, _ in BENCHMARKS)}')
+
+        baseline_path = Path(options['baseline'] or BASELINE_DIR / f'{connection.vendor}.json')
+        baseline = self._load_baseline(baseline_path)
+
+        results = {}
+        with transaction.atomic():
+            fixtures = Fixtures()
+            for name, func in benchmarks:
+                results[name] = self._run(func, fixtures, options['iterations'], options['warmup'], options['repeat'])
+            transaction.set_rollback(True)
+
+        regressions = self._report(results, baseline, options['threshold'], options['min_delta_ms'])
+        compared = any(name in baseline for name in results)
+
+        if options['save_baseline']:
+            baseline.update(results)
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(baseline_path, 'w') as f:
+                json.dump(baseline, f, indent=2, sort_keys=True)
+                f.write('\n')
+            self.stdout.write(self.style.SUCCESS(f'Baseline saved to {baseline_path}'))
+
+        if regressions:
+            message = f'{len(regressions)} regression(s): {", ".join(regressions)}'
+            if options['fail_on_regression']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        elif compared:
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
+
+    def _run(self, func, fixtures, iterations, warmup, repeat):
+        for _ in range(warmup):
+            func(fixtures)
+
+        # Query count from a single representative iteration; an execute wrapper is
+        # used because the test client resets connection.queries on every request
+        queries = []
+        with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+            func(fixtures)
+
+        # Allocations are measured separately because tracemalloc slows execution
+        gc.collect()
+        tracemalloc.start()
+        func(fixtures)
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Best of several rounds filters out interference from other processes
+        timings = min(
+            (self._time_round(func, fixtures, iterations) for _ in range(max(repeat, 1))),
+            key=lambda round_timings: self._percentile(round_timings, 50)
+        )
+
+        return {
+            'p50_ms': round(self._percentile(timings, 50), 3),
+            'p95_ms': round(self._percentile(timings, 95), 3),
+            'p99_ms': round(self._percentile(timings, 99), 3),
+            'peak_kib': round(peak / 1024, 1),
+            'queries': len(queries),
+        }
+
+    def _time_round(self, func, fixtures, iterations):
+        """Sorted per-iteration wall times in milliseconds"""
+        timings = []
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(max(iterations, 1)):
+                started = time.perf_counter()
+                func(fixtures)
+                timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            gc.enable()
+
+        return sorted(timings)
+
+    def _percentile(self, sorted_values, percentile):
+        index = min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))
+        return sorted_values[index]
+
+    def _report(self, results, baseline, threshold, min_delta_ms):
+        """Print the results table; returns the names of regressed benchmarks"""
+        regressions = []
+
+        self.stdout.write(
+            f'{"benchmark":<32}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}{"peak KiB":>11}{"queries":>9}  vs baseline'
+        )
+
+        for name, result in results.items():
+            line = (
+                f'{name:<32}{result["p50_ms"]:>10.3f}{result["p95_ms"]:>10.3f}{result["p99_ms"]:>10.3f}'
+                f'{result["peak_kib"]:>11.1f}{result["queries"]:>9}'
+            )
+
+            previous = baseline.get(name)
+            if previous is None:
+                self.stdout.write(f'{line}  (no baseline)')
+                continue
+
+            problems = []
+            slower_by = result['p50_ms'] - previous['p50_ms']
+            if result['p50_ms'] > previous['p50_ms'] * (1 + threshold) and slower_by > min_delta_ms:
+                problems.append(f'p50 {result["p50_ms"] / previous["p50_ms"]:.2f}x')
+            if result['queries'] > previous['queries']:
+                problems.append(f'queries {previous["queries"]} -> {result["queries"]}')
+            if result['peak_kib'] > previous['peak_kib'] * 1.5:
+                problems.append(f'memory {result["peak_kib"] / previous["peak_kib"]:.2f}x')
+
+            change = (result['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] * 100 if previous['p50_ms'] else 0
+            if problems:
+                regressions.append(name)
+                self.stdout.write(self.style.ERROR(f'{line}  REGRESSION ({", ".join(problems)})'))
+            else:
+                self.stdout.write(f'{line}  {change:+.0f}%')
+
+        return regressions
+
+    def _load_baseline(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
@@ -0,0 +1,443 @@
+"""
+Management command to generate a production-scale synthetic dataset
+Usage: python manage.py seed_performance_data                 # full scale (10k tenants, 100k projects)
+       python manage.py seed_performance_data --scale 0.05    # 5% of full scale
+       python manage.py seed_performance_data --flush         # remove previously seeded data
+All rows are bulk inserted with a fixed seed, so runs are reproducible.
+"""
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from ai_assistant.models import AIKnowledgeBase, Conversation, Message
+from analytics_integration.models import AnalyticsEvent, AnalyticsIntegration, AnalyticsProvider, WebsiteTracking
+from tenants.models import Domain, Tenant, TenantUser
+from translations.models import Translation, TranslationKey
+from website_builder.models import BusinessService, WebsiteBuilderConversation, WebsiteProject, WebsiteTemplate
+
+
+# Full-scale volumes (multiplied by --scale)
+FULL_SCALE = {
+    'tenants': 10000,
+    'projects_per_tenant': 10,
+    'messages_per_conversation': 20,
+    'events_per_website': 200,
+    'translation_keys': 2000,
+    'templates': 200,
+    'knowledge_entries': 500,
+}
+
+SEED_PREFIX = 'perf'
+
+INDUSTRIES = [
+    'restaurant', 'construction', 'technology', 'health', 'creative',
+    'ecommerce', 'portfolio', 'business', 'legal', 'education',
+]
+BUSINESS_WORDS = [
+    'Atlas', 'Blue', 'Bright', 'Cedar', 'Delta', 'Golden', 'Harbor', 'Nova',
+    'Oak', 'Peak', 'Prime', 'River', 'Solid', 'Summit', 'Urban', 'Vista',
+]
+BUSINESS_SUFFIXES = ['Studio', 'Works', 'Group', 'Partners', 'Solutions', 'Bistro', 'Builders', 'Labs']
+COUNTRIES = ['NL', 'BE', 'DE', 'FR', 'ES', 'PT', 'GB']
+LANGUAGES = ['en', 'nl', 'de', 'fr', 'es', 'pt']
+SERVICES = [
+    'Consulting', 'Installation', 'Maintenance', 'Design', 'Catering', 'Delivery',
+    'Repairs', 'Training', 'Web Development', 'Photography', 'Renovation', 'Support',
+]
+USER_MESSAGES = [
+    'Hi, I need a website for my business',
+    'We are a {industry} company based in {country}',
+    'Can you add a contact form and opening times?',
+    'I prefer a modern design with blue colors',
+    'Our main services are {service} and {service2}',
+    'How much does hosting cost?',
+]
+ASSISTANT_MESSAGES = [
+    'Great! What is the name of your business?',
+    'Which services would you like to highlight on your website?',
+    'I have prepared a few templates that suit a {industry} business.',
+    'Here is a first draft of your homepage content.',
+    'Would you like to review the generated content before publishing?',
+]
+EVENT_TYPES = ['page_view'] * 14 + ['form_submit', 'signup', 'download', 'purchase', 'custom']
+
+
+class Command(BaseCommand):
+    help = 'Generate a large synthetic dataset (tenants, projects, conversations, events, translations)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            type=float,
+            default=1.0,
+            help='Fraction of full production scale to generate (default: 1.0 = 10k tenants)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed (default: 42)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per bulk insert (default: 5000)'
+        )
+        parser.add_argument(
+            '--tenants-per-chunk',
+            type=int,
+            default=250,
+            help='Tenants generated per transaction; bounds memory use (default: 250)'
+        )
+        parser.add_argument(
+            '--flush',
+            action='store_true',
+            help='Delete previously seeded data and exit'
+        )
+
+    def handle(self, *args, **options):
+        if options['flush']:
+            self._flush()
+            return
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.counts = {}
+
+        volumes = {name: max(1, int(value * options['scale'])) for name, value in FULL_SCALE.items()}
+        # Per-parent fan-out stays realistic at any scale
+        for name in ('projects_per_tenant', 'messages_per_conversation', 'events_per_website'):
+            volumes[name] = FULL_SCALE[name]
+
+        if Tenant.objects.filter(schema_name__startswith=f'{SEED_PREFIX}_').exists():
+            self.stdout.write(self.style.WARNING('Seeded data already exists; run with --flush first'))
+            return
+
+        started = time.perf_counter()
+
+        self.template_count = volumes['templates']
+        provider = self._get_provider()
+
+        with explicit_timestamps():
+            self._seed_shared(volumes)
+
+            chunk_size = options['tenants_per_chunk']
+            for first in range(0, volumes['tenants'], chunk_size):
+                last = min(first + chunk_size, volumes['tenants'])
+                with transaction.atomic():
+                    self._seed_tenants(range(first, last), volumes, provider)
+                self.stdout.write(f'  tenants {last}/{volumes["tenants"]} ({time.perf_counter() - started:.0f}s)')
+
+        elapsed = time.perf_counter() - started
+        for name, count in self.counts.items():
+            self.stdout.write(f'{name:<28} {count:>10,}')
+        self.stdout.write(self.style.SUCCESS(f'Seeded {sum(self.counts.values()):,} rows in {elapsed:.1f}s'))
+
+    def _seed_shared(self, volumes):
+        """Templates, knowledge base and translations (not tenant specific)"""
+        owner, _ = User.objects.get_or_create(username=f'{SEED_PREFIX}_admin', defaults={'password': '!'})
+
+        self._bulk(WebsiteTemplate, (
+            WebsiteTemplate(
+                template_id=f'{SEED_PREFIX}-template-{i}',
+                name=f'{self.rng.choice(BUSINESS_WORDS)} {i}',
+                category=self.rng.choice(WebsiteTemplate.TEMPLATE_CATEGORIES)[0],
+                description='Synthetic template for performance testing',
+                html_template='<html><body><h1>{{ business_name }}</h1><p>{{ business_description }}</p></body></html>',
+                css_template='body { font-family: sans-serif; }',
+                usage_count=self.rng.randint(0, 5000),
+                rating=round(self.rng.uniform(3.0, 5.0), 1),
+                is_active=self.rng.random() < 0.9,
+                created_at=self._past(),
+            )
+            for i in range(volumes['templates'])
+        ))
+
+        self._bulk(AIKnowledgeBase, (
+            AIKnowledgeBase(
+                title=f'Knowledge entry {i}',
+                content_type=self.rng.choice(AIKnowledgeBase.CONTENT_TYPES)[0],
+                content=f'Synthetic knowledge content {i} about websites, pricing and hosting.',
+                content_en=f'Synthetic knowledge content {i}.',
+                content_nl=f'Synthetische kennisinhoud {i}.',
+                keywords=self.rng.sample(SERVICES, 3),
+                priority=self.rng.randint(1, 10),
+                usage_count=self.rng.randint(0, 10000),
+                is_active=self.rng.random() < 0.85,
+                created_by=owner,
+                created_at=self._past(),
+                updated_at=self.now,
+            )
+            for i in range(volumes['knowledge_entries'])
+        ))
+
+        keys = self._bulk(TranslationKey, (
+            TranslationKey(
+                key=f'{SEED_PREFIX}.section{i % 40}.label{i}',
+                description='Synthetic translation key',
+                created_at=self._past(),
+                updated_at=self.now,
+            )
+            for i in range(volumes['translation_keys'])
+        ))
+        self._bulk(Translation, (
+            Translation(
+                key=key,
+                language=language,
+                value=f'{key.key} ({language})',
+                is_active=self.rng.random() < 0.95,
+                created_at=key.created_at,
+                updated_at=self.now,
+            )
+            for key in keys
+            for language in LANGUAGES
+            # Not every key is translated into every language
+            if language == 'en' or self.rng.random() < 0.8
+        ))
+
+    def _seed_tenants(self, indexes, volumes, provider):
+        rng = self.rng
+        indexes = list(indexes)
+
+        users = self._bulk(User, (
+            User(
+                username=f'{SEED_PREFIX}_user_{i}',
+                email=f'owner{i}@perf-tenant-{i}.example.test',
+                password='!',
+                date_joined=self._past(),
+            )
+            for i in indexes
+        ))
+
+        tenants = self._bulk(Tenant, (
+            Tenant(
+                name=self._business_name(),
+                industry=rng.choice(INDUSTRIES),
+                country=rng.choice(COUNTRIES),
+                language=rng.choice(LANGUAGES),
+                subscription_plan=rng.choice(['trial', 'starter', 'starter', 'professional', 'enterprise']),
+                schema_name=f'{SEED_PREFIX}_tenant_{i}',
+                created_on=user.date_joined,
+                updated_on=self.now,
+            )
+            for i, user in zip(indexes, users)
+        ))
+
+        self._bulk(Domain, (
+            Domain(domain=f'perf-tenant-{i}.example.test', tenant=tenant)
+            for i, tenant in zip(indexes, tenants)
+        ))
+        self._bulk(TenantUser, (
+            TenantUser(user=user, tenant=tenant, created_on=tenant.created_on)
+            for user, tenant in zip(users, tenants)
+        ))
+
+        projects = self._bulk(WebsiteProject, (
+            self._project(user, tenant)
+            for user, tenant in zip(users, tenants)
+            for _ in range(volumes['projects_per_tenant'])
+        ))
+
+        self._bulk(BusinessService, (
+            BusinessService(
+                project=project,
+                service_name=service,
+                short_description=f'{service} for {project.business_name}',
+                is_primary=order == 0,
+                display_order=order,
+                created_at=project.created_at,
+            )
+            for project in projects
+            for order, service in enumerate(rng.sample(SERVICES, rng.randint(2, 6)))
+        ))
+
+        self._bulk(WebsiteBuilderConversation, (
+            WebsiteBuilderConversation(
+                project=project,
+                current_step=rng.choice(WebsiteBuilderConversation.CONVERSATION_STEPS)[0],
+                total_messages=volumes['messages_per_conversation'],
+                created_at=project.created_at,
+                updated_at=project.updated_at,
+            )
+            for project in projects
+        ))
+
+        conversations = self._bulk(Conversation, (
+            Conversation(
+                session_id=project.assistant_conversation_id,
+                user_id=project.user_id,
+                session_type='customer',
+                language=project.language,
+                message_count=volumes['messages_per_conversation'],
+                detected_industry=project.industry,
+                lead_score=rng.randint(0, 100),
+                started_at=project.created_at,
+                last_activity=project.updated_at,
+            )
+            for project in projects
+        ))
+
+        self._bulk(Message, (
+            message
+            for conversation in conversations
+            for message in self._messages(conversation, volumes['messages_per_conversation'])
+        ))
+
+        integrations = self._bulk(AnalyticsIntegration, (
+            AnalyticsIntegration(
+                user=user,
+                provider=provider,
+                status='connected',
+                measurement_id=f'G-{rng.randrange(16 ** 10):010X}',
+                created_at=user.date_joined,
+                updated_at=self.now,
+            )
+            for user in users
+        ))
+
+        published = [project for project in projects if project.status == 'published']
+        integration_by_user = {integration.user_id: integration for integration in integrations}
+        websites = self._bulk(WebsiteTracking, (
+            WebsiteTracking(
+                website_url=project.website_url,
+                website_name=project.business_name,
+                user_id=project.user_id,
+                created_at=project.published_at,
+                updated_at=self.now,
+            )
+            for project in published
+        ))
+
+        self._bulk(AnalyticsEvent, (
+            event
+            for website in websites
+            for event in self._events(website, integration_by_user[website.user_id], volumes['events_per_website'])
+        ))
+
+    def _project(self, user, tenant):
+        rng = self.rng
+        created_at = self._past(since=user.date_joined)
+        status = rng.choice(['draft', 'in_progress', 'content_review', 'completed', 'published', 'published'])
+        business_name = self._business_name()
+
+        return WebsiteProject(
+            user=user,
+            tenant=tenant,
+            project_name=f'{business_name} website',
+            business_name=business_name,
+            industry=tenant.industry,
+            business_description=f'{business_name} is a {tenant.industry} business in {tenant.country}.',
+            location=tenant.country,
+            language=tenant.language,
+            template_id=f'{SEED_PREFIX}-template-{rng.randrange(self.template_count)}',
+            status=status,
+            completion_percentage=100 if status in ('completed', 'published') else rng.randint(0, 90),
+            assistant_conversation_id=str(uuid.UUID(int=rng.getrandbits(128))),
+            website_url=f'https://{business_name.lower().replace(" ", "-")}.example.test' if status == 'published' else '',
+            final_html=f'<html><body><h1>{business_name}</h1></body></html>' if status in ('completed', 'published') else '',
+            created_at=created_at,
+            updated_at=created_at + timedelta(hours=rng.randint(1, 72)),
+            published_at=created_at + timedelta(days=rng.randint(1, 14)) if status == 'published' else None,
+        )
+
+    def _messages(self, conversation, count):
+        rng = self.rng
+        timestamp = conversation.started_at
+        context = {'industry': conversation.detected_industry, 'country': rng.choice(COUNTRIES)}
+
+        for n in range(rng.randint(count // 2, count * 3 // 2)):
+            timestamp += timedelta(seconds=rng.randint(5, 300))
+            is_user = n % 2 == 0
+            services = rng.sample(SERVICES, 2)
+            content = rng.choice(USER_MESSAGES if is_user else ASSISTANT_MESSAGES).format(
+                service=services[0], service2=services[1], **context
+            )
+            yield Message(
+                conversation=conversation,
+                message_type='user' if is_user else 'assistant',
+                content=content,
+                ai_model='' if is_user else 'gpt-4',
+                prompt_tokens=0 if is_user else rng.randint(200, 1500),
+                completion_tokens=0 if is_user else rng.randint(50, 600),
+                response_time=0.0 if is_user else round(rng.uniform(0.8, 12.0), 2),
+                timestamp=timestamp,
+            )
+
+    def _events(self, website, integration, count):
+        rng = self.rng
+        span = max((self.now - website.created_at).total_seconds(), 1)
+
+        for _ in range(rng.randint(count // 2, count * 3 // 2)):
+            event_type = rng.choice(EVENT_TYPES)
+            yield AnalyticsEvent(
+                website=website,
+                integration=integration,
+                event_type=event_type,
+                event_name=event_type,
+                event_data={'path': rng.choice(['/', '/services', '/contact', '/about'])},
+                user_ip=f'10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}',
+                timestamp=website.created_at + timedelta(seconds=rng.uniform(0, span)),
+            )
+
+    def _get_provider(self):
+        provider, _ = AnalyticsProvider.objects.get_or_create(
+            name='google_analytics',
+            defaults={'display_name': 'Google Analytics'}
+        )
+        return provider
+
+    def _business_name(self):
+        return f'{self.rng.choice(BUSINESS_WORDS)} {self.rng.choice(BUSINESS_WORDS)} {self.rng.choice(BUSINESS_SUFFIXES)}'
+
+    def _past(self, since=None, days=365):
+        """Random moment between `since` (default: `days` ago) and now"""
+        since = since or self.now - timedelta(days=days)
+        return since + (self.now - since) * self.rng.random()
+
+    def _bulk(self, model, objects):
+        """Bulk insert in batches; returns the saved objects (with primary keys)"""
+        objects = list(objects)
+        created = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.counts[model.__name__] = self.counts.get(model.__name__, 0) + len(created)
+        return created
+
+    def _flush(self):
+        self.stdout.write('Deleting seeded data...')
+        started = time.perf_counter()
+
+        # Cascades to projects, conversations, messages, websites and events
+        User.objects.filter(username__startswith=f'{SEED_PREFIX}_').delete()
+        Tenant.objects.filter(schema_name__startswith=f'{SEED_PREFIX}_').delete()
+        TranslationKey.objects.filter(key__startswith=f'{SEED_PREFIX}.').delete()
+        WebsiteTemplate.objects.filter(template_id__startswith=f'{SEED_PREFIX}-').delete()
+
+        self.stdout.write(self.style.SUCCESS(f'Seeded data deleted in {time.perf_counter() - started:.1f}s'))
+
+
+@contextmanager
+def explicit_timestamps():
+    """
+    Let bulk inserts carry their own created/updated timestamps
+    auto_now/auto_now_add would otherwise stamp every row with the current time.
+    """
+    from django.apps import apps
+
+    patched = []
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                patched.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in patched:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
@@ -0,0 +1,138 @@
+"""
+In-process stand-in for the OpenAI client
+Returns canned, prompt-appropriate responses so AI code paths can be benchmarked
+and load tested without network calls or API costs.
+"""
+import json
+import re
+import time
+from types import SimpleNamespace
+
+
+CANNED_RESPONSES = {
+    'recognition_message': {
+        'recognition_message': 'Fantastic! Your business sounds like a perfect fit for a modern, professional website.',
+        'suggested_services': [
+            'Consultation', 'Installation', 'Maintenance', 'Repairs', 'Emergency Service',
+            'Inspections', 'Custom Solutions', 'Customer Support',
+        ],
+    },
+    'hero_headline': {
+        'hero_headline': 'Quality Service You Can Trust',
+        'hero_description': 'We help local customers with fast, reliable and friendly service.',
+        'about_content': 'Founded by passionate professionals, we have served our community for years.',
+        'services_content': 'From first consultation to final delivery, we take care of everything.',
+        'contact_content': 'Get in touch today for a free, no-obligation quote.',
+        'meta_description': 'Reliable local service with friendly experts. Contact us for a free quote.',
+    },
+    'excerpt': {
+        'title': 'How to Grow Your Business Online',
+        'excerpt': 'Practical steps to attract more customers with your website.',
+        'content': 'A strong website is the foundation of your online presence. ' * 40,
+        'meta_description': 'Practical steps to attract more customers with your website.',
+        'tags': 'business, website, growth',
+    },
+}
+
+DEFAULT_RESPONSE = (
+    'Great question! With JustCodeWorks you can create a professional website in minutes. '
+    'Tell me about your business and I will guide you through every step.'
+)
+
+
+def _service_descriptions(prompt):
+    """Per-service copy for the services listed in the prompt, in order"""
+    names = []
+    in_services = False
+    for line in prompt.splitlines():
+        line = line.strip()
+        if line == 'Services:':
+            in_services = True
+        elif in_services and line.startswith('- '):
+            names.append(line[2:])
+        elif in_services and names:
+            break
+    
+    return [
+        {
+            'service_name': name,
+            'short_description': f'Reliable {name.lower()} delivered by experienced professionals.',
+            'detailed_description': f'Our {name.lower()} service is fast, friendly and tailored to you. We explain every step and stand behind our work.',
+            'features': ['Experienced team', 'Transparent pricing', 'Fast turnaround'],
+        }
+        for name in names
+    ]
+
+
+def _translations(prompt):
+    """Every requested language, with each field prefixed by its language code"""
+    request = next(line for line in prompt.splitlines() if 'Translate the JSON fields' in line)
+    languages = re.findall(r'\b([a-z]{2}) \(', request.split('into each of these languages:', 1)[1])
+    fields = json.loads(prompt.rsplit('Fields:', 1)[1].strip())
+    return {
+        language: {name: f'[{language}] {text}' for name, text in fields.items()}
+        for language in languages
+    }
+
+
+def canned_response(messages):
+    """Pick the canned reply matching the JSON keys the prompt asks for"""
+    prompt = '\n'.join(message.get('content', '') for message in messages)
+    
+    if 'Translate the JSON fields' in prompt:
+        return json.dumps(_translations(prompt), ensure_ascii=False)
+    
+    if 'detailed_description' in prompt:
+        return json.dumps(_service_descriptions(prompt))
+    
+    for marker, payload in CANNED_RESPONSES.items():
+        if marker in prompt:
+            return json.dumps(payload)
+    
+    return DEFAULT_RESPONSE
+
+
+class _Completions:
+    def __init__(self, client):
+        self._client = client
+    
+    def create(self, model=None, messages=None, **kwargs):
+        self._client.calls += 1
+        if self._client.latency:
+            time.sleep(self._client.latency)
+        
+        messages = messages or []
+        content = self._client.respond(model, messages, **kwargs)
+        prompt_tokens = sum(len(message.get('content', '')) for message in messages) // 4
+        
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(
+                index=0,
+                finish_reason='stop',
+                message=SimpleNamespace(role='assistant', content=content),
+            )],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=len(content) // 4,
+                total_tokens=prompt_tokens + len(content) // 4,
+            ),
+        )
+
+
+class StubLLMClient:
+    """
+    Drop-in replacement for openai.OpenAI() supporting chat.completions.create
+    
+    Args:
+        latency: Seconds to sleep per call, to simulate model latency
+    """
+    
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=_Completions(self))
+    
+    def respond(self, model, messages, **kwargs):
+        """Content of the reply; override to serve responses from elsewhere"""
+        return canned_response(messages)
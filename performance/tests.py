@@ -0,0 +1,67 @@
+"""
+Query-plan regression tests for the hot queries (performance.hot_queries)
+Fail when a hot query falls back to a sequential scan, e.g. after an index is dropped.
+Also covers the LLM simulator's bookkeeping.
+"""
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from .hot_queries import HOT_QUERIES, uses_sequential_scan
+from .llm_simulator import LLMSimulatorServer
+
+
+class HotQueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # A small seeded dataset, so plans are made for tables with real rows
+        call_command('seed_performance_data', scale=0.001, stdout=StringIO())
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            # Test tables are tiny, so PostgreSQL would scan them anyway; this asks
+            # whether an index can serve each query at all
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+            self.addCleanup(self._reset_seqscan)
+
+    def _reset_seqscan(self):
+        with connection.cursor() as cursor:
+            cursor.execute('RESET enable_seqscan')
+
+    def test_hot_queries_use_indexes(self):
+        for name, _source, build_queryset in HOT_QUERIES:
+            with self.subTest(query=name):
+                plan = build_queryset().explain()
+                self.assertFalse(uses_sequential_scan(plan), f'{name} uses a sequential scan:\n{plan}')
+
+    def test_sequential_scan_detection(self):
+        self.assertTrue(uses_sequential_scan('SCAN website_builder_websiteproject'))
+        self.assertTrue(uses_sequential_scan('Seq Scan on website_builder_websiteproject  (cost=0.00..1.01 rows=1)'))
+        self.assertFalse(uses_sequential_scan(
+            'SEARCH website_builder_websiteproject USING INDEX wb_project_user_created_idx (user_id=?)'
+        ))
+        self.assertFalse(uses_sequential_scan('SCAN ai_assistant_aiknowledgebase USING INDEX ai_knowledge_lookup_idx'))
+        self.assertFalse(uses_sequential_scan('Index Scan using wb_project_user_created_idx on website_builder_websiteproject'))
+
+
+class LLMSimulatorAttemptTests(SimpleTestCase):
+    def setUp(self):
+        self.server = LLMSimulatorServer(('127.0.0.1', 0), max_tracked_requests=2)
+        self.addCleanup(self.server.server_close)
+
+    def body(self, prompt):
+        return {'model': 'gpt-4', 'messages': [{'role': 'user', 'content': prompt}]}
+
+    def test_retries_of_the_same_body_are_counted(self):
+        self.assertEqual([self.server.next_attempt(self.body('a')) for _ in range(3)], [0, 1, 2])
+
+    def test_least_recently_seen_bodies_are_forgotten(self):
+        self.server.next_attempt(self.body('a'))
+        self.server.next_attempt(self.body('b'))
+        self.server.next_attempt(self.body('a'))
+        self.server.next_attempt(self.body('c'))
+
+        self.assertEqual(len(self.server._attempts), 2)
+        self.assertEqual(self.server.next_attempt(self.body('a')), 2)
+        self.assertEqual(self.server.next_attempt(self.body('b')), 0)
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class TenantsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tenants'
+    
+    def ready(self):
+        """
+        Register signals that invalidate the tenant domain map
+        """
+        from . import signals  # noqa: F401
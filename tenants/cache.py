@@ -0,0 +1,216 @@
+"""
+Per-tenant namespaced cache with O(1) bulk invalidation
+"""
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from justcodeworks.db_routers import reading_from_replica
+
+
+_MISSING = object()
+
+# Namespace of the generations every tenant's keys also embed (data shared by all tenants)
+SHARED = '*'
+
+
+def get_current_tenant(request=None):
+    """Tenant of the request (or of the active schema), None for the public site"""
+    if request is not None:
+        return getattr(request, 'tenant', None)
+    return getattr(connection, 'tenant', None)
+
+
+def user_namespace(user_id):
+    """
+    Namespace for a user's own data (their projects), which is the same on every
+    tenant host; storing and invalidating both use it, wherever the change happens
+    """
+    return f'user:{user_id}'
+
+
+class TenantCache:
+    """
+    Cache facade keyed by tenant (and optionally language)
+    
+    Every key embeds the tenant's generation counter and the shared generation,
+    and language-scoped keys also embed the tenant/language and shared/language
+    generations. Incrementing a generation makes all of that tenant's (or
+    language's) entries unreachable at once, without scanning or deleting keys;
+    the orphans simply expire from the backend. Data that is not per tenant
+    (translations) is invalidated for every tenant with invalidate_shared().
+    
+    An in-process L1 tier sits in front of the shared backend. Generations are
+    held in L1 for TENANT_CACHE_L1_TTL seconds, which bounds how long another
+    process may serve a bumped tenant's entries; this process sees its own
+    invalidations immediately.
+    
+    Invalidations reach other processes only through a cache backend they
+    share (CACHES with REDIS_URL). With the default local-memory backend each
+    process has its own generations, so an invalidation only takes effect in
+    the process that made it; others serve stale entries for up to
+    TENANT_CACHE_TIMEOUT.
+    
+    Values computed by get_or_set() inside a @read_only_view may come from a
+    lagging replica, and the invalidation for a write made elsewhere (e.g. by
+    the background worker) may already have happened. Those values are kept
+    for at most TENANT_CACHE_REPLICA_TIMEOUT, so a stale read cannot outlive
+    the replication lag by much.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = OrderedDict()
+    
+    @property
+    def timeout(self):
+        return getattr(settings, 'TENANT_CACHE_TIMEOUT', 300)
+    
+    @property
+    def replica_timeout(self):
+        return getattr(settings, 'TENANT_CACHE_REPLICA_TIMEOUT', 5)
+    
+    @property
+    def l1_ttl(self):
+        return getattr(settings, 'TENANT_CACHE_L1_TTL', 2)
+    
+    @property
+    def l1_size(self):
+        return getattr(settings, 'TENANT_CACHE_L1_SIZE', 1000)
+    
+    def get(self, tenant, name, language=None, default=None):
+        key = self._make_key(tenant, name, language)
+        
+        value = self._local_get(key)
+        if value is not _MISSING:
+            return value
+        
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        
+        self._local_set(key, value)
+        return value
+    
+    def set(self, tenant, name, value, language=None, timeout=None):
+        key = self._make_key(tenant, name, language)
+        cache.set(key, value, self.timeout if timeout is None else timeout)
+        self._local_set(key, value)
+    
+    def get_or_set(self, tenant, name, default, language=None, timeout=None):
+        """
+        Return the cached value, computing and storing it on a miss
+        
+        Args:
+            default: Value or zero-argument callable producing it
+        """
+        key = self._make_key(tenant, name, language)
+        
+        value = self._local_get(key)
+        if value is not _MISSING:
+            return value
+        
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = default() if callable(default) else default
+            timeout = self.timeout if timeout is None else timeout
+            if reading_from_replica():
+                timeout = min(timeout, self.replica_timeout)
+            cache.set(key, value, timeout)
+        
+        self._local_set(key, value)
+        return value
+    
+    def invalidate(self, tenant, language=None):
+        """
+        Invalidate all of a tenant's entries, or only one language's entries
+        Costs one cache increment regardless of how many keys the tenant has.
+        """
+        generation_key = self._generation_key(tenant, language)
+        
+        try:
+            cache.incr(generation_key)
+        except ValueError:
+            # Counter was evicted: start from a fresh value that cannot collide
+            cache.set(generation_key, self._new_generation(), None)
+        
+        with self._lock:
+            self._local.pop(generation_key, None)
+    
+    def invalidate_shared(self, language=None):
+        """Invalidate every tenant's entries (or one language's) after a change to data all tenants share"""
+        self.invalidate(SHARED, language)
+    
+    def _make_key(self, tenant, name, language):
+        namespace = self._namespace(tenant)
+        generation = self._generation(self._generation_key(SHARED), self._generation_key(tenant))
+        
+        if language is None:
+            return f'tenant_cache:{namespace}:{generation}:{name}'
+        
+        language_generation = self._generation(
+            self._generation_key(SHARED, language), self._generation_key(tenant, language)
+        )
+        return f'tenant_cache:{namespace}:{generation}:{language}:{language_generation}:{name}'
+    
+    def _namespace(self, tenant):
+        """Tenants are namespaced by primary key so a tenant and its id share entries"""
+        if isinstance(tenant, (int, str)):
+            return tenant
+        # None and django-tenants' FakeTenant (public schema) have no primary key
+        return getattr(tenant, 'pk', None) or 'public'
+    
+    def _generation_key(self, tenant, language=None):
+        if language is None:
+            return f'tenant_cache:gen:{self._namespace(tenant)}'
+        return f'tenant_cache:gen:{self._namespace(tenant)}:{language}'
+    
+    def _generation(self, *generation_keys):
+        """Current value of one generation counter, or several joined with dots"""
+        if len(generation_keys) > 1:
+            return '.'.join(str(self._generation(generation_key)) for generation_key in generation_keys)
+        
+        generation_key = generation_keys[0]
+        generation = self._local_get(generation_key)
+        if generation is not _MISSING:
+            return generation
+        
+        generation = cache.get(generation_key)
+        if generation is None:
+            cache.add(generation_key, self._new_generation(), None)
+            generation = cache.get(generation_key, 0)
+        
+        self._local_set(generation_key, generation)
+        return generation
+    
+    def _new_generation(self):
+        # Time-based so a counter lost to eviction never revives older entries
+        return int(time.time() * 1000)
+    
+    def _local_get(self, key):
+        entry = self._local.get(key)
+        if entry is None:
+            return _MISSING
+        
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            with self._lock:
+                self._local.pop(key, None)
+            return _MISSING
+        
+        return value
+    
+    def _local_set(self, key, value):
+        expires_at = time.monotonic() + self.l1_ttl
+        
+        with self._lock:
+            self._local[key] = (value, expires_at)
+            self._local.move_to_end(key)
+            while len(self._local) > self.l1_size:
+                self._local.popitem(last=False)
+
+
+# Process-wide cache facade
+tenant_cache = TenantCache()
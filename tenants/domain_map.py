@@ -0,0 +1,122 @@
+"""
+In-process host to tenant map for request-time tenant resolution
+"""
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.db.models import F
+from .models import Domain, DomainMapVersion
+
+
+DOMAIN_MAP_VERSION_PK = 1
+
+
+def bump_domain_map_version():
+    """
+    Invalidate every process's domain map
+    Called from signals whenever a Domain or Tenant changes. The stamp is a counter
+    row in the database, so workers see the change without a shared cache backend.
+    """
+    updated = DomainMapVersion.objects.filter(pk=DOMAIN_MAP_VERSION_PK).update(version=F('version') + 1)
+    if not updated:
+        DomainMapVersion.objects.get_or_create(pk=DOMAIN_MAP_VERSION_PK, defaults={'version': 1})
+    domain_map.invalidate()
+
+
+def get_domain_map_version():
+    """Current map stamp; 0 until the first Domain or Tenant change"""
+    version = DomainMapVersion.objects.filter(pk=DOMAIN_MAP_VERSION_PK).values_list('version', flat=True).first()
+    return version or 0
+
+
+class DomainMap:
+    """
+    Host -> Tenant dictionary built from all Domain rows of active tenants
+    
+    The map is reloaded only when the version row changes. The row is read at most
+    once per TENANT_DOMAIN_MAP_CHECK_INTERVAL, so resolving a known host costs no
+    queries and a change in another worker is seen within that interval. A miss is
+    double-checked with one targeted query and then remembered in a bounded
+    negative cache, so unknown hosts cost at most one query per TTL.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tenants = {}
+        self._unknown_hosts = OrderedDict()
+        self._version = None
+        self._loaded = False
+        self._last_version_check = 0.0
+    
+    @property
+    def version_check_interval(self):
+        return getattr(settings, 'TENANT_DOMAIN_MAP_CHECK_INTERVAL', 5)
+    
+    @property
+    def negative_cache_ttl(self):
+        return getattr(settings, 'TENANT_NEGATIVE_CACHE_TTL', 60)
+    
+    @property
+    def negative_cache_size(self):
+        return getattr(settings, 'TENANT_NEGATIVE_CACHE_SIZE', 10000)
+    
+    def invalidate(self):
+        """Drop the local map; the next lookup reloads it"""
+        with self._lock:
+            self._loaded = False
+    
+    def resolve(self, host):
+        """Return the Tenant serving this host, or None for the public site"""
+        self._refresh_if_stale()
+        
+        tenant = self._tenants.get(host)
+        if tenant is not None:
+            return tenant
+        
+        expires_at = self._unknown_hosts.get(host)
+        if expires_at is not None and expires_at > time.monotonic():
+            return None
+        
+        return self._lookup_missing_host(host)
+    
+    def _refresh_if_stale(self):
+        now = time.monotonic()
+        
+        if self._loaded and now - self._last_version_check < self.version_check_interval:
+            return
+        
+        self._last_version_check = now
+        current_version = get_domain_map_version()
+        
+        if self._loaded and current_version == self._version:
+            return
+        
+        with self._lock:
+            domains = Domain.objects.filter(tenant__is_active=True).select_related('tenant')
+            self._tenants = {domain.domain.lower(): domain.tenant for domain in domains}
+            self._unknown_hosts.clear()
+            self._version = current_version
+            self._loaded = True
+    
+    def _lookup_missing_host(self, host):
+        domain = Domain.objects.filter(
+            domain__iexact=host, 
+            tenant__is_active=True
+        ).select_related('tenant').first()
+        
+        with self._lock:
+            if domain is not None:
+                self._tenants[host] = domain.tenant
+                return domain.tenant
+            
+            self._unknown_hosts[host] = time.monotonic() + self.negative_cache_ttl
+            self._unknown_hosts.move_to_end(host)
+            while len(self._unknown_hosts) > self.negative_cache_size:
+                self._unknown_hosts.popitem(last=False)
+        
+        return None
+
+
+# Process-wide map shared by all requests handled in this worker
+domain_map = DomainMap()
@@ -0,0 +1,125 @@
+"""
+Management command to benchmark search_path switching on a multi-tenant load mix
+Usage: python manage.py benchmark_search_path --tenants 50 --requests 5000
+Requires the PostgreSQL backend from tenants.postgresql_backend
+"""
+import random
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = 'Measure SET search_path statements per request with and without search_path caching (PostgreSQL only)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenants',
+            type=int,
+            default=50,
+            help='Number of tenant schemas in the load mix (default: 50)'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=5000,
+            help='Number of simulated requests (default: 5000)'
+        )
+        parser.add_argument(
+            '--queries-per-request',
+            type=int,
+            default=8,
+            help='Queries issued by each simulated request (default: 8)'
+        )
+        parser.add_argument(
+            '--hot-share',
+            type=float,
+            default=0.8,
+            help='Share of requests that go to the busiest 10%% of tenants (default: 0.8)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for the load mix (default: 42)'
+        )
+        parser.add_argument(
+            '--keep-schemas',
+            action='store_true',
+            help='Do not drop the benchmark schemas afterwards'
+        )
+
+    def handle(self, *args, **options):
+        if not hasattr(connection, 'search_path_switches'):
+            raise CommandError(
+                "This benchmark needs DATABASES['default']['ENGINE'] = 'tenants.postgresql_backend'"
+            )
+
+        schemas = [f'bench_tenant_{i}' for i in range(options['tenants'])]
+        load_mix = self._build_load_mix(schemas, options['requests'], options['hot_share'], options['seed'])
+
+        with connection.cursor() as cursor:
+            for schema in schemas:
+                cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema}"')
+
+        self.stdout.write(
+            f'Load mix: {len(load_mix)} requests over {len(schemas)} tenants, '
+            f'{options["queries_per_request"]} queries each'
+        )
+
+        scenarios = [
+            ('django-tenants (stock)', False, True),
+            ('search_path cache, connection per request', True, False),
+            ('search_path cache, persistent connection', True, True),
+        ]
+
+        try:
+            results = []
+            for label, skip_redundant, persistent in scenarios:
+                results.append(
+                    (label,) + self._run(load_mix, options['queries_per_request'], skip_redundant, persistent)
+                )
+        finally:
+            connection.skip_redundant_search_path = True
+            connection.set_schema_to_public()
+            if not options['keep_schemas']:
+                with connection.cursor() as cursor:
+                    for schema in schemas:
+                        cursor.execute(f'DROP SCHEMA IF EXISTS "{schema}" CASCADE')
+
+        baseline_sets = results[0][1]
+        self.stdout.write('')
+        self.stdout.write(f'{"Scenario":<45} {"SET/request":>12} {"saved/request":>14} {"ms/request":>11}')
+        for label, sets, elapsed in results:
+            per_request = sets / len(load_mix)
+            saved = (baseline_sets - sets) / len(load_mix)
+            ms = elapsed * 1000 / len(load_mix)
+            self.stdout.write(f'{label:<45} {per_request:>12.3f} {saved:>14.3f} {ms:>11.3f}')
+
+    def _build_load_mix(self, schemas, total_requests, hot_share, seed):
+        """Skewed tenant sequence: a few busy tenants receive most of the traffic"""
+        rng = random.Random(seed)
+        hot_count = max(1, len(schemas) // 10)
+        hot, cold = schemas[:hot_count], schemas[hot_count:] or schemas[:hot_count]
+        return [
+            rng.choice(hot) if rng.random() < hot_share else rng.choice(cold)
+            for _ in range(total_requests)
+        ]
+
+    def _run(self, load_mix, queries_per_request, skip_redundant, persistent):
+        connection.close()
+        connection.skip_redundant_search_path = skip_redundant
+        connection.search_path_switches = 0
+        connection.search_path_skips = 0
+
+        started = time.perf_counter()
+        for schema in load_mix:
+            connection.set_schema(schema)
+            for _ in range(queries_per_request):
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+            if not persistent:
+                connection.close()
+        elapsed = time.perf_counter() - started
+
+        return connection.search_path_switches, elapsed
@@ -0,0 +1,208 @@
+"""
+Management command to migrate every tenant schema concurrently
+Usage: python manage.py migrate_tenants_parallel --workers 8
+       python manage.py migrate_tenants_parallel --dry-run
+       python manage.py migrate_tenants_parallel --resume
+Requires the django-tenants PostgreSQL backend
+"""
+import hashlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.recorder import MigrationRecorder
+
+
+def _migrate_schema(schema_name):
+    """
+    Worker entry point: migrate one tenant schema in a child process
+    Errors are returned rather than raised so one tenant cannot abort the run.
+    """
+    started = time.perf_counter()
+    output = io.StringIO()
+    
+    try:
+        call_command(
+            'migrate_schemas',
+            tenant=True,
+            schema_name=schema_name,
+            interactive=False,
+            verbosity=0,
+            stdout=output,
+            stderr=output
+        )
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        connections.close_all()
+    
+    return {
+        'schema_name': schema_name,
+        'error': error,
+        'output': output.getvalue(),
+        'duration': time.perf_counter() - started,
+    }
+
+
+class Command(BaseCommand):
+    help = 'Migrate all tenant schemas concurrently with a bounded process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of schemas migrated at the same time (default: 4)'
+        )
+        parser.add_argument(
+            '--schema',
+            action='append',
+            dest='schemas',
+            help='Only migrate the given schema (can be repeated)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report pending migrations per tenant without applying them'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Skip schemas completed by a previous interrupted run'
+        )
+        parser.add_argument(
+            '--state-file',
+            default=str(settings.BASE_DIR / '.migrate_tenants_state.json'),
+            help='Where progress is recorded for --resume'
+        )
+
+    def handle(self, *args, **options):
+        if not hasattr(connection, 'set_schema_to_public'):
+            raise CommandError('Tenant migrations require the django-tenants PostgreSQL backend')
+
+        schemas = self._get_schemas(options['schemas'])
+        if not schemas:
+            self.stdout.write('No tenant schemas found')
+            return
+
+        if options['dry_run']:
+            self._report_pending(schemas, options['verbosity'])
+            return
+
+        fingerprint = self._migration_fingerprint()
+        state = self._load_state(options['state_file'], fingerprint) if options['resume'] else None
+        state = state or {'fingerprint': fingerprint, 'completed': [], 'failed': {}}
+
+        completed = set(state['completed'])
+        todo = [schema for schema in schemas if schema not in completed]
+        if completed:
+            self.stdout.write(f'Resuming: {len(schemas) - len(todo)} of {len(schemas)} schemas already migrated')
+
+        # Shared (public) migrations must be applied before any tenant schema
+        call_command('migrate_schemas', shared=True, interactive=False, verbosity=options['verbosity'])
+
+        self.stdout.write(f'Migrating {len(todo)} tenant schemas with {options["workers"]} workers...')
+        started = time.perf_counter()
+
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            futures = [pool.submit(_migrate_schema, schema) for schema in todo]
+
+            for done, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                schema_name = result['schema_name']
+                progress = f'[{done}/{len(todo)}] {schema_name} ({result["duration"]:.1f}s)'
+
+                if result['error']:
+                    state['failed'][schema_name] = result['error']
+                    self.stdout.write(self.style.ERROR(f'{progress} failed: {result["error"]}'))
+                else:
+                    state['completed'].append(schema_name)
+                    state['failed'].pop(schema_name, None)
+                    self.stdout.write(f'{progress} migrated')
+
+                self._save_state(options['state_file'], state)
+
+        elapsed = time.perf_counter() - started
+        failed = state['failed']
+
+        if failed:
+            raise CommandError(
+                f'{len(failed)} tenant schemas failed to migrate ({", ".join(sorted(failed))}); '
+                f'fix them and re-run with --resume'
+            )
+
+        self._clear_state(options['state_file'])
+        self.stdout.write(self.style.SUCCESS(f'Migrated {len(todo)} tenant schemas in {elapsed:.1f}s'))
+
+    def _get_schemas(self, only=None):
+        from django_tenants.utils import get_public_schema_name, get_tenant_model
+
+        queryset = get_tenant_model().objects.exclude(schema_name=get_public_schema_name())
+        if only:
+            queryset = queryset.filter(schema_name__in=only)
+
+        return list(queryset.order_by('schema_name').values_list('schema_name', flat=True))
+
+    def _report_pending(self, schemas, verbosity):
+        """Build the migration plan for each schema without applying anything"""
+        pending_count = 0
+
+        for schema_name in schemas:
+            # Like django-tenants' run_migrations: without public on the search_path, a
+            # schema lacking its own django_migrations table cannot read public's
+            connection.set_schema(schema_name, include_public=False)
+            has_table = MigrationRecorder(connection).has_table()
+            executor = MigrationExecutor(connection)
+            plan = executor.migration_plan(executor.loader.graph.leaf_nodes(), clean_start=not has_table)
+
+            if plan:
+                pending_count += 1
+                names = ', '.join(f'{migration.app_label}.{migration.name}' for migration, _ in plan)
+                note = '' if has_table else ', no django_migrations table'
+                self.stdout.write(f'{schema_name}: {len(plan)} pending{note} ({names})')
+            elif verbosity > 1:
+                self.stdout.write(f'{schema_name}: up to date')
+
+        connection.set_schema_to_public()
+        self.stdout.write(self.style.SUCCESS(
+            f'{pending_count} of {len(schemas)} tenant schemas have pending migrations'
+        ))
+
+    def _migration_fingerprint(self):
+        """Identifies the set of migrations on disk so stale state files are ignored"""
+        from django.db.migrations.loader import MigrationLoader
+
+        nodes = sorted(MigrationLoader(None, ignore_no_migrations=True).graph.leaf_nodes())
+        return hashlib.sha256(json.dumps(nodes).encode()).hexdigest()[:16]
+
+    def _load_state(self, path, fingerprint):
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if state.get('fingerprint') != fingerprint:
+            self.stdout.write(self.style.WARNING('Migrations changed since the interrupted run; starting over'))
+            return None
+
+        return state
+
+    def _save_state(self, path, state):
+        with open(path, 'w') as f:
+            json.dump(state, f, indent=2)
+
+    def _clear_state(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
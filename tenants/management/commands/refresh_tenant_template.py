@@ -0,0 +1,23 @@
+"""
+Management command to keep the tenant template schema fully migrated
+Run after `migrate_schemas` on every deploy so new tenants are provisioned by cloning
+Usage: python manage.py refresh_tenant_template
+"""
+from django.core.management.base import BaseCommand, CommandError
+from tenants.provisioning import get_connection, get_template_schema_name, refresh_template_schema
+
+
+class Command(BaseCommand):
+    help = 'Create or migrate the template schema that new tenants are cloned from'
+
+    def handle(self, *args, **options):
+        if not hasattr(get_connection(), 'set_schema_to_public'):
+            raise CommandError('Tenant templates require the django-tenants PostgreSQL backend')
+
+        template_schema = get_template_schema_name()
+        self.stdout.write(f'Checking tenant template schema "{template_schema}"...')
+
+        if refresh_template_schema(verbosity=options['verbosity']):
+            self.stdout.write(self.style.SUCCESS(f'Template schema "{template_schema}" migrated'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Template schema "{template_schema}" is already current'))
@@ -63,6 +63,21 @@ class Domain(models.Model):
         return self.domain
 
 
+class DomainMapVersion(models.Model):
+    """
+    Single counter row stamping the host -> tenant map
+    Bumped on every Domain or Tenant change; each worker polls it to know when to reload
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = "Domain Map Version"
+        verbose_name_plural = "Domain Map Versions"
+    
+    def __str__(self):
+        return str(self.version)
+
+
 class TenantUser(models.Model):
     """
     Association between Users and Tenants for development
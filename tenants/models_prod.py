@@ -33,7 +33,7 @@ class Tenant(TenantMixin):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
-    # Auto-create schema when saving
+    # Auto-create schema when saving (cloned from the template schema, see tenants.provisioning)
     auto_create_schema = True
     auto_drop_schema = True
     
@@ -42,6 +42,18 @@ class Tenant(TenantMixin):
     
     def __str__(self):
         return self.name
+    
+    def create_schema(self, check_if_exists=False, sync_schema=True, verbosity=1):
+        """
+        Clone the pre-migrated template schema instead of running every migration
+        """
+        from .provisioning import provision_tenant_schema
+        return provision_tenant_schema(
+            self, 
+            check_if_exists=check_if_exists, 
+            sync_schema=sync_schema, 
+            verbosity=verbosity
+        )
 
 
 class Domain(DomainMixin):
@@ -54,6 +66,21 @@ class Domain(DomainMixin):
         db_table = 'tenants_domain'
 
 
+class DomainMapVersion(models.Model):
+    """
+    Single counter row stamping the host -> tenant map
+    Bumped on every Domain or Tenant change; each worker polls it to know when to reload
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = "Domain Map Version"
+        verbose_name_plural = "Domain Map Versions"
+    
+    def __str__(self):
+        return str(self.version)
+
+
 class TenantUser(models.Model):
     """
     Extended user model for tenant-specific information
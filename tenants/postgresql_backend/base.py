@@ -0,0 +1,84 @@
+"""
+Tenant-aware PostgreSQL backend for JustCodeWorks
+django-tenants backend that skips redundant SET search_path statements
+"""
+from django.conf import settings
+from django_tenants.postgresql_backend.base import DatabaseWrapper as TenantDatabaseWrapper
+from django_tenants.utils import get_limit_set_calls
+
+
+class DatabaseWrapper(TenantDatabaseWrapper):
+    """
+    Tracks the search_path actually applied on the live connection
+    
+    django-tenants forgets the applied search_path on every set_tenant() call,
+    so each request issues at least one SET search_path, and one per cursor
+    unless TENANT_LIMIT_SET_CALLS is on. Here the applied path is remembered for
+    the lifetime of the physical connection; a switch is only issued when the
+    tenant's path differs. Combined with CONN_MAX_AGE, consecutive requests for
+    the same tenant on a worker reuse the connection without any SET at all.
+    
+    SET is transactional, so a path applied inside an atomic block is only
+    trusted once it is known to be committed (see _commit/_rollback).
+    """
+    
+    def __init__(self, *args, **kwargs):
+        self.applied_search_path = None
+        self.pending_search_path = None
+        self.search_path_switches = 0
+        self.search_path_skips = 0
+        super().__init__(*args, **kwargs)
+        self.skip_redundant_search_path = getattr(settings, 'TENANT_SKIP_REDUNDANT_SEARCH_PATH', True)
+    
+    def _cursor(self, name=None):
+        if (
+            self.skip_redundant_search_path
+            and self.connection is not None
+            and self.applied_search_path is not None
+            and self.applied_search_path == self._get_cursor_search_paths()
+        ):
+            self.search_path_skips += 1
+            # Bypass the django-tenants override, which would SET the path again
+            if name:
+                return super(TenantDatabaseWrapper, self)._cursor(name=name)
+            return super(TenantDatabaseWrapper, self)._cursor()
+        
+        already_set = get_limit_set_calls() and self.search_path_set_schemas
+        cursor = super()._cursor(name=name)
+        if already_set:
+            # django-tenants skipped its own SET for this cursor
+            return cursor
+        
+        # search_path_set_schemas is None when django-tenants' SET failed
+        if self.search_path_set_schemas is not None:
+            self.search_path_switches += 1
+            if self.in_atomic_block:
+                self.pending_search_path = self.search_path_set_schemas
+                self.applied_search_path = None
+            else:
+                self.applied_search_path = self.search_path_set_schemas
+        else:
+            self.applied_search_path = None
+        
+        return cursor
+    
+    def _commit(self):
+        super()._commit()
+        if self.pending_search_path is not None:
+            self.applied_search_path = self.pending_search_path
+            self.pending_search_path = None
+    
+    def _rollback(self):
+        super()._rollback()
+        self.applied_search_path = None
+        self.pending_search_path = None
+    
+    def _savepoint_rollback(self, sid):
+        super()._savepoint_rollback(sid)
+        self.applied_search_path = None
+        self.pending_search_path = None
+    
+    def close(self):
+        self.applied_search_path = None
+        self.pending_search_path = None
+        super().close()
@@ -0,0 +1,208 @@
+"""
+Fast tenant provisioning for the django-tenants (PostgreSQL) setup
+Clones a pre-migrated template schema instead of running every migration
+
+django-tenants has its own clone path (TENANT_BASE_SCHEMA with
+TENANT_CREATION_FAKES_MIGRATIONS), but it runs `migrate_schemas --fake` for
+every new tenant, which loads the migration graph and executes the migrate
+command each time, and it never checks that the base schema is current: a
+stale base schema gets its missing migrations faked, leaving tenants without
+those tables. Here the template is checked against the migration graph first
+and the migration records are copied in one INSERT.
+"""
+import functools
+import logging
+import re
+import time
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connections
+from django.db.migrations.loader import MigrationLoader
+from django_tenants.postgresql_backend import base as tenants_backend
+from django_tenants.utils import get_tenant_database_alias
+
+
+logger = logging.getLogger(__name__)
+
+# Schema names are interpolated into DDL, so only plain identifiers are accepted
+SAFE_SCHEMA_NAME = re.compile(r'^[a-z_][a-z0-9_-]*$')
+
+
+def _check_schema_name(name):
+    """
+    django-tenants' check (length, no pg_ prefix) plus a plain-identifier check
+    
+    Raises:
+        ValidationError: the name is not a valid schema name
+    """
+    tenants_backend._check_schema_name(name)
+    if not SAFE_SCHEMA_NAME.match(name):
+        raise ValidationError(f"Invalid schema name: {name!r}")
+
+
+def get_connection():
+    return connections[get_tenant_database_alias()]
+
+
+def get_template_schema_name():
+    """Template schema kept fully migrated by `manage.py refresh_tenant_template`"""
+    return getattr(settings, 'TENANT_BASE_SCHEMA', None) or 'tenant_template'
+
+
+@functools.lru_cache(maxsize=1)
+def get_expected_migrations():
+    """
+    All migrations a tenant schema must have applied
+    Migration files do not change at runtime, so the graph is loaded once per process.
+    """
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    return frozenset(loader.graph.nodes)
+
+
+def schema_exists(schema_name):
+    with get_connection().cursor() as cursor:
+        cursor.execute(
+            'SELECT EXISTS(SELECT 1 FROM pg_catalog.pg_namespace WHERE nspname = %s)',
+            [schema_name]
+        )
+        return cursor.fetchone()[0]
+
+
+def get_applied_migrations(schema_name):
+    """Migrations recorded in a schema's django_migrations table"""
+    _check_schema_name(schema_name)
+    with get_connection().cursor() as cursor:
+        cursor.execute(
+            'SELECT EXISTS(SELECT 1 FROM pg_catalog.pg_tables '
+            'WHERE schemaname = %s AND tablename = %s)',
+            [schema_name, 'django_migrations']
+        )
+        if not cursor.fetchone()[0]:
+            return frozenset()
+        
+        cursor.execute(f'SELECT app, name FROM "{schema_name}".django_migrations')
+        return frozenset(cursor.fetchall())
+
+
+def template_is_current(template_schema=None):
+    """True when the template schema has every known migration applied"""
+    template_schema = template_schema or get_template_schema_name()
+    
+    if not schema_exists(template_schema):
+        return False
+    
+    missing = get_expected_migrations() - get_applied_migrations(template_schema)
+    if missing:
+        logger.info(f"Tenant template schema {template_schema} is stale ({len(missing)} migrations missing)")
+    
+    return not missing
+
+
+def clone_template_schema(schema_name, template_schema=None):
+    """
+    Copy the template's DDL into a new schema and stamp its migration table
+    
+    The copy is structure only (NODATA): tenant schemas never inherit rows from
+    the template, except the migration records that are stamped afterwards.
+    
+    Raises:
+        ValidationError: schema_name is not a valid schema name
+    """
+    from django_tenants.clone import CloneSchema
+    
+    template_schema = template_schema or get_template_schema_name()
+    _check_schema_name(schema_name)
+    _check_schema_name(template_schema)
+    
+    CloneSchema().clone_schema(template_schema, schema_name, 'NODATA')
+    
+    with get_connection().cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO "{schema_name}".django_migrations (app, name, applied) '
+            f'SELECT app, name, NOW() FROM "{template_schema}".django_migrations'
+        )
+
+
+def migrate_schema(schema_name, verbosity=1):
+    """Slow path: create the schema and run every tenant migration"""
+    _check_schema_name(schema_name)
+    with get_connection().cursor() as cursor:
+        cursor.execute(f'CREATE SCHEMA "{schema_name}"')
+    
+    call_command(
+        'migrate_schemas',
+        tenant=True,
+        schema_name=schema_name,
+        interactive=False,
+        verbosity=verbosity
+    )
+
+
+def provision_tenant_schema(tenant, check_if_exists=False, sync_schema=True, verbosity=1):
+    """
+    Create the schema for a new tenant
+    
+    Clones the template when it is current (sub-second), and falls back to
+    running migrations when the template is missing or stale.
+    
+    Returns:
+        bool: True if a schema was created
+    
+    Raises:
+        ValidationError: the tenant's schema_name is not a valid schema name
+    """
+    # Same safety check as TenantMixin.create_schema: the name ends up in DDL
+    _check_schema_name(tenant.schema_name)
+    connection = get_connection()
+    connection.set_schema_to_public()
+    
+    if check_if_exists and schema_exists(tenant.schema_name):
+        return False
+    
+    started = time.monotonic()
+    if not sync_schema:
+        with connection.cursor() as cursor:
+            cursor.execute(f'CREATE SCHEMA "{tenant.schema_name}"')
+        method = 'empty'
+    elif template_is_current():
+        clone_template_schema(tenant.schema_name)
+        method = 'clone'
+    else:
+        logger.warning(
+            f"Provisioning {tenant.schema_name} with migrations; "
+            f"run 'manage.py refresh_tenant_template' to restore fast provisioning"
+        )
+        migrate_schema(tenant.schema_name, verbosity=verbosity)
+        method = 'migrate'
+    
+    connection.set_schema_to_public()
+    logger.info(f"Provisioned schema {tenant.schema_name} ({method}) in {time.monotonic() - started:.2f}s")
+    return True
+
+
+def refresh_template_schema(verbosity=1):
+    """
+    Create or migrate the template schema so new tenants can be cloned from it
+    
+    Returns:
+        bool: True if the template had to be created or migrated
+    """
+    template_schema = get_template_schema_name()
+    get_connection().set_schema_to_public()
+    
+    if not schema_exists(template_schema):
+        migrate_schema(template_schema, verbosity=verbosity)
+        return True
+    
+    if template_is_current(template_schema):
+        return False
+    
+    call_command(
+        'migrate_schemas',
+        tenant=True,
+        schema_name=template_schema,
+        interactive=False,
+        verbosity=verbosity
+    )
+    return True
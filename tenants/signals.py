@@ -0,0 +1,16 @@
+"""
+Tenant signals - keep the in-process domain maps in sync
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .domain_map import bump_domain_map_version
+from .models import Tenant, Domain
+
+
+@receiver(post_save, sender=Domain)
+@receiver(post_delete, sender=Domain)
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+def invalidate_domain_map(sender, instance, **kwargs):
+    """Any domain or tenant change (e.g. deactivation) invalidates the host map"""
+    bump_domain_map_version()
@@ -1,3 +1,137 @@
-from django.test import TestCase
+import time
+from unittest import mock
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from .cache import TenantCache, user_namespace
+from .domain_map import DomainMap, get_domain_map_version
+from .models import Domain, Tenant
 
-# Create your tests here.
+
+@override_settings(TENANT_DOMAIN_MAP_CHECK_INTERVAL=0)
+class DomainMapTests(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name='Acme', schema_name='acme')
+        Domain.objects.create(domain='acme.example.com', tenant=self.tenant)
+    
+    def test_resolves_known_host_without_queries(self):
+        worker = DomainMap()
+        self.assertEqual(worker.resolve('acme.example.com'), self.tenant)
+        
+        with override_settings(TENANT_DOMAIN_MAP_CHECK_INTERVAL=60):
+            with self.assertNumQueries(0):
+                self.assertEqual(worker.resolve('acme.example.com'), self.tenant)
+    
+    def test_change_in_one_worker_reaches_the_others(self):
+        other_worker = DomainMap()
+        self.assertEqual(other_worker.resolve('acme.example.com'), self.tenant)
+        version = get_domain_map_version()
+        
+        # Saved by "this" worker; the signal only invalidates this process's map
+        self.tenant.is_active = False
+        self.tenant.save()
+        
+        self.assertGreater(get_domain_map_version(), version)
+        self.assertIsNone(other_worker.resolve('acme.example.com'))
+    
+    def test_deleted_domain_stops_resolving(self):
+        other_worker = DomainMap()
+        self.assertEqual(other_worker.resolve('acme.example.com'), self.tenant)
+        
+        Domain.objects.filter(domain='acme.example.com').delete()
+        
+        self.assertIsNone(other_worker.resolve('acme.example.com'))
+
+
+@override_settings(TENANT_CACHE_TIMEOUT=300, TENANT_CACHE_L1_TTL=0.05, TENANT_CACHE_REPLICA_TIMEOUT=5)
+class TenantCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.cache = TenantCache()
+        # A second process sharing the cache backend, with its own L1 tier
+        self.other_process = TenantCache()
+
+    def test_get_or_set_computes_once(self):
+        compute = mock.Mock(return_value='listing')
+
+        self.assertEqual(self.cache.get_or_set(1, 'dashboard', compute), 'listing')
+        self.assertEqual(self.cache.get_or_set(1, 'dashboard', compute), 'listing')
+        self.assertEqual(self.other_process.get(1, 'dashboard'), 'listing')
+        compute.assert_called_once()
+
+    def test_invalidate_bumps_only_that_tenant(self):
+        self.cache.set(1, 'dashboard', 'tenant 1')
+        self.cache.set(2, 'dashboard', 'tenant 2')
+
+        self.cache.invalidate(1)
+
+        self.assertIsNone(self.cache.get(1, 'dashboard'))
+        self.assertEqual(self.cache.get(2, 'dashboard'), 'tenant 2')
+
+    def test_tenant_object_and_id_share_entries(self):
+        tenant = mock.Mock(pk=7)
+        self.cache.set(tenant, 'dashboard', 'listing')
+
+        self.assertEqual(self.cache.get(7, 'dashboard'), 'listing')
+        self.cache.invalidate(7)
+        self.assertIsNone(self.cache.get(tenant, 'dashboard'))
+
+    def test_language_invalidation_keeps_other_languages(self):
+        self.cache.set(1, 'translation:home', 'Home', language='en')
+        self.cache.set(1, 'translation:home', 'Thuis', language='nl')
+
+        self.cache.invalidate(1, language='nl')
+
+        self.assertEqual(self.cache.get(1, 'translation:home', language='en'), 'Home')
+        self.assertIsNone(self.cache.get(1, 'translation:home', language='nl'))
+
+    def test_invalidate_shared_reaches_every_tenant(self):
+        self.cache.set(1, 'translation:home', 'Home', language='en')
+        self.cache.set(None, 'translation:home', 'Home', language='en')
+        self.cache.set(2, 'translation:home', 'Huis', language='nl')
+
+        self.cache.invalidate_shared(language='en')
+
+        self.assertIsNone(self.cache.get(1, 'translation:home', language='en'))
+        self.assertIsNone(self.cache.get(None, 'translation:home', language='en'))
+        self.assertEqual(self.cache.get(2, 'translation:home', language='nl'), 'Huis')
+
+    def test_other_process_sees_invalidation_after_l1_ttl(self):
+        self.cache.set(1, 'dashboard', 'old')
+        self.assertEqual(self.other_process.get(1, 'dashboard'), 'old')
+
+        self.cache.invalidate(1)
+
+        self.assertIsNone(self.cache.get(1, 'dashboard'))
+        self.assertEqual(self.other_process.get(1, 'dashboard'), 'old')
+        time.sleep(0.06)
+        self.assertIsNone(self.other_process.get(1, 'dashboard'))
+
+    def test_evicted_generation_never_revives_old_entries(self):
+        self.cache.set(1, 'dashboard', 'old')
+        cache.delete('tenant_cache:gen:1')
+        self.cache._local.clear()
+        # Generations are millisecond timestamps; an eviction is never within the same millisecond
+        time.sleep(0.002)
+
+        self.cache.invalidate(1)
+
+        self.assertIsNone(self.cache.get(1, 'dashboard'))
+
+    def test_values_computed_from_a_replica_get_a_short_timeout(self):
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            self.cache.get_or_set(1, 'primary', 'value')
+            with mock.patch('tenants.cache.reading_from_replica', return_value=True):
+                self.cache.get_or_set(1, 'replica', 'value')
+                self.cache.get_or_set(1, 'replica_short', 'value', timeout=2)
+
+        timeouts = [call.args[2] for call in cache_set.call_args_list if call.args[0].endswith(('primary', 'replica', 'replica_short'))]
+        self.assertEqual(timeouts, [300, 5, 2])
+
+    def test_user_namespace_is_independent_of_tenants(self):
+        self.cache.set(user_namespace(3), 'dashboard', 'listing')
+
+        self.cache.invalidate(3)
+        self.assertEqual(self.cache.get(user_namespace(3), 'dashboard'), 'listing')
+
+        self.cache.invalidate(user_namespace(3))
+        self.assertIsNone(self.cache.get(user_namespace(3), 'dashboard'))
@@ -10,6 +10,8 @@ class TranslationsConfig(AppConfig):
         """
         Initialize default translations when the app is ready
         """
+        from . import signals  # noqa: F401
+        
         try:
             from .models import initialize_default_translations
             # Only initialize in production/when ready
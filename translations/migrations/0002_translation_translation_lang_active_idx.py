@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('translations', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='translation',
+            index=models.Index(fields=['language', 'is_active'], name='translation_lang_active_idx'),
+        ),
+    ]
@@ -5,6 +5,7 @@ Provides basic translation functionality without requiring gettext tools
 
 from django.db import models
 from django.contrib.auth.models import User
+from tenants.cache import tenant_cache, get_current_tenant
 
 
 class TranslationKey(models.Model):
@@ -54,6 +55,10 @@ class Translation(models.Model):
     class Meta:
         unique_together = ['key', 'language']
         ordering = ['language', 'key__key']
+        indexes = [
+            # Per-language lookups and statistics
+            models.Index(fields=['language', 'is_active'], name='translation_lang_active_idx'),
+        ]
 
     def __str__(self):
         return f"{self.key.key} ({self.language}): {self.value[:50]}..."
@@ -103,7 +108,20 @@ class LanguageSettings(models.Model):
 def get_translation(key, language='en', fallback=''):
     """
     Get a translation for a given key and language
+    Cached per tenant and language; translation edits invalidate the cache.
     """
+    value = tenant_cache.get_or_set(
+        get_current_tenant(), 
+        f'translation:{key}', 
+        lambda: _lookup_translation(key, language), 
+        language=language
+    )
+    
+    # Return fallback or key if no translation found
+    return value if value is not None else (fallback or key)
+
+
+def _lookup_translation(key, language):
     try:
         translation = Translation.objects.get(key__key=key, language=language, is_active=True)
         return translation.value
@@ -121,8 +139,7 @@ def get_translation(key, language='en', fallback=''):
         except Translation.DoesNotExist:
             pass
         
-        # Return fallback or key if no translation found
-        return fallback or key
+        return None
 
 
 def create_translation_key(key, description='', translations=None):
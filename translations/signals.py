@@ -0,0 +1,25 @@
+"""
+Translation signals - invalidate cached translations
+Translations are shared by all tenants, so every tenant's entries are invalidated.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from tenants.cache import tenant_cache
+from .models import Translation, TranslationKey, LanguageSettings
+
+
+@receiver(post_save, sender=Translation)
+@receiver(post_delete, sender=Translation)
+def invalidate_translation_language(sender, instance, **kwargs):
+    """Only the edited language is invalidated, unless other languages fall back to it"""
+    if instance.language == LanguageSettings.get_settings().fallback_language:
+        tenant_cache.invalidate_shared()
+    else:
+        tenant_cache.invalidate_shared(language=instance.language)
+
+
+@receiver(post_save, sender=TranslationKey)
+@receiver(post_delete, sender=TranslationKey)
+@receiver(post_save, sender=LanguageSettings)
+def invalidate_translations(sender, instance, **kwargs):
+    tenant_cache.invalidate_shared()
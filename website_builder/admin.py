@@ -2,6 +2,7 @@
 Website Builder Admin Interface
 """
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
 from django.urls import path, reverse
 from django.shortcuts import get_object_or_404, redirect
@@ -11,7 +12,7 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from .models import (
     WebsiteProject, BusinessService, WebsiteTemplate, 
-    WebsiteBuilderConversation, IndustryTemplate
+    WebsiteBuilderConversation, IndustryTemplate, GenerationJob
 )
 
 
@@ -230,6 +231,25 @@ class WebsiteBuilderConversationAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(GenerationJob)
+class GenerationJobAdmin(admin.ModelAdmin):
+    list_display = ['job_type', 'project', 'status', 'progress', 'attempts', 'created_at', 'finished_at']
+    list_filter = ['status', 'job_type']
+    search_fields = ['project__business_name', 'job_id']
+    readonly_fields = ['job_id', 'created_at', 'updated_at', 'finished_at', 'locked_by', 'locked_at']
+    raw_id_fields = ['project']
+    actions = ['retry_jobs']
+    
+    def retry_jobs(self, request, queryset):
+        """Requeue failed jobs with a fresh set of attempts"""
+        count = queryset.filter(status='failed').update(
+            status='queued', attempts=0, error='', progress=0, progress_message='',
+            run_after=timezone.now(), finished_at=None
+        )
+        self.message_user(request, f"{count} job(s) requeued")
+    retry_jobs.short_description = "Retry selected failed jobs"
+
+
 @admin.register(IndustryTemplate)
 class IndustryTemplateAdmin(admin.ModelAdmin):
     list_display = ['display_name', 'industry_name', 'is_active', 'created_at']
@@ -13,4 +13,9 @@ class WebsiteBuilderConfig(AppConfig):
         """
         App initialization - register signals, etc.
         """
-        pass
\ No newline at end of file
+        from . import signals  # noqa: F401
+        from ai_assistant.llm_provider import llm_provider
+        from .content_upgrades import schedule_fallback_upgrade
+        
+        # Replace fallback content once the content LLM circuit closes again
+        llm_provider.breaker('content').add_recovery_listener(schedule_fallback_upgrade)
\ No newline at end of file
@@ -7,7 +7,17 @@ import logging
 from typing import Dict, Any, List, Optional, Tuple
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.db.models import F
+from django.utils import timezone
+from ai_assistant.llm_provider import llm_provider
 from ai_assistant.magic_ai import MagicAI
+from ai_assistant.prompts import prompt_registry
+from analytics_integration.services import analytics_service
+from justcodeworks.singleflight import make_key, singleflight
+from .jobs import (
+    apply_speculative_descriptions, content_input_hash, enqueue_job, find_speculative_result,
+    latest_job, schedule_speculative_content, serialize_job
+)
 from .models import (
     WebsiteProject, BusinessService, WebsiteTemplate, 
     WebsiteBuilderConversation, IndustryTemplate
@@ -331,15 +341,24 @@ class ClippyWebsiteBuilder(MagicAI):
                 return self._error_response(f"Invalid conversation step: {conversation.current_step}")
             
             # Process the current step
+            previous_step = conversation.current_step
             response = step_handler(conversation, user_input)
             
-            # Update conversation data
+            # Start generating content in the background once its inputs are known
+            if conversation.current_step != previous_step and conversation.current_step in getattr(settings, 'SPECULATIVE_CONTENT_STEPS', []):
+                schedule_speculative_content(project, self)
+            
+            # Count the message without a full save: the step handlers save their own
+            # changes, and a full save could write back a step the job worker moved on
             conversation.total_messages += 1
-            conversation.save()
+            WebsiteBuilderConversation.objects.filter(pk=conversation.pk).update(
+                total_messages=F('total_messages') + 1, updated_at=timezone.now()
+            )
             
             # Prepare template data for live preview
             template_data = {}
-            if project.template:
+            template = WebsiteTemplate.objects.filter(template_id=project.template_id).first() if project.template_id else None
+            if template:
                 template_data = {
                     'primaryColor': '#007bff',  # Default blue
                     'secondaryColor': '#6c757d',
@@ -349,9 +368,9 @@ class ClippyWebsiteBuilder(MagicAI):
                 }
                 
                 # If template has specific styles, use those
-                if project.template.color_schemes:
+                if template.color_schemes:
                     try:
-                        schemes = json.loads(project.template.color_schemes)
+                        schemes = json.loads(template.color_schemes)
                         if schemes and len(schemes) > 0:
                             default_scheme = schemes[0]
                             template_data.update({
@@ -366,8 +385,8 @@ class ClippyWebsiteBuilder(MagicAI):
             services_data = []
             for service in project.services.all():
                 services_data.append({
-                    'name': service.name,
-                    'description': service.description or None
+                    'name': service.service_name,
+                    'description': service.short_description or service.service_description or None
                 })
             
             return {
@@ -385,7 +404,8 @@ class ClippyWebsiteBuilder(MagicAI):
                     'status': project.status,
                     'tagline': f"Professional {project.industry.replace('_', ' ').title()} Services" if project.industry else "Professional Services You Can Trust"
                 },
-                'template_data': template_data
+                'template_data': template_data,
+                'job': serialize_job(latest_job(project, 'content_generation'))
             }
             
         except WebsiteProject.DoesNotExist:
@@ -408,39 +428,24 @@ class ClippyWebsiteBuilder(MagicAI):
             else:
                 industry_context = f"the {detected_industries[0].replace('_', ' ').title()} industry"
             
-            prompt = f"""
-            A business owner just told me their business name is "{business_name}" and I've detected they operate in {industry_context}.
-            
-            As Clippy 2.0, a friendly AI website builder assistant, I need to:
-            1. Give an enthusiastic, personalized recognition of their business
-            2. Suggest 8-10 relevant services they might offer
-            3. Keep the tone conversational and encouraging
-            
-            Make the recognition message feel personal and specific to their business name and industry.
-            For multi-industry businesses, acknowledge how they combine different services.
-            
-            Return as JSON:
-            {{
-                "recognition_message": "Enthusiastic recognition message mentioning the business name and industry",
-                "suggested_services": ["Service 1", "Service 2", ..., "Service 8-10"]
-            }}
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are Clippy 2.0, an enthusiastic AI assistant that helps build websites. You're knowledgeable about different industries and always encouraging. Keep responses concise but warm."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=400,
-                temperature=0.7
-            )
-            
-            content_text = response.choices[0].message.content.strip()
+            prompt = prompt_registry.get('business_recognition')
+            
+            def recognize():
+                response = llm_provider.complete(
+                    self.client,
+                    purpose='recognition',
+                    prompt=prompt,
+                    messages=prompt.messages(business_name=business_name, industry_context=industry_context),
+                    max_tokens=400,
+                    temperature=0.7
+                )
+                content_text = response.choices[0].message.content.strip()
+                
+                # Parse JSON response
+                return json.loads(content_text)
             
-            # Parse JSON response
-            import json
-            return json.loads(content_text)
+            # Double-submits and retries for the same business share one LLM call
+            return singleflight.do(make_key('business_recognition', prompt.key, business_name, industry_context), recognize)
             
         except Exception as e:
             self.logger.error(f"Error generating AI business recognition: {e}")
@@ -1020,73 +1025,43 @@ class ClippyWebsiteBuilder(MagicAI):
     
     def _step_content_generation(self, conversation: WebsiteBuilderConversation, user_input: str) -> str:
         """
-        Generate website content using AI and present for review
+        Queue website content generation as a background job
+        The chat UI polls project_status_api; the job moves the conversation to
+        content review and provides the message presenting the content.
         """
+        project = conversation.project
+        job = latest_job(project, 'content_generation')
+        
+        if job and job.is_active:
+            return f"""
+            ✍️ **Still working on your content...** ({job.progress}%)
+            
+            {job.progress_message or 'Your content generation is queued.'}
+            
+            I'll show it here as soon as it's ready!
+            """.strip()
+        
         # Parse content tone preference
         tone = self._parse_content_tone(user_input) if user_input else 'professional'
         
-        conversation.project.content_tone = tone
-        conversation.project.save()
+        project.content_tone = tone
+        project.save()
         
-        # Generate content using MagicAI
-        try:
-            content = self._generate_website_content(conversation.project)
-            
-            # Store generated content
-            conversation.project.generated_content = content
-            conversation.project.status = 'content_review'
-            conversation.project.save()
-            
-            business_name = conversation.project.business_name
-            
-            message = f"""
-            🎉 **Content Generated Successfully!**
-            
-            Here's what I've created for **{business_name}**:
-            
-            **🏆 HERO SECTION:**
-            *{content.get('hero_headline', 'Professional Business Solutions')}*
-            
-            {content.get('hero_description', 'We provide exceptional services to help your business grow and succeed.')}
-            
-            **📋 SERVICES SECTION:**
-            """
-            
-            # Add service descriptions
-            services = conversation.project.services.all()
-            for service in services[:3]:  # Show first 3 services
-                service_desc = content.get('services', {}).get(service.service_name, 
-                    f"Professional {service.service_name.lower()} services tailored to your needs.")
-                message += f"\n• **{service.service_name}:** {service_desc}"
-            
-            if services.count() > 3:
-                message += f"\n...and {services.count() - 3} more services"
-            
-            message += f"""
-            
-            **ℹ️ ABOUT US:**
-            {content.get('about_content', f'{business_name} is committed to delivering exceptional results through professional service and attention to detail.')}
-            
-            ---
-            
-            **What do you think?** 
-            
-            ✅ **"Looks great!"** - Proceed with this content
-            ✏️ **"Change [section]"** - Request specific changes  
-            📏 **"Too long"** - I'll create a shorter version
-            📏 **"Too short"** - I'll expand the content
-            🎨 **"Different tone"** - I'll adjust the writing style
-            
-            What would you like to do?
-            """
-            
-            # Advance to next step
+        # Content generated speculatively for these exact inputs (and tone) is served instantly;
+        # with another tone the job below reuses the content and only redoes the descriptions
+        result = find_speculative_result(project, content_input_hash(self._content_business_info(project)))
+        if result and apply_speculative_descriptions(project, result):
+            content = result['content']
+            project.generated_content = content
+            project.status = 'content_review'
+            project.save()
             conversation.advance_step()
-            
-            return message.strip()
-            
+            return self._content_review_message(project, content)
+        
+        try:
+            job = enqueue_job(project, 'content_generation', payload={'tone': tone})
         except Exception as e:
-            self.logger.error(f"Error generating content: {e}")
+            self.logger.error(f"Error queueing content generation: {e}")
             return """
             I encountered an issue generating your content. Let me try a different approach.
             
@@ -1096,6 +1071,67 @@ class ClippyWebsiteBuilder(MagicAI):
             
             I'll create custom content based on your input!
             """
+        
+        # The job advances the conversation itself (inline when GENERATION_JOBS_EAGER)
+        conversation.refresh_from_db(fields=['current_step'])
+        
+        if job.status == 'succeeded':
+            return job.result.get('message', '')
+        
+        return f"""
+        ✍️ **Writing your {tone} website content now!**
+        
+        This takes a few moments - I'll show everything here for your review as soon as it's ready.
+        """.strip()
+    
+    def _content_review_message(self, project: WebsiteProject, content: Dict[str, Any]) -> str:
+        """
+        Message presenting generated content for review
+        """
+        business_name = project.business_name
+        
+        message = f"""
+        🎉 **Content Generated Successfully!**
+        
+        Here's what I've created for **{business_name}**:
+        
+        **🏆 HERO SECTION:**
+        *{content.get('hero_headline', 'Professional Business Solutions')}*
+        
+        {content.get('hero_description', 'We provide exceptional services to help your business grow and succeed.')}
+        
+        **📋 SERVICES SECTION:**
+        """
+        
+        # Add service descriptions
+        services = project.services.all()
+        for service in services[:3]:  # Show first 3 services
+            service_desc = content.get('services', {}).get(service.service_name) or service.short_description or \
+                f"Professional {service.service_name.lower()} services tailored to your needs."
+            message += f"\n• **{service.service_name}:** {service_desc}"
+        
+        if services.count() > 3:
+            message += f"\n...and {services.count() - 3} more services"
+        
+        message += f"""
+        
+        **ℹ️ ABOUT US:**
+        {content.get('about_content', f'{business_name} is committed to delivering exceptional results through professional service and attention to detail.')}
+        
+        ---
+        
+        **What do you think?** 
+        
+        ✅ **"Looks great!"** - Proceed with this content
+        ✏️ **"Change [section]"** - Request specific changes  
+        📏 **"Too long"** - I'll create a shorter version
+        📏 **"Too short"** - I'll expand the content
+        🎨 **"Different tone"** - I'll adjust the writing style
+        
+        What would you like to do?
+        """
+        
+        return message.strip()
     
     def _step_content_review(self, conversation: WebsiteBuilderConversation, user_input: str) -> str:
         """
@@ -1810,9 +1846,9 @@ Perfect! Let's move forward with selecting your website template! 🌟"""
         else:
             return 'professional'
     
-    def _generate_website_content(self, project: WebsiteProject) -> Dict[str, Any]:
-        """Generate website content using AI"""
-        business_info = {
+    def _content_business_info(self, project: WebsiteProject) -> Dict[str, Any]:
+        """Everything website content generation depends on (also the speculative content cache key)"""
+        return {
             'company_name': project.business_name,
             'industry': project.industry,
             'location': project.location,
@@ -1820,9 +1856,11 @@ Perfect! Let's move forward with selecting your website template! 🌟"""
             'target_audience': project.target_audience,
             'tone': project.content_tone,
         }
-        
+    
+    def _generate_website_content(self, project: WebsiteProject) -> Dict[str, Any]:
+        """Generate website content using AI"""
         # Use parent class method to generate content
-        return self.generate_website_content(business_info)
+        return self.generate_website_content(self._content_business_info(project))
     
     def _build_final_website(self, project: WebsiteProject) -> Tuple[str, str]:
         """Build final HTML and CSS for the website"""
@@ -1885,6 +1923,11 @@ Perfect! Let's move forward with selecting your website template! 🌟"""
         </html>
         """
         
+        # Embed analytics at publish time so serving the site never queries analytics tables
+        html_template = analytics_service.embed_tracking_code(
+            html_template, project.user, project.website_url or None
+        )
+        
         css_template = """
         * { margin: 0; padding: 0; box-sizing: border-box; }
         body { font-family: Arial, sans-serif; line-height: 1.6; }
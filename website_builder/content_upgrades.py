@@ -0,0 +1,90 @@
+"""
+Background upgrade of fallback website content
+Projects whose content came from MagicAI._get_fallback_content (marked with
+is_fallback) are regenerated once the LLM is reachable again: automatically
+when the circuit breaker closes, or on demand with
+`manage.py upgrade_fallback_content`.
+"""
+import logging
+import threading
+from django.db import connection
+from .models import WebsiteProject
+
+
+logger = logging.getLogger(__name__)
+
+_upgrade_lock = threading.Lock()
+
+
+def pending_fallback_projects():
+    return WebsiteProject.objects.filter(generated_content__is_fallback=True).order_by('updated_at')
+
+
+def upgrade_project_content(project, clippy=None):
+    """
+    Regenerate one project's content; returns True if real AI content replaced the fallback
+    The update only applies while the stored content is still the fallback, so
+    edits made in the meantime are never overwritten.
+    """
+    from .clippy_assistant import ClippyWebsiteBuilder
+
+    clippy = clippy or ClippyWebsiteBuilder()
+    content = clippy._generate_website_content(project)
+    if content.get('is_fallback'):
+        return False
+
+    updated = WebsiteProject.objects.filter(
+        pk=project.pk, generated_content__is_fallback=True
+    ).update(generated_content=content)
+    if not updated:
+        return False
+
+    # Sites already built from the fallback text are rebuilt with the new content
+    project.refresh_from_db()
+    if project.final_html and project.status == 'completed':
+        project.final_html, project.final_css = clippy._build_final_website(project)
+        project.save(update_fields=['final_html', 'final_css', 'updated_at'])
+    else:
+        # update() skips signals; saving keeps cached dashboards and previews in step
+        project.save(update_fields=['updated_at'])
+
+    return True
+
+
+def upgrade_fallback_content(limit=None):
+    """Upgrade pending projects until one fails; returns (upgraded, remaining_failed)"""
+    from .clippy_assistant import ClippyWebsiteBuilder
+
+    clippy = ClippyWebsiteBuilder()
+    upgraded = 0
+    projects = pending_fallback_projects()
+    if limit:
+        projects = projects[:limit]
+
+    for project in projects:
+        if not upgrade_project_content(project, clippy):
+            # Still failing; leave the rest for the next recovery
+            return upgraded, True
+        upgraded += 1
+
+    return upgraded, False
+
+
+def _upgrade_in_background():
+    # One upgrade pass per process at a time
+    if not _upgrade_lock.acquire(blocking=False):
+        return
+    try:
+        upgraded, failed = upgrade_fallback_content()
+        if upgraded or failed:
+            logger.info(f"Upgraded fallback content for {upgraded} project(s)" + (" before a failure" if failed else ""))
+    except Exception as e:
+        logger.error(f"Error upgrading fallback content: {e}")
+    finally:
+        connection.close()
+        _upgrade_lock.release()
+
+
+def schedule_fallback_upgrade():
+    """Recovery listener for the LLM circuit breaker; runs the upgrade off the request thread"""
+    threading.Thread(target=_upgrade_in_background, name='fallback-upgrade', daemon=True).start()
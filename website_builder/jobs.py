@@ -0,0 +1,406 @@
+"""
+Database-backed job queue for slow website builder work (AI content generation)
+Jobs are GenerationJob rows; `manage.py run_generation_worker` claims and runs
+them with retries and exponential backoff, and handlers report progress that
+project_status_api exposes to the chat UI. No external broker is needed.
+
+Speculative content jobs generate site content as soon as the onboarding inputs
+are known, keyed by a hash of those inputs; the content step reuses the result
+when the inputs are unchanged and discards it otherwise. Speculative jobs write
+nothing to the project: their service descriptions are kept on the job and only
+saved by the content step, when they match the project's inputs and tone.
+"""
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from .models import GenerationJob, WebsiteBuilderConversation
+from .service_descriptions import apply_service_descriptions, describe_services, generate_service_descriptions
+
+
+logger = logging.getLogger(__name__)
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobProgress:
+    """
+    Callable handed to job handlers: progress(percent, message)
+    Each update also renews the worker's lease, so a long job that keeps
+    reporting progress is not reclaimed by another worker.
+    """
+
+    def __init__(self, job):
+        self.job = job
+
+    def __call__(self, percent, message=''):
+        self.job.progress = max(0, min(int(percent), 100))
+        self.job.progress_message = message[:200]
+        now = timezone.now()
+        renewed = GenerationJob.objects.filter(pk=self.job.pk, locked_by=self.job.locked_by).update(
+            progress=self.job.progress,
+            progress_message=self.job.progress_message,
+            locked_at=now,
+            updated_at=now
+        )
+        if not renewed:
+            logger.warning(f"Generation job {self.job.job_id} lease was taken over by another worker")
+
+
+def content_input_hash(business_info):
+    """
+    Stable hash of everything website content generation depends on
+    The tone is left out: it is only chosen at the content step, after
+    speculative generation, and only affects the service descriptions, which
+    are matched on tone separately (apply_speculative_descriptions).
+    """
+    inputs = {name: value for name, value in business_info.items() if name != 'tone'}
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def find_speculative_result(project, input_hash):
+    """Result ({'content', 'service_descriptions'}) of a finished speculative job for exactly these inputs, or None"""
+    job = GenerationJob.objects.filter(
+        project=project, job_type='speculative_content', status='succeeded', payload__input_hash=input_hash
+    ).order_by('-finished_at').first()
+    content = job.result.get('content') if job else None
+
+    # Fallback text is not worth reusing; the real generation may succeed now
+    if content and not content.get('is_fallback'):
+        return job.result
+    return None
+
+
+def apply_speculative_descriptions(project, result):
+    """
+    Save the service descriptions of a speculative result if they were written in the project's tone
+    Returns False when they do not apply and the services still need describing.
+    """
+    descriptions = result.get('service_descriptions') or {}
+    if descriptions.get('tone') != project.content_tone:
+        return False
+
+    apply_service_descriptions(project, descriptions.get('items') or {})
+    return True
+
+
+def await_speculative_result(project, input_hash, progress):
+    """
+    Reuse a matching speculative job: take its result, or wait for it if it is
+    already running. A matching job still in the queue is cancelled, since the
+    caller is about to do the same work itself.
+    """
+    deadline = time.monotonic() + getattr(settings, 'SPECULATIVE_CONTENT_WAIT', 60)
+    matching = GenerationJob.objects.filter(
+        project=project, job_type='speculative_content', payload__input_hash=input_hash
+    )
+
+    while True:
+        result = find_speculative_result(project, input_hash)
+        if result:
+            return result
+
+        matching.filter(status='queued').update(
+            status='failed', error='Superseded by content generation', finished_at=timezone.now()
+        )
+        if not matching.filter(status='running').exists() or time.monotonic() > deadline:
+            return None
+
+        progress(30, 'Finishing your website content')
+        time.sleep(0.5)
+
+
+def schedule_speculative_content(project, clippy=None):
+    """
+    Queue speculative content generation for the project's current inputs
+    Results for older inputs are discarded. Skipped when disabled or when jobs
+    run inline (GENERATION_JOBS_EAGER), where it would only slow the request down.
+    """
+    if not getattr(settings, 'SPECULATIVE_CONTENT_ENABLED', True) or getattr(settings, 'GENERATION_JOBS_EAGER', False):
+        return None
+
+    from .clippy_assistant import ClippyWebsiteBuilder
+
+    clippy = clippy or ClippyWebsiteBuilder()
+    input_hash = content_input_hash(clippy._content_business_info(project))
+
+    speculative = GenerationJob.objects.filter(project=project, job_type='speculative_content')
+    speculative.exclude(payload__input_hash=input_hash).exclude(status='running').delete()
+
+    existing = speculative.filter(payload__input_hash=input_hash).exclude(status='failed').first()
+    if existing:
+        return existing
+    return enqueue_job(project, 'speculative_content', payload={'input_hash': input_hash}, dedupe=False)
+
+
+def speculative_content_job(job, progress, clippy=None):
+    """
+    Generate content ahead of the content step; the result is kept on the job
+    Nothing is saved to the project, since the inputs may still change.
+    """
+    from .clippy_assistant import ClippyWebsiteBuilder
+
+    clippy = clippy or ClippyWebsiteBuilder()
+    business_info = clippy._content_business_info(job.project)
+    input_hash = content_input_hash(business_info)
+    if input_hash != job.payload.get('input_hash'):
+        # Inputs changed while queued; a newer job covers the new inputs
+        return {'discarded': True}
+
+    progress(10, 'Preparing your website content')
+    content = clippy.generate_website_content(business_info)
+
+    progress(60, 'Describing your services')
+    descriptions, _calls = describe_services(job.project, clippy=clippy)
+    return {
+        'input_hash': input_hash,
+        'content': content,
+        'service_descriptions': {'tone': business_info['tone'], 'items': descriptions},
+    }
+
+
+def generate_content_job(job, progress, clippy=None):
+    """
+    Generate website content for the project and move its conversation to content review
+    Returns the chat message presenting the content.
+    """
+    from .clippy_assistant import ClippyWebsiteBuilder
+
+    project = job.project
+    clippy = clippy or ClippyWebsiteBuilder()
+    business_info = clippy._content_business_info(project)
+
+    result = await_speculative_result(project, content_input_hash(business_info), progress)
+    if result:
+        content = result['content']
+        apply_speculative_descriptions(project, result)
+    else:
+        progress(10, 'Writing your website content')
+        content = clippy.generate_website_content(business_info)
+
+    # Services described by the speculative job (in this tone) are skipped
+    progress(60, 'Describing your services')
+    generate_service_descriptions(project, clippy=clippy)
+
+    progress(80, 'Saving your content')
+    project.generated_content = content
+    project.status = 'content_review'
+    project.save()
+
+    # Conditional update so a conversation that moved on meanwhile is left alone
+    WebsiteBuilderConversation.objects.filter(
+        project=project, current_step='content_generation'
+    ).update(current_step='content_review', updated_at=timezone.now())
+
+    return {'message': clippy._content_review_message(project, content)}
+
+
+JOB_HANDLERS = {
+    'content_generation': generate_content_job,
+    'speculative_content': speculative_content_job,
+}
+
+
+def latest_job(project, job_type):
+    return GenerationJob.objects.filter(project=project, job_type=job_type).order_by('-created_at').first()
+
+
+def enqueue_job(project, job_type, payload=None, max_attempts=None, dedupe=True):
+    """
+    Queue a job, or (with dedupe) return the project's job of that type that is already queued/running
+    With GENERATION_JOBS_EAGER the job runs inline before returning (no worker needed).
+    """
+    if job_type not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job type: {job_type}")
+
+    # No wrapping transaction: on SQLite a read-then-write transaction fails with
+    # "database is locked" under concurrency. A rare duplicate job is harmless
+    # because the handler's conversation update is conditional.
+    job = None
+    if dedupe:
+        job = GenerationJob.objects.filter(
+            project=project, job_type=job_type, status__in=['queued', 'running']
+        ).first()
+    if job is None:
+        job = GenerationJob.objects.create(
+            project=project,
+            job_type=job_type,
+            payload=payload or {},
+            max_attempts=max_attempts or getattr(settings, 'GENERATION_JOB_MAX_ATTEMPTS', 3),
+        )
+
+    if getattr(settings, 'GENERATION_JOBS_EAGER', False) and job.status == 'queued':
+        claimed = claim_job(job.pk)
+        if claimed:
+            run_job(claimed)
+        job.refresh_from_db()
+
+    return job
+
+
+def claim_job(job_pk, worker=None):
+    """Atomically take a due job; returns the claimed job or None if another worker won"""
+    now = timezone.now()
+    lease_expired = now - timedelta(seconds=getattr(settings, 'GENERATION_JOB_LEASE_SECONDS', 300))
+
+    # Compare-and-set on status/lease works on every backend without row locks
+    claimed = GenerationJob.objects.filter(
+        Q(status='queued', run_after__lte=now) | Q(status='running', locked_at__lt=lease_expired),
+        pk=job_pk
+    ).update(status='running', locked_by=worker or worker_id(), locked_at=now, updated_at=now)
+
+    if not claimed:
+        return None
+    return GenerationJob.objects.select_related('project').get(pk=job_pk)
+
+
+def claim_next_job(worker=None, job_types=None):
+    """Claim the oldest due job, including running jobs whose worker lease expired"""
+    now = timezone.now()
+    lease_expired = now - timedelta(seconds=getattr(settings, 'GENERATION_JOB_LEASE_SECONDS', 300))
+
+    candidates = GenerationJob.objects.filter(
+        Q(status='queued', run_after__lte=now) | Q(status='running', locked_at__lt=lease_expired)
+    )
+    if job_types:
+        candidates = candidates.filter(job_type__in=job_types)
+
+    for job_pk in candidates.order_by('run_after', 'id').values_list('pk', flat=True)[:10]:
+        job = claim_job(job_pk, worker)
+        if job:
+            return job
+    return None
+
+
+def run_job(job, **context):
+    """
+    Run a claimed job; failures are retried with exponential backoff until max_attempts
+    context is passed to the handler (e.g. clippy= to reuse a configured assistant).
+    """
+    handler = JOB_HANDLERS[job.job_type]
+
+    if job.attempts >= job.max_attempts:
+        # Reclaimed after its worker died on the final attempt
+        now = timezone.now()
+        GenerationJob.objects.filter(pk=job.pk).update(
+            status='failed', error=job.error or 'Worker lease expired', locked_by='', locked_at=None,
+            finished_at=now, updated_at=now
+        )
+        job.status = 'failed'
+        return job
+
+    job.attempts += 1
+    GenerationJob.objects.filter(pk=job.pk).update(attempts=job.attempts)
+
+    try:
+        result = handler(job, JobProgress(job), **context) or {}
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        logger.error(f"Generation job {job.job_id} ({job.job_type}) attempt {job.attempts} failed: {error}")
+
+        now = timezone.now()
+        if job.attempts < job.max_attempts:
+            delay = getattr(settings, 'GENERATION_JOB_RETRY_DELAY', 10) * 2 ** (job.attempts - 1)
+            fields = {'status': 'queued', 'run_after': now + timedelta(seconds=delay)}
+        else:
+            fields = {'status': 'failed', 'finished_at': now}
+
+        GenerationJob.objects.filter(pk=job.pk).update(
+            error=error, locked_by='', locked_at=None, updated_at=now, **fields
+        )
+        for name, value in fields.items():
+            setattr(job, name, value)
+        job.error = error
+        return job
+
+    now = timezone.now()
+    GenerationJob.objects.filter(pk=job.pk).update(
+        status='succeeded',
+        result=result,
+        error='',
+        progress=100,
+        progress_message='Done',
+        locked_by='',
+        locked_at=None,
+        finished_at=now,
+        updated_at=now
+    )
+    job.status = 'succeeded'
+    job.result = result
+    job.progress = 100
+    return job
+
+
+def run_pending_jobs(project=None, limit=None, worker=None, **context):
+    """Drain due jobs in this process (optionally for one project); returns the number run"""
+    ran = 0
+    while limit is None or ran < limit:
+        candidates = GenerationJob.objects.filter(status='queued', run_after__lte=timezone.now())
+        if project is not None:
+            candidates = candidates.filter(project=project)
+        job_pk = candidates.order_by('run_after', 'id').values_list('pk', flat=True).first()
+        if job_pk is None:
+            break
+        job = claim_job(job_pk, worker)
+        if job:
+            run_job(job, **context)
+            ran += 1
+    return ran
+
+
+def serialize_job(job):
+    """Job state for JSON APIs"""
+    if job is None:
+        return None
+    return {
+        'id': str(job.job_id),
+        'type': job.job_type,
+        'status': job.status,
+        'progress': job.progress,
+        'progress_message': job.progress_message,
+        'attempts': job.attempts,
+        'max_attempts': job.max_attempts,
+        'message': job.result.get('message') if job.status == 'succeeded' else None,
+        'error': job.error if job.status == 'failed' else None,
+        'stalled': is_stalled(job),
+    }
+
+
+def is_stalled(job):
+    """Queued and due for longer than GENERATION_JOB_STALL_SECONDS: no worker is picking jobs up"""
+    stall_after = timedelta(seconds=getattr(settings, 'GENERATION_JOB_STALL_SECONDS', 120))
+    return job.status == 'queued' and job.run_after < timezone.now() - stall_after
+
+
+def work(poll_interval=1.0, max_jobs=None, burst=False, job_types=None, stop=None):
+    """
+    Worker loop: claim and run jobs until max_jobs, or until the queue is empty with burst
+    Returns the number of jobs run.
+    """
+    from django.db import connection
+
+    me = worker_id()
+    ran = 0
+    while max_jobs is None or ran < max_jobs:
+        if stop is not None and stop():
+            break
+
+        job = claim_next_job(me, job_types)
+        if job is None:
+            if burst:
+                break
+            connection.close_if_unusable_or_obsolete()
+            time.sleep(poll_interval)
+            continue
+
+        run_job(job)
+        ran += 1
+    return ran
@@ -0,0 +1,52 @@
+"""
+Management command to generate descriptions for services that have none
+Usage: python manage.py describe_services
+       python manage.py describe_services --project <project_id> --overwrite
+"""
+from django.core.management.base import BaseCommand
+from website_builder.models import WebsiteProject
+from website_builder.service_descriptions import generate_service_descriptions
+
+
+class Command(BaseCommand):
+    help = 'Generate short and detailed descriptions for business services in parallel'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            help='Only describe the services of this project (project_id)'
+        )
+        parser.add_argument(
+            '--overwrite',
+            action='store_true',
+            help='Regenerate descriptions that already exist'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Process at most this many projects'
+        )
+
+    def handle(self, *args, **options):
+        projects = WebsiteProject.objects.filter(services__isnull=False)
+        if options['project']:
+            projects = projects.filter(project_id=options['project'])
+        if not options['overwrite']:
+            projects = projects.filter(services__short_description='')
+        projects = projects.distinct().order_by('created_at')
+        if options['limit']:
+            projects = projects[:options['limit']]
+
+        described = failed = 0
+        for project in projects:
+            result = generate_service_descriptions(project, overwrite=options['overwrite'])
+            described += result['described']
+            failed += result['failed']
+            self.stdout.write(
+                f'{project.business_name or project.project_id}: {result["described"]} described '
+                f'in {result["calls"]} call(s)'
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'Described {described} service(s)'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{failed} service(s) could not be described'))
@@ -0,0 +1,113 @@
+"""
+Management command to run background generation job workers
+Usage: python manage.py run_generation_worker
+       python manage.py run_generation_worker --workers 4
+       python manage.py run_generation_worker --burst
+Jobs are stored in the database (GenerationJob); no external broker is needed.
+"""
+import multiprocessing
+import os
+import signal
+import threading
+from django.core.management.base import BaseCommand
+from django.db import connections
+from website_builder.jobs import work
+from website_builder.models import GenerationJob
+
+
+_stopping = threading.Event()
+
+
+def _request_stop(signum, frame):
+    _stopping.set()
+
+
+def _worker_process(parent_pid, poll_interval, max_jobs, burst, job_types):
+    """Worker entry point: run jobs until stopped; a job in progress is finished first"""
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    # Also stop if the supervising process died without signalling us
+    def should_stop():
+        return _stopping.is_set() or os.getppid() != parent_pid
+
+    try:
+        work(poll_interval, max_jobs, burst, job_types, stop=should_stop)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Run workers that process queued GenerationJob rows (AI content generation)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Worker processes; 1 runs in this process (default: 1)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to sleep when the queue is empty (default: 1)'
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit once the queue is empty instead of waiting for new jobs'
+        )
+        parser.add_argument(
+            '--max-jobs',
+            type=int,
+            help='Exit each worker after this many jobs (e.g. to recycle memory)'
+        )
+        parser.add_argument(
+            '--job-type',
+            action='append',
+            dest='job_types',
+            choices=[job_type for job_type, _label in GenerationJob.JOB_TYPES],
+            help='Only run jobs of this type (can be repeated)'
+        )
+
+    def handle(self, *args, **options):
+        worker_args = (options['poll_interval'], options['max_jobs'], options['burst'], options['job_types'])
+        self.stdout.write(f'Starting {options["workers"]} generation worker(s)...')
+
+        if options['workers'] <= 1:
+            signal.signal(signal.SIGTERM, _request_stop)
+            try:
+                ran = work(*worker_args, stop=_stopping.is_set)
+            except KeyboardInterrupt:
+                self.stdout.write(self.style.WARNING('Interrupted'))
+                return
+            self.stdout.write(self.style.SUCCESS(f'Worker stopped after {ran} job(s)'))
+            return
+
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=_worker_process, args=(os.getpid(),) + worker_args, name=f'generation-worker-{i}')
+            for i in range(options['workers'])
+        ]
+        for process in processes:
+            process.start()
+
+        # Forward shutdown signals so workers finish their current job and exit
+        def stop_workers(signum, frame):
+            for process in processes:
+                if process.is_alive():
+                    os.kill(process.pid, signal.SIGTERM)
+
+        signal.signal(signal.SIGTERM, stop_workers)
+        signal.signal(signal.SIGINT, stop_workers)
+
+        for process in processes:
+            process.join()
+
+        failed = [process.name for process in processes if process.exitcode]
+        if failed:
+            self.stdout.write(self.style.ERROR(f'Worker(s) exited with errors: {", ".join(failed)}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Workers stopped'))
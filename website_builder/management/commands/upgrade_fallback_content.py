@@ -0,0 +1,34 @@
+"""
+Management command to regenerate website content that was served from the local fallback
+Usage: python manage.py upgrade_fallback_content
+       python manage.py upgrade_fallback_content --limit 50 --dry-run
+"""
+from django.core.management.base import BaseCommand
+from website_builder.content_upgrades import pending_fallback_projects, upgrade_fallback_content
+
+
+class Command(BaseCommand):
+    help = 'Replace fallback website content with AI-generated content now that the AI is available'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Upgrade at most this many projects'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the projects that still have fallback content'
+        )
+
+    def handle(self, *args, **options):
+        pending = pending_fallback_projects().count()
+        self.stdout.write(f'{pending} project(s) have fallback content')
+        if options['dry_run'] or not pending:
+            return
+
+        upgraded, failed = upgrade_fallback_content(limit=options['limit'])
+        self.stdout.write(self.style.SUCCESS(f'Upgraded {upgraded} project(s)'))
+        if failed:
+            self.stdout.write(self.style.WARNING('Stopped early: the AI still returned fallback content'))
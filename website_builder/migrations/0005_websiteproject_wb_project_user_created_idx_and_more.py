@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0001_initial'),
+        ('website_builder', '0004_websiteproject_business_email_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='websiteproject',
+            index=models.Index(fields=['user', '-created_at'], name='wb_project_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='websitetemplate',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', '-rating', '-usage_count'], name='wb_template_gallery_idx'),
+        ),
+    ]
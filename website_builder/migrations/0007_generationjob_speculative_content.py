@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website_builder', '0006_generationjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='generationjob',
+            name='job_type',
+            field=models.CharField(choices=[('content_generation', 'Website Content Generation'), ('speculative_content', 'Speculative Content Generation')], max_length=50),
+        ),
+    ]
@@ -87,6 +87,10 @@ class WebsiteProject(models.Model):
         verbose_name = "Website Project"
         verbose_name_plural = "Website Projects"
         ordering = ['-created_at']
+        indexes = [
+            # Dashboard project listings
+            models.Index(fields=['user', '-created_at'], name='wb_project_user_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.business_name} - {self.project_name}"
@@ -179,6 +183,16 @@ class WebsiteTemplate(models.Model):
         verbose_name = "Website Template"
         verbose_name_plural = "Website Templates"
         ordering = ['-usage_count', 'name']
+        indexes = [
+            # Template gallery (active templates by category, best rated first); partial on
+            # is_active because Django filters booleans as a bare column, which SQLite
+            # cannot seek on in a composite index
+            models.Index(
+                fields=['category', '-rating', '-usage_count'], 
+                condition=models.Q(is_active=True), 
+                name='wb_template_gallery_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.category})"
@@ -243,6 +257,66 @@ class WebsiteBuilderConversation(models.Model):
         return next_step
 
 
+class GenerationJob(models.Model):
+    """
+    Durable background job (e.g. AI content generation) run by `manage.py run_generation_worker`
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+    
+    JOB_TYPES = [
+        ('content_generation', 'Website Content Generation'),
+        ('speculative_content', 'Speculative Content Generation'),
+    ]
+    
+    job_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    project = models.ForeignKey(WebsiteProject, on_delete=models.CASCADE, related_name='generation_jobs')
+    job_type = models.CharField(max_length=50, choices=JOB_TYPES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    
+    # Input and output
+    payload = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    
+    # Progress reported by the handler for polling clients
+    progress = models.IntegerField(default=0)  # 0-100
+    progress_message = models.CharField(max_length=200, blank=True)
+    
+    # Retries and worker leases
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)  # not claimed before this time (retry backoff)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = "Generation Job"
+        verbose_name_plural = "Generation Jobs"
+        ordering = ['-created_at']
+        indexes = [
+            # Workers claiming the next due job
+            models.Index(fields=['status', 'run_after'], name='wb_job_status_run_after_idx'),
+            # Latest job per project for status polling
+            models.Index(fields=['project', 'job_type', '-created_at'], name='wb_job_project_type_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_job_type_display()} for {self.project.business_name} ({self.status})"
+    
+    @property
+    def is_active(self):
+        return self.status in ('queued', 'running')
+
+
 class IndustryTemplate(models.Model):
     """
     Pre-defined industry templates with common services and content patterns
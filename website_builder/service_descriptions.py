@@ -0,0 +1,97 @@
+"""
+Parallel generation of per-service website copy
+Fills BusinessService.short_description, detailed_description and features for
+all of a project's services at once. Services are split into batches that share
+one prompt, and the batches are sent to the LLM concurrently, so a site with
+many services takes about as long as a single call.
+"""
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def service_batches(names, concurrency, max_batch):
+    """
+    Split names into at most `concurrency` batches (more only when a batch would exceed max_batch)
+    Fewer, fuller batches mean fewer calls; the cap keeps each answer short enough to stay fast.
+    """
+    if not names:
+        return []
+    size = max(1, min(max_batch, math.ceil(len(names) / max(concurrency, 1))))
+    return [names[i:i + size] for i in range(0, len(names), size)]
+
+
+def services_to_describe(project, overwrite=False):
+    return [service for service in project.services.all() if overwrite or not service.short_description]
+
+
+def describe_services(project, clippy=None, overwrite=False):
+    """
+    Generate descriptions for the project's services without saving them
+    Batches that fail are logged and skipped so the rest still get their copy.
+    Returns ({service_name: {short_description, detailed_description, features}}, calls).
+    """
+    from .clippy_assistant import ClippyWebsiteBuilder
+
+    names = list(dict.fromkeys(service.service_name for service in services_to_describe(project, overwrite)))
+    batches = service_batches(
+        names,
+        getattr(settings, 'SERVICE_DESCRIPTION_CONCURRENCY', 8),
+        getattr(settings, 'SERVICE_DESCRIPTION_MAX_BATCH', 5)
+    )
+    if not batches:
+        return {}, 0
+
+    clippy = clippy or ClippyWebsiteBuilder()
+    business_info = clippy._content_business_info(project)
+
+    # Worker threads only talk to the LLM; all database access stays in this thread
+    generated = {}
+    with ThreadPoolExecutor(max_workers=len(batches), thread_name_prefix='service-copy') as pool:
+        futures = {
+            pool.submit(clippy.generate_service_descriptions, business_info, batch): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            try:
+                generated.update(future.result())
+            except Exception as e:
+                logger.warning(f"Service descriptions failed for {', '.join(futures[future])}: {type(e).__name__}: {e}")
+
+    return generated, len(batches)
+
+
+def apply_service_descriptions(project, generated, overwrite=False):
+    """Save generated descriptions to the project's services; returns (described, failed)"""
+    services = services_to_describe(project, overwrite)
+
+    described = 0
+    for service in services:
+        item = generated.get(service.service_name)
+        if not item or not item.get('short_description'):
+            continue
+
+        service.short_description = str(item['short_description'])[:300]
+        service.detailed_description = str(item.get('detailed_description') or '')
+        service.features = [str(feature) for feature in item.get('features') or []]
+        service.save(update_fields=['short_description', 'detailed_description', 'features'])
+        described += 1
+
+    return described, len(services) - described
+
+
+def generate_service_descriptions(project, clippy=None, overwrite=False):
+    """
+    Describe and save the project's services; by default only those without a short_description
+    Returns {'described': n, 'failed': n, 'calls': n}.
+    """
+    generated, calls = describe_services(project, clippy=clippy, overwrite=overwrite)
+    if not calls:
+        return {'described': 0, 'failed': 0, 'calls': 0}
+
+    described, failed = apply_service_descriptions(project, generated, overwrite=overwrite)
+    return {'described': described, 'failed': failed, 'calls': calls}
@@ -0,0 +1,17 @@
+"""
+Website builder signals - invalidate cached dashboards and sites on project changes
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from tenants.cache import tenant_cache, user_namespace
+from .models import WebsiteProject
+
+
+@receiver(post_save, sender=WebsiteProject)
+@receiver(post_delete, sender=WebsiteProject)
+def invalidate_project_cache(sender, instance, **kwargs):
+    """
+    Bump the owner's namespace, which holds their dashboard and site previews
+    Works the same for saves from a tenant host, the public site or the job worker.
+    """
+    tenant_cache.invalidate(user_namespace(instance.user_id))
@@ -0,0 +1,295 @@
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from tenants.models import Domain, Tenant
+from django.utils import timezone
+from .jobs import (
+    JOB_HANDLERS, JobProgress, apply_speculative_descriptions, await_speculative_result, claim_job, claim_next_job,
+    content_input_hash, enqueue_job, find_speculative_result, is_stalled, run_job, schedule_speculative_content
+)
+from .models import BusinessService, GenerationJob, WebsiteBuilderConversation, WebsiteProject
+from .service_descriptions import service_batches
+
+
+@override_settings(GENERATION_JOBS_EAGER=False, GENERATION_JOB_LEASE_SECONDS=300, GENERATION_JOB_RETRY_DELAY=10)
+class GenerationJobTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user('owner', 'owner@example.com', 'password')
+        self.project = WebsiteProject.objects.create(
+            user=user, project_name='Site', business_name='Acme', industry='Plumbing'
+        )
+        self.job = enqueue_job(self.project, 'content_generation')
+
+    def test_enqueue_dedupes_active_jobs(self):
+        self.assertEqual(enqueue_job(self.project, 'content_generation'), self.job)
+        self.assertNotEqual(enqueue_job(self.project, 'content_generation', dedupe=False), self.job)
+
+    def test_job_is_claimed_once(self):
+        claimed = claim_job(self.job.pk, worker='a')
+
+        self.assertEqual(claimed.status, 'running')
+        self.assertEqual(claimed.locked_by, 'a')
+        self.assertIsNone(claim_job(self.job.pk, worker='b'))
+        self.assertIsNone(claim_next_job(worker='b'))
+
+    def test_expired_lease_is_reclaimed(self):
+        claim_job(self.job.pk, worker='a')
+        GenerationJob.objects.filter(pk=self.job.pk).update(locked_at=timezone.now() - timedelta(seconds=301))
+
+        reclaimed = claim_next_job(worker='b')
+
+        self.assertEqual(reclaimed.pk, self.job.pk)
+        self.assertEqual(reclaimed.locked_by, 'b')
+
+    def test_progress_renews_only_own_lease(self):
+        job = claim_job(self.job.pk, worker='a')
+        GenerationJob.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(seconds=200))
+
+        JobProgress(job)(50, 'Halfway')
+        job.refresh_from_db()
+        self.assertEqual(job.progress, 50)
+        self.assertGreater(job.locked_at, timezone.now() - timedelta(seconds=5))
+
+        # Another worker took the job over: the stale worker must not touch it
+        GenerationJob.objects.filter(pk=job.pk).update(locked_by='b')
+        with self.assertLogs('website_builder.jobs', 'WARNING'):
+            JobProgress(job)(90, 'Almost')
+        job.refresh_from_db()
+        self.assertEqual(job.progress, 50)
+
+    def test_failure_is_retried_with_backoff_then_fails(self):
+        handler = mock.Mock(side_effect=RuntimeError('LLM down'))
+
+        with mock.patch.dict(JOB_HANDLERS, {'content_generation': handler}), self.assertLogs('website_builder.jobs', 'ERROR'):
+            job = run_job(claim_job(self.job.pk, worker='a'))
+            self.assertEqual(job.status, 'queued')
+            self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=5))
+            self.assertIsNone(claim_job(self.job.pk, worker='a'))
+
+            for _attempt in range(2):
+                GenerationJob.objects.filter(pk=self.job.pk).update(run_after=timezone.now())
+                job = run_job(claim_job(self.job.pk, worker='a'))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.attempts, 3)
+        self.assertEqual(job.error, 'RuntimeError: LLM down')
+        self.assertEqual(job.locked_by, '')
+        self.assertEqual(handler.call_count, 3)
+
+    def test_success_stores_result(self):
+        with mock.patch.dict(JOB_HANDLERS, {'content_generation': lambda job, progress: {'message': 'Done!'}}):
+            run_job(claim_job(self.job.pk, worker='a'))
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, 'succeeded')
+        self.assertEqual(self.job.result, {'message': 'Done!'})
+        self.assertEqual(self.job.progress, 100)
+        self.assertIsNotNone(self.job.finished_at)
+
+    @override_settings(GENERATION_JOB_STALL_SECONDS=120)
+    def test_queued_job_without_worker_is_stalled(self):
+        self.assertFalse(is_stalled(self.job))
+
+        self.job.run_after = timezone.now() - timedelta(seconds=121)
+        self.assertTrue(is_stalled(self.job))
+
+
+def describe(business_info, service_names):
+    """Stands in for generate_service_descriptions; the copy mentions the tone it was written in"""
+    return {
+        name: {'short_description': f'{name}, {business_info["tone"]}', 'detailed_description': '', 'features': []}
+        for name in service_names
+    }
+
+
+@override_settings(GENERATION_JOBS_EAGER=False, SPECULATIVE_CONTENT_ENABLED=True)
+class SpeculativeContentTests(TestCase):
+    def setUp(self):
+        from .clippy_assistant import ClippyWebsiteBuilder
+
+        user = User.objects.create_user('owner', 'owner@example.com', 'password')
+        self.project = WebsiteProject.objects.create(
+            user=user, project_name='Site', business_name='Acme', industry='Plumbing', location='Utrecht'
+        )
+        BusinessService.objects.create(project=self.project, service_name='Repairs')
+        self.conversation = WebsiteBuilderConversation.objects.create(
+            project=self.project, current_step='content_generation'
+        )
+
+        self.clippy = ClippyWebsiteBuilder()
+        self.content = {'hero_headline': 'Pipes fixed fast'}
+        for name, replacement in [
+            ('generate_website_content', mock.Mock(return_value=self.content)),
+            ('generate_service_descriptions', mock.Mock(side_effect=describe)),
+            ('_content_review_message', mock.Mock(return_value='Review your content')),
+        ]:
+            patcher = mock.patch.object(self.clippy, name, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def input_hash(self):
+        return content_input_hash(self.clippy._content_business_info(self.project))
+
+    def run_speculative_job(self):
+        job = schedule_speculative_content(self.project, self.clippy)
+        return run_job(claim_job(job.pk), clippy=self.clippy)
+
+    def run_content_job(self):
+        job = enqueue_job(self.project, 'content_generation', dedupe=False)
+        return run_job(claim_job(job.pk), clippy=self.clippy)
+
+    def speculative_job(self, result, status='succeeded'):
+        return GenerationJob.objects.create(
+            project=self.project, job_type='speculative_content', status=status,
+            payload={'input_hash': self.input_hash()}, result=result
+        )
+
+    def test_tone_is_not_part_of_the_input_hash(self):
+        business_info = self.clippy._content_business_info(self.project)
+
+        self.assertEqual(content_input_hash(business_info), content_input_hash({**business_info, 'tone': 'friendly'}))
+        self.assertNotEqual(content_input_hash(business_info), content_input_hash({**business_info, 'location': 'Delft'}))
+
+    def test_result_is_reused_when_inputs_are_unchanged(self):
+        self.run_speculative_job()
+        self.clippy.generate_website_content.reset_mock()
+        self.clippy.generate_service_descriptions.reset_mock()
+
+        job = self.run_content_job()
+
+        self.assertEqual(job.status, 'succeeded')
+        self.clippy.generate_website_content.assert_not_called()
+        self.clippy.generate_service_descriptions.assert_not_called()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.generated_content, self.content)
+        self.assertEqual(self.project.services.get().short_description, 'Repairs, professional')
+
+    def test_speculative_job_writes_nothing_to_the_project(self):
+        self.run_speculative_job()
+
+        self.project.refresh_from_db()
+        self.assertFalse(self.project.generated_content)
+        self.assertEqual(self.project.services.get().short_description, '')
+
+    def test_results_for_changed_inputs_are_deleted(self):
+        old_job = self.run_speculative_job()
+
+        self.project.location = 'Delft'
+        self.project.save()
+        new_job = schedule_speculative_content(self.project, self.clippy)
+
+        self.assertFalse(GenerationJob.objects.filter(pk=old_job.pk).exists())
+        self.assertEqual(new_job.payload['input_hash'], self.input_hash())
+        self.assertIsNone(find_speculative_result(self.project, self.input_hash()))
+
+    def test_tone_mismatch_describes_services_again(self):
+        self.run_speculative_job()
+        self.clippy.generate_website_content.reset_mock()
+        self.clippy.generate_service_descriptions.reset_mock()
+        self.project.content_tone = 'friendly'
+        self.project.save()
+
+        result = find_speculative_result(self.project, self.input_hash())
+        self.assertFalse(apply_speculative_descriptions(self.project, result))
+
+        self.run_content_job()
+
+        # The content is reused; only the descriptions are written again in the new tone
+        self.clippy.generate_website_content.assert_not_called()
+        self.clippy.generate_service_descriptions.assert_called_once()
+        self.assertEqual(self.project.services.get().short_description, 'Repairs, friendly')
+
+    def test_fallback_result_is_never_reused(self):
+        self.speculative_job({'content': {'hero_headline': 'Welcome', 'is_fallback': True}})
+
+        self.assertIsNone(find_speculative_result(self.project, self.input_hash()))
+
+        self.run_content_job()
+        self.clippy.generate_website_content.assert_called_once()
+
+    def test_queued_matching_job_is_superseded_by_the_content_step(self):
+        queued = self.speculative_job({}, status='queued')
+
+        self.assertIsNone(await_speculative_result(self.project, self.input_hash(), mock.Mock()))
+
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'failed')
+        self.assertEqual(queued.error, 'Superseded by content generation')
+        self.assertIsNone(claim_job(queued.pk))
+
+
+class ConversationStepTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('owner', 'owner@example.com', 'password')
+        self.project = WebsiteProject.objects.create(
+            user=self.user, project_name='Site', business_name='Acme', industry='Plumbing'
+        )
+        self.conversation = WebsiteBuilderConversation.objects.create(
+            project=self.project, current_step='content_generation'
+        )
+
+    def test_message_count_does_not_overwrite_step_moved_by_worker(self):
+        from .clippy_assistant import ClippyWebsiteBuilder
+
+        def step_finished_by_worker(conversation, user_input):
+            # The worker's generate_content_job lands while the request is still running
+            WebsiteBuilderConversation.objects.filter(pk=conversation.pk).update(current_step='content_review')
+            return 'Writing your content now!'
+
+        clippy = ClippyWebsiteBuilder()
+        with mock.patch.dict(clippy.conversation_steps, {'content_generation': step_finished_by_worker}):
+            clippy.process_conversation(str(self.project.project_id), 'friendly', self.user)
+
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.current_step, 'content_review')
+        self.assertEqual(self.conversation.total_messages, 1)
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class DashboardCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('owner', 'owner@example.com', 'password')
+        tenant = Tenant.objects.create(name='Acme', schema_name='acme')
+        Domain.objects.create(domain='acme.example.com', tenant=tenant)
+        self.project = WebsiteProject.objects.create(
+            user=self.user, project_name='Site', business_name='Acme', industry='Plumbing', status='draft'
+        )
+        self.client.force_login(self.user)
+
+    def completed_projects(self):
+        response = self.client.get(reverse('website_builder:dashboard'), HTTP_HOST='acme.example.com')
+        return response.context['stats']['completed_projects']
+
+    def test_save_outside_a_request_refreshes_tenant_host_dashboard(self):
+        self.assertEqual(self.completed_projects(), 0)
+
+        # As the job worker or upgrade_fallback_content would: no request, no tenant
+        self.project.status = 'completed'
+        self.project.save()
+
+        self.assertEqual(self.completed_projects(), 1)
+
+
+class ServiceBatchTests(SimpleTestCase):
+    def test_batches_spread_over_concurrency(self):
+        names = [f'service {i}' for i in range(10)]
+
+        batches = service_batches(names, concurrency=4, max_batch=5)
+
+        self.assertEqual([len(batch) for batch in batches], [3, 3, 3, 1])
+        self.assertEqual(sum(batches, []), names)
+
+    def test_batch_size_is_capped(self):
+        batches = service_batches([f'service {i}' for i in range(12)], concurrency=2, max_batch=4)
+
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 4])
+
+    def test_degenerate_inputs(self):
+        self.assertEqual(service_batches([], concurrency=4, max_batch=5), [])
+        self.assertEqual(service_batches(['a', 'b'], concurrency=0, max_batch=5), [['a', 'b']])
+        self.assertEqual(service_batches(['a', 'b'], concurrency=8, max_batch=5), [['a'], ['b']])
@@ -1,9 +1,11 @@
 """
 Website Builder Views - Dashboard and API endpoints
 """
+import hashlib
 import json
 import uuid
 from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.http import JsonResponse, HttpResponse
@@ -13,11 +15,17 @@ from django.contrib import messages
 from django.utils import timezone
 from .models import WebsiteProject, WebsiteBuilderConversation, WebsiteTemplate, IndustryTemplate
 from .clippy_assistant import ClippyWebsiteBuilder
+from .jobs import latest_job, schedule_speculative_content, serialize_job
+from analytics_integration.services import analytics_service
+from tenants.cache import tenant_cache, user_namespace
+from justcodeworks.db_routers import read_only_view
+from justcodeworks.singleflight import make_key, singleflight
 from django.template import Template, Context
 import zipfile
 from io import BytesIO
 
 
+@read_only_view
 def landing_page(request):
     """
     Public landing page for website builder
@@ -36,14 +44,37 @@ def landing_page(request):
 
 
 @login_required
+@read_only_view
 def dashboard(request):
     """
     Main website builder dashboard
     """
-    # Get user's projects
-    projects = WebsiteProject.objects.filter(user=request.user).order_by('-created_at')
+    # Get user's projects and statistics (cached per user, invalidated on project changes)
+    listing = tenant_cache.get_or_set(
+        user_namespace(request.user.pk), 
+        'dashboard', 
+        lambda: _build_dashboard_listing(request.user)
+    )
+    
+    # Get available templates
+    templates = WebsiteTemplate.objects.filter(is_active=True).order_by('-rating')[:6]
+    
+    context = {
+        'projects': listing['projects'],  # Show last 5 projects
+        'stats': listing['stats'],
+        'templates': templates,
+        'user': request.user,
+    }
+    
+    return render(request, 'website_builder/dashboard.html', context)
+
+
+def _build_dashboard_listing(user):
+    """
+    Recent projects and project statistics for the dashboard
+    """
+    projects = WebsiteProject.objects.filter(user=user).order_by('-created_at')
     
-    # Get project statistics
     stats = {
         'total_projects': projects.count(),
         'completed_projects': projects.filter(status='completed').count(),
@@ -51,17 +82,26 @@ def dashboard(request):
         'published_projects': projects.filter(status='published').count(),
     }
     
-    # Get available templates
-    templates = WebsiteTemplate.objects.filter(is_active=True).order_by('-rating')[:6]
-    
-    context = {
-        'projects': projects[:5],  # Show last 5 projects
+    return {
+        'projects': list(projects[:5]),
         'stats': stats,
-        'templates': templates,
-        'user': request.user,
     }
+
+
+def _get_site_html(request, project_id):
+    """
+    Generated HTML of one of the user's projects, cached per user
+    Returns None if the project has no generated website yet.
+    """
+    def load_html():
+        project = get_object_or_404(WebsiteProject, project_id=project_id, user=request.user)
+        return project.final_html or None
     
-    return render(request, 'website_builder/dashboard.html', context)
+    return tenant_cache.get_or_set(
+        user_namespace(request.user.pk), 
+        f'site:{project_id}', 
+        load_html
+    )
 
 
 @login_required  
@@ -196,38 +236,27 @@ def project_detail(request, project_id):
 
 
 @login_required
+@read_only_view
 def preview_website(request, project_id):
     """
     Preview the generated website
     """
-    project = get_object_or_404(WebsiteProject, project_id=project_id, user=request.user)
+    final_html = _get_site_html(request, project_id)
     
-    if not project.final_html:
+    if not final_html:
         messages.error(request, 'Website not yet generated.')
         return redirect('website_builder:project_detail', project_id=project_id)
     
     # Return the HTML directly
     from django.http import HttpResponse
-    return HttpResponse(project.final_html)
+    return HttpResponse(final_html)
 
 
-@login_required
-def export_project(request, project_id):
+def _build_project_export(project):
     """
-    Export project as ZIP file
+    ZIP of the generated site with README and project info
     """
-    project = get_object_or_404(WebsiteProject, project_id=project_id, user=request.user)
-    
-    if not project.final_html:
-        messages.error(request, 'Website not yet generated.')
-        return redirect('website_builder:project_detail', project_id=project_id)
-    
-    # Create ZIP export
-    import zipfile
-    import io
-    from django.http import HttpResponse
-    
-    zip_buffer = io.BytesIO()
+    zip_buffer = BytesIO()
     
     with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
         # Add HTML file
@@ -271,9 +300,27 @@ Status: {project.status}
         
         zip_file.writestr('project_info.txt', project_info)
     
-    zip_buffer.seek(0)
+    return zip_buffer.getvalue()
+
+
+@login_required
+def export_project(request, project_id):
+    """
+    Export project as ZIP file
+    """
+    project = get_object_or_404(WebsiteProject, project_id=project_id, user=request.user)
+    
+    if not project.final_html:
+        messages.error(request, 'Website not yet generated.')
+        return redirect('website_builder:project_detail', project_id=project_id)
     
-    response = HttpResponse(zip_buffer.getvalue(), content_type='application/zip')
+    # Concurrent exports of the same project version share one build
+    zip_content = singleflight.do(
+        make_key('export_project', project.project_id, project.updated_at.isoformat()),
+        lambda: _build_project_export(project)
+    )
+    
+    response = HttpResponse(zip_content, content_type='application/zip')
     filename = f"{project.business_name.replace(' ', '_')}_website.zip"
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
     
@@ -281,6 +328,7 @@ Status: {project.status}
 
 
 @login_required
+@read_only_view
 def templates_gallery(request):
     """
     Browse available website templates
@@ -338,6 +386,7 @@ def templates_gallery(request):
     return render(request, 'website_builder/templates.html', context)
 
 
+@read_only_view
 def template_preview(request, template_id):
     """
     Returns template HTML content for preview
@@ -373,11 +422,11 @@ def template_preview(request, template_id):
             'social_instagram': '#'
         }
         
-        # Render template with sample data
-        from django.template import Template, Context
-        django_template = Template(template_obj.html_template)
-        context = Context(sample_data)
-        html_content = django_template.render(context)
+        # Render template with sample data; concurrent previews of the same template share one render
+        html_content = singleflight.do(
+            make_key('template_preview', template_id, hashlib.sha256(template_obj.html_template.encode()).hexdigest()),
+            lambda: Template(template_obj.html_template).render(Context(sample_data))
+        )
         
         return HttpResponse(html_content, content_type='text/html')
         
@@ -456,8 +505,9 @@ def create_website_from_template_data(user, template_id, business_data):
         # Create context with user's business data
         context = Context(business_data)
         
-        # Generate final HTML
+        # Generate final HTML with the user's analytics snippet embedded
         final_html = django_template.render(context)
+        final_html = analytics_service.embed_tracking_code(final_html, user)
         
         # Create CSS and JS content
         final_css = template_obj.css_template or ""
@@ -504,35 +554,26 @@ def create_website_from_template_data(user, template_id, business_data):
         }
 
 
-@login_required  
-def download_website(request, project_id):
+def _build_website_download(project):
     """
-    Download website as ZIP file with HTML, CSS, JS files
+    ZIP of the generated site's HTML, CSS and JS with a README
     """
-    try:
-        project = get_object_or_404(WebsiteProject, project_id=project_id, user=request.user)
+    zip_buffer = BytesIO()
+    
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        # Add HTML file
+        zip_file.writestr('index.html', project.final_html)
         
-        if not project.final_html:
-            messages.error(request, 'No generated website content found for this project.')
-            return redirect('website_builder:project_detail', project_id=project_id)
+        # Add CSS file if exists
+        if project.final_css:
+            zip_file.writestr('style.css', project.final_css)
         
-        # Create ZIP file
-        zip_buffer = BytesIO()
+        # Add JS file if exists  
+        if project.final_js:
+            zip_file.writestr('script.js', project.final_js)
         
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # Add HTML file
-            zip_file.writestr('index.html', project.final_html)
-            
-            # Add CSS file if exists
-            if project.final_css:
-                zip_file.writestr('style.css', project.final_css)
-            
-            # Add JS file if exists  
-            if project.final_js:
-                zip_file.writestr('script.js', project.final_js)
-            
-            # Add README with instructions
-            readme_content = f'''# {project.business_name} Website
+        # Add README with instructions
+        readme_content = f'''# {project.business_name} Website
 
 Generated using JustCodeWorks.EU Template System
 
@@ -551,11 +592,31 @@ Generated using JustCodeWorks.EU Template System
 
 Visit JustCodeWorks.EU for more templates and website services!
 '''
-            zip_file.writestr('README.txt', readme_content)
+        zip_file.writestr('README.txt', readme_content)
+    
+    return zip_buffer.getvalue()
+
+
+@login_required  
+def download_website(request, project_id):
+    """
+    Download website as ZIP file with HTML, CSS, JS files
+    """
+    try:
+        project = get_object_or_404(WebsiteProject, project_id=project_id, user=request.user)
+        
+        if not project.final_html:
+            messages.error(request, 'No generated website content found for this project.')
+            return redirect('website_builder:project_detail', project_id=project_id)
+        
+        # Concurrent downloads of the same project version share one build
+        zip_content = singleflight.do(
+            make_key('download_website', project.project_id, project.updated_at.isoformat()),
+            lambda: _build_website_download(project)
+        )
         
         # Prepare response
-        zip_buffer.seek(0)
-        response = HttpResponse(zip_buffer.getvalue(), content_type='application/zip')
+        response = HttpResponse(zip_content, content_type='application/zip')
         filename = f"{project.business_name.replace(' ', '_')}_website.zip"
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
         
@@ -567,18 +628,19 @@ Visit JustCodeWorks.EU for more templates and website services!
 
 
 @login_required
+@read_only_view
 def preview_generated_website(request, project_id):
     """
     Preview the generated website in full screen
     """
     try:
-        project = get_object_or_404(WebsiteProject, project_id=project_id, user=request.user)
+        final_html = _get_site_html(request, project_id)
         
-        if not project.final_html:
+        if not final_html:
             return HttpResponse("No generated website content found for this project.", status=404)
         
         # Return the generated HTML directly
-        return HttpResponse(project.final_html, content_type='text/html')
+        return HttpResponse(final_html, content_type='text/html')
         
     except Exception as e:
         return HttpResponse(f"Error loading website: {str(e)}", status=500)
@@ -659,7 +721,9 @@ def project_status_api(request, project_id):
                 'current_step': project.ai_conversation.current_step if hasattr(project, 'ai_conversation') else 'welcome',
                 'services_count': project.services.count(),
                 'created_at': project.created_at.isoformat(),
-            }
+            },
+            # Background content generation, polled by the chat UI until it finishes
+            'job': serialize_job(latest_job(project, 'content_generation')),
         })
         
     except WebsiteProject.DoesNotExist:
@@ -785,13 +849,15 @@ def create_from_business_details(request):
     try:
         data = json.loads(request.body)
         
-        # Get or create user (for now, create anonymous user)
-        from django.contrib.auth.models import User
-        import uuid
-        
-        # Create anonymous user or get existing test user
-        username = f"business_{uuid.uuid4().hex[:8]}"
-        user = User.objects.create_user(username=username, email=f"{username}@temp.com")
+        # Signed-in visitors get the project on their own account
+        if request.user.is_authenticated:
+            user = request.user
+        else:
+            # Anonymous visitors get a temporary account, signed in so the chat,
+            # preview and download steps see their project
+            username = f"business_{uuid.uuid4().hex[:8]}"
+            user = User.objects.create_user(username=username, email=f"{username}@temp.com")
+            login(request, user)
         
         # Create website project with business details
         project = WebsiteProject.objects.create(
@@ -827,6 +893,9 @@ def create_from_business_details(request):
             }
         )
         
+        # Everything content generation needs is known now; start it in the background
+        schedule_speculative_content(project)
+        
         return JsonResponse({
             'success': True,
             'message': 'Project created successfully',